@@ -69,6 +69,23 @@ class TestJsonKeyValueConf:
 
         store["custom"] = None
 
+    def test_generation_changes_with_the_data(self, tmp_path: Path) -> None:
+        json_file = str(tmp_path / "jsonkvconf.json")
+
+        class Store(JsonKeyValueConf[str, int]):
+            pass
+
+        store = Store.load(json_file)
+        generations = [store.generation]
+        store.save({"a": 1})
+        generations.append(store.generation)
+        del store["a"]
+        generations.append(store.generation)
+        json_save({"a": 2}, json_file)
+        Store.load(json_file, force=True)
+        generations.append(store.generation)
+        assert len(set(generations)) == len(generations)
+
     def test_accepts_existing_value_instances(self) -> None:
         class Record(JsonConf):
             value: str = ""
@@ -98,3 +98,13 @@ class TestResultBuffer:
         buffer.reset()
         captured_flush[0]()  # a flush that fires after the query changed must do nothing
         emit.assert_not_called()
+
+    def test_flush_paints_pending_results_now(
+        self, buffer: ResultBuffer, emit: MagicMock, captured_flush: list[Callable[[], None]]
+    ) -> None:
+        partial = Result(name="partial")
+        buffer.enqueue(effects.render_results([partial], append=False, final=False), emit)  # schedules a flush
+        buffer.flush()
+        emit.assert_called_once_with([partial], False)
+        captured_flush[0]()  # the throttle firing afterwards has nothing left to paint
+        emit.assert_called_once()
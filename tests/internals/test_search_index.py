@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import pytest
+from pytest_mock import MockerFixture
+
+from ulauncher.internals import search_index
+from ulauncher.internals.result import Result
+from ulauncher.internals.search_index import SearchIndex
+
+NAMES = ["Firefox", "LibreOffice Calc", "Contacts", "Thunar File Manager", "Google Play Music", "Pycharm", "Füße"]
+
+
+def _searchable(name: str, description: str = "") -> Result:
+    return Result(name=name, description=description, searchable=True)
+
+
+class TestSearchIndex:
+    @pytest.fixture
+    def index(self) -> SearchIndex:
+        index = SearchIndex()
+        index.update("apps", [_searchable(name) for name in NAMES])
+        return index
+
+    @pytest.mark.parametrize("query", ["fire", "calc", "thfima", "pla", "fusse", "zzz", "c", "music play"])
+    def test_candidates_include_every_passing_result(self, index: SearchIndex, query: str) -> None:
+        candidates = index.get_candidates(query, 50)
+        passing = [r for r in map(_searchable, NAMES) if r.search_score(query) > 50]
+        assert sorted(r.name for r in passing) == sorted(r.name for r in candidates if r.search_score(query) > 50)
+
+    def test_skips_results_without_matching_chars(self, index: SearchIndex) -> None:
+        candidate_names = [r.name for r in index.get_candidates("fire", 50)]
+        assert "Firefox" in candidate_names
+        assert "Contacts" not in candidate_names
+        assert "Pycharm" not in candidate_names
+        assert index.get_candidates("qqq", 50) == []
+        assert index.get_candidates("", 0) == []
+
+    def test_skips_unsearchable_results(self) -> None:
+        index = SearchIndex()
+        index.update("mode", [Result(name="Firefox")])
+        assert len(index) == 0
+        assert index.get_candidates("firefox", 50) == []
+
+    def test_update_replaces_only_the_given_group(self, index: SearchIndex) -> None:
+        index.update("shortcuts", [_searchable("Google Search", "google.com")])
+        assert len(index) == len(NAMES) + 1
+
+        index.update("apps", [_searchable("Firefox")])
+        assert len(index) == 2
+        assert [r.name for r in index.get_candidates("goo", 50)] == ["Google Search"]
+
+        index.remove("shortcuts")
+        assert [r.name for r in index.get_candidates("goo", 50)] == []
+        assert [r.name for r in index.get_candidates("firefox", 50)] == ["Firefox"]
+
+    def test_update_keeps_unchanged_results(self) -> None:
+        index = SearchIndex()
+        firefox, calc, contacts = map(_searchable, ["Firefox", "LibreOffice Calc", "Contacts"])
+        index.update("apps", [firefox, calc])
+        entry_ids = dict(zip(["firefox", "calc"], index._groups["apps"]))
+
+        calc.description = "Spreadsheet"  # changed fields are indexed again
+        index.update("apps", [firefox, calc, contacts])
+        assert index._groups["apps"][0] == entry_ids["firefox"]
+        assert index._groups["apps"][1] != entry_ids["calc"]
+        assert [r.name for r in index.get_candidates("spread", 50)] == ["LibreOffice Calc"]
+
+        index.update("apps", [contacts])
+        assert len(index) == 1
+        assert [r.name for r in index.get_candidates("fire", 50)] == []
+
+    def test_refining_the_query_matches_a_fresh_search(self, index: SearchIndex) -> None:
+        typed = ["l", "li", "lib", "libr", "lib", "li", "lic", "lica", "lical", "licalc"]
+        for query in typed:
+            fresh = SearchIndex()
+            fresh.update("apps", [_searchable(name) for name in NAMES])
+            expected = [r.name for r in fresh.get_candidates(query, 50)]
+            assert [r.name for r in index.get_candidates(query, 50)] == expected
+
+    def test_query_cache_keeps_only_the_prefix_chain(self, index: SearchIndex) -> None:
+        for query in ["f", "fi", "fir", "fire"]:
+            index.get_candidates(query, 50)
+        index.get_candidates("fil", 50)
+        assert list(index._overlap_cache) == ["f", "fi", "fil"]
+
+        index.update("shortcuts", [])
+        assert not index._overlap_cache
+
+    def test_initials_scores(self) -> None:
+        index = SearchIndex()
+        vscode, writer, calc = (_searchable(name) for name in ["Visual Studio Code", "LibreOffice Writer", "Calc"])
+        index.update("apps", [vscode, writer, calc])
+        assert index.get_initials_scores("vsc") == {vscode: 100}
+        assert index.get_initials_scores("lo w") == {writer: 100}
+        assert index.get_initials_scores("lib wri") == {writer: pytest.approx(200 / 3)}
+        assert index.get_initials_scores("studio code") == {vscode: pytest.approx(200 / 3)}
+        assert index.get_initials_scores("code studio") == {}
+        assert index.get_initials_scores("v") == {}  # too short for an acronym
+        assert writer in index.get_candidates("lo w", 50)
+
+        index.remove("apps")
+        assert index.get_initials_scores("vsc") == {}
+        assert not index._acronyms
+        assert not index._word_prefixes
+
+    def test_initials_scores_are_computed_once_per_query(self, mocker: MockerFixture) -> None:
+        index = SearchIndex()
+        vscode = _searchable("Visual Studio Code")
+        index.update("apps", [vscode])
+        get_words = mocker.spy(search_index, "_get_words")
+        index.get_candidates("vsc", 50)
+        assert index.get_initials_scores("vsc") == {vscode: 100}
+        assert get_words.call_count == 1
+        index.update("apps", [])
+        assert index.get_initials_scores("vsc") == {}
+
+
+def test_search_caches_are_not_result_data() -> None:
+    result = Result(name="Firefox", searchable=True)
+    result.search_score("fifox")
+    assert result.get_normalized_fields()
+    assert result.get_name_blocks("fifox") == [(0, "Fi"), (4, "fox")]
+    assert result == Result(name="Firefox", searchable=True)
+    assert set(result) == set(Result())
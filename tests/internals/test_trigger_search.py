@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+from typing import Callable
+from unittest.mock import MagicMock
+
+import pytest
+from pytest_mock import MockerFixture
+
+from ulauncher.internals import trigger_search
+from ulauncher.internals.result import Result
+from ulauncher.internals.trigger_search import TriggerSearch
+
+NAMES = ["Contacts", "LibreOffice Calc", "Calculator", "calc"]
+
+
+def _searchable(name: str) -> Result:
+    return Result(name=name, searchable=True)
+
+
+class TestTriggerSearch:
+    @pytest.fixture
+    def captured_slices(self, mocker: MockerFixture) -> list[Callable[[], None]]:
+        """Capture the scheduled slices instead of running them when the main loop is idle."""
+        captured: list[Callable[[], None]] = []
+        mocker.patch.object(
+            trigger_search.scheduling, "run_when_idle", side_effect=lambda func: (captured.append(func), MagicMock())[1]
+        )
+        return captured
+
+    def test_scores_when_idle(self, captured_slices: list[Callable[[], None]]) -> None:
+        on_done = MagicMock()
+        TriggerSearch("calc", [_searchable(name) for name in NAMES], on_done)
+        on_done.assert_not_called()
+        captured_slices[0]()
+        assert [r.name for r in on_done.call_args.args[0]] == ["calc", "Calculator", "LibreOffice Calc"]
+
+    def test_yields_to_the_main_loop_between_slices(
+        self, captured_slices: list[Callable[[], None]], mocker: MockerFixture
+    ) -> None:
+        mocker.patch.object(trigger_search, "SLICE_DURATION", -1)  # every slice scores a single candidate
+        on_done = MagicMock()
+        search = TriggerSearch("calc", [_searchable(name) for name in NAMES], on_done, limit=2)
+        for _ in NAMES:
+            captured_slices[-1]()
+        assert [r.name for r in search.get_results()] == ["calc", "Calculator"]
+        on_done.assert_not_called()
+        captured_slices[-1]()
+        assert [r.name for r in on_done.call_args.args[0]] == ["calc", "Calculator"]
+
+    def test_cancel_drops_the_pending_slice(self, mocker: MockerFixture) -> None:
+        context = MagicMock()
+        mocker.patch.object(trigger_search.scheduling, "run_when_idle", return_value=context)
+        TriggerSearch("calc", [_searchable(name) for name in NAMES], MagicMock()).cancel()
+        context.cancel.assert_called_once_with()
+
+    def test_finish_scores_the_remaining_candidates_right_away(
+        self, captured_slices: list[Callable[[], None]], mocker: MockerFixture
+    ) -> None:
+        mocker.patch.object(trigger_search, "SLICE_DURATION", -1)  # every slice scores a single candidate
+        on_done = MagicMock()
+        search = TriggerSearch("calc", [_searchable(name) for name in NAMES], on_done)
+        captured_slices[-1]()
+        search.finish()
+        assert [r.name for r in on_done.call_args.args[0]] == ["calc", "Calculator", "LibreOffice Calc"]
+        search.finish()
+        on_done.assert_called_once()
+
+    def test_renders_partial_results_when_over_budget(
+        self, captured_slices: list[Callable[[], None]], mocker: MockerFixture
+    ) -> None:
+        mocker.patch.object(trigger_search, "SLICE_DURATION", -1)  # every slice scores a single candidate
+        on_done, on_partial = MagicMock(), MagicMock()
+        candidates = [_searchable(name) for name in ["calc", *NAMES]]
+        TriggerSearch("calc", candidates, on_done, budget=-1, on_partial=on_partial)
+        captured_slices[-1]()
+        assert [r.name for r in on_partial.call_args.args[0]] == ["calc"]
+        for _ in candidates:  # the remaining candidates, and the slice that finds none left
+            captured_slices[-1]()
+        on_partial.assert_called_once()  # only the first time the budget runs out
+        assert [r.name for r in on_done.call_args.args[0]] == ["calc", "calc", "Calculator", "LibreOffice Calc"]
+
+    def test_no_partial_results_within_budget(self, captured_slices: list[Callable[[], None]]) -> None:
+        on_done, on_partial = MagicMock(), MagicMock()
+        TriggerSearch("calc", [_searchable(name) for name in NAMES], on_done, budget=60, on_partial=on_partial)
+        captured_slices[0]()
+        on_partial.assert_not_called()
+        on_done.assert_called_once()
+
+    def test_boosts_replace_lower_scores(self, captured_slices: list[Callable[[], None]]) -> None:
+        on_done = MagicMock()
+        candidates = [_searchable(name) for name in NAMES]
+        TriggerSearch("calc", candidates, on_done, boosts={candidates[0]: 100})
+        captured_slices[0]()
+        assert [r.name for r in on_done.call_args.args[0]] == ["Contacts", "calc", "Calculator", "LibreOffice Calc"]
@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+import os
+import shutil
+from pathlib import Path
+from typing import Any
+from unittest.mock import MagicMock
+
+import pytest
+from pytest_mock import MockerFixture
+
+from ulauncher.gi import GLib
+from ulauncher.modes.apps import app_index
+from ulauncher.modes.apps.app_index import AppIndex as _AppIndex
+
+ENTRIES_DIR = Path(__file__).parent.joinpath("mock_desktop_entries").resolve()
+
+
+class AppIndex(_AppIndex):
+    saves = 0
+
+    def save(self, *_args: Any, **_kwargs: Any) -> bool:
+        self.saves += 1
+        return False
+
+    def refreshed_entries(self) -> list[app_index.AppEntry]:
+        """Refresh the index, running the main loop until it's done, and get the entries."""
+        done: list[bool] = []
+        self.refresh(done.append)
+        while not done:
+            GLib.MainContext.default().iteration(True)
+        return self.get_entries()
+
+
+class TestAppIndex:
+    @pytest.fixture
+    def data_dirs(self, tmp_path: Path, mocker: MockerFixture) -> list[Path]:
+        user_dir, system_dir = tmp_path / "user", tmp_path / "system"
+        for data_dir in (user_dir, system_dir):
+            data_dir.joinpath("applications").mkdir(parents=True)
+        mocker.patch.object(app_index.GLib, "get_user_data_dir", return_value=str(user_dir))
+        mocker.patch.object(app_index.GLib, "get_system_data_dirs", return_value=[str(system_dir)])
+        return [user_dir, system_dir]
+
+    @pytest.fixture
+    def parse(self, mocker: MockerFixture) -> MagicMock:
+        return mocker.spy(app_index.AppIndex, "_parse")
+
+    def _install(self, data_dir: Path, file_name: str, target_name: str | None = None) -> Path:
+        target = data_dir / "applications" / (target_name or file_name)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copy(ENTRIES_DIR / file_name, target)
+        return target
+
+    def test_entries(self, data_dirs: list[Path]) -> None:
+        self._install(data_dirs[1], "trueapp.desktop")
+        self._install(data_dirs[1], "falseapp.desktop", "sub/falseapp.desktop")
+        index = AppIndex()
+        entries = {entry.app_id: entry for entry in index.refreshed_entries()}
+        assert sorted(entries) == ["sub-falseapp.desktop", "trueapp.desktop"]
+        assert index.sub_dirs == [str(data_dirs[1] / "applications" / "sub")]
+        assert entries["trueapp.desktop"].name == "TrueApp - Full Name"
+        assert entries["trueapp.desktop"].description == "Your own yes-man"
+        assert entries["trueapp.desktop"].command_name == "true"
+
+    def test_entries_match_the_entries_from_the_desktop_files(self, data_dirs: list[Path]) -> None:
+        paths = [self._install(data_dirs[1], file_name) for file_name in sorted(os.listdir(ENTRIES_DIR))]
+        for entry, path in zip(AppIndex().refreshed_entries(), paths):
+            app_info = app_index.GioUnix.DesktopAppInfo.new_from_filename(str(path))
+            assert app_info
+            expected = app_index.AppEntry.from_app_info(app_info, path.name)
+            assert entry == {**expected, "mtime": entry.mtime}
+
+    def test_only_parses_new_or_modified_files(self, data_dirs: list[Path], parse: MagicMock) -> None:
+        true_path = self._install(data_dirs[1], "trueapp.desktop")
+        self._install(data_dirs[1], "falseapp.desktop")
+        index = AppIndex()
+        index.refreshed_entries()
+        assert parse.call_count == 2
+        assert index.saves == 1
+
+        assert len(AppIndex(index).get_entries()) == 2  # as if loaded from the file
+        assert len(AppIndex(index).refreshed_entries()) == 2
+        assert parse.call_count == 2
+
+        os.utime(true_path, ns=(0, 0))
+        index.refreshed_entries()
+        assert parse.call_args.args[1] == str(true_path)
+        assert parse.call_count == 3
+        assert index.saves == 2
+
+    def test_removed_files_are_dropped(self, data_dirs: list[Path]) -> None:
+        true_path = self._install(data_dirs[1], "trueapp.desktop")
+        index = AppIndex()
+        assert len(index.refreshed_entries()) == 1
+        true_path.unlink()
+        assert index.refreshed_entries() == []
+        assert len(index) == 0
+
+    def test_user_entries_override_system_entries(self, data_dirs: list[Path]) -> None:
+        self._install(data_dirs[1], "trueapp.desktop")
+        self._install(data_dirs[0], "falseapp.desktop", "trueapp.desktop")
+        entries = AppIndex().refreshed_entries()
+        assert [entry.name for entry in entries] == ["FalseApp - Full Name"]
+
+    def test_hidden_entries_are_skipped(self, data_dirs: list[Path], parse: MagicMock) -> None:
+        hidden_path = self._install(data_dirs[1], "trueapp.desktop")
+        hidden_path.write_text(hidden_path.read_text() + "Hidden=true\n")
+        index = AppIndex()
+        assert index.refreshed_entries() == []
+        assert index.refreshed_entries() == []
+        assert parse.call_count == 1  # remembered, so it's not parsed again until modified
+
+    def test_entries_are_added_when_their_program_is_installed(
+        self, data_dirs: list[Path], tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        bin_dir = tmp_path / "bin"
+        bin_dir.mkdir()
+        monkeypatch.setenv("PATH", f"{bin_dir}{os.pathsep}{os.environ['PATH']}")
+        path = self._install(data_dirs[1], "trueapp.desktop", "later.desktop")
+        path.write_text(path.read_text() + "TryExec=ulauncher-test-later\n")
+        index = AppIndex()
+        assert index.refreshed_entries() == []
+        assert index[str(path)].missing_program == "ulauncher-test-later"
+
+        program = bin_dir / "ulauncher-test-later"
+        program.write_text("#!/bin/sh\n")
+        program.chmod(0o755)
+        assert [entry.app_id for entry in index.refreshed_entries()] == ["later.desktop"]
+
+    def test_reports_whether_the_index_changed(self, data_dirs: list[Path]) -> None:
+        self._install(data_dirs[1], "trueapp.desktop")
+        index = AppIndex()
+        assert index.get_entries() == [], "the files are only read when refreshed"
+        done: list[bool] = []
+        index.refresh(done.append)
+        assert done == [], "the files are read asynchronously"
+        while not done:
+            GLib.MainContext.default().iteration(True)
+        index.refresh(done.append)
+        assert done == [True, False]
+        assert index.saves == 1
@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+import time
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+from pytest_mock import MockerFixture
+
+from ulauncher.gi import GLib
+from ulauncher.modes.apps.app_index import AppEntry
+from ulauncher.modes.apps.app_mode import AppMode
+from ulauncher.utils.settings import Settings
+
+
+def _entry(app_id: str) -> AppEntry:
+    return AppEntry(app_id=app_id, name=app_id, executable=app_id, show_in=True)
+
+
+class TestAppMode:
+    @pytest.fixture(autouse=True)
+    def settings(self, mocker: MockerFixture) -> Settings:
+        settings = Settings()
+        mocker.patch("ulauncher.modes.apps.app_mode.Settings.load", return_value=settings)
+        return settings
+
+    @pytest.fixture(autouse=True)
+    def rankings(self, mocker: MockerFixture) -> MagicMock:
+        rankings = mocker.patch("ulauncher.modes.apps.app_mode.AppRankings.load").return_value
+        rankings.generation = 0
+        mocker.patch("ulauncher.modes.apps.app_result.AppRankings.load", return_value=rankings)
+        return rankings
+
+    @pytest.fixture(autouse=True)
+    def app_info_monitor(self, mocker: MockerFixture) -> MagicMock:
+        # not the shared monitor, so the modes of other tests aren't notified
+        return mocker.patch("ulauncher.modes.apps.app_mode.Gio.AppInfoMonitor.get").return_value
+
+    @pytest.fixture(autouse=True)
+    def index(self, mocker: MockerFixture) -> MagicMock:
+        return mocker.patch("ulauncher.modes.apps.app_mode.AppIndex.load").return_value
+
+    @pytest.fixture
+    def entries(self, index: MagicMock) -> list[AppEntry]:
+        entries = [_entry("a.desktop"), _entry("b.desktop")]
+        index.get_entries.return_value = entries
+        return entries
+
+    @pytest.fixture
+    def refresh(self, index: MagicMock) -> MagicMock:
+        return index.refresh
+
+    @pytest.mark.usefixtures("entries")
+    def test_only_reloads_on_changes(
+        self, refresh: MagicMock, app_info_monitor: MagicMock, mocker: MockerFixture
+    ) -> None:
+        run_when_idle = mocker.patch("ulauncher.modes.apps.app_mode.scheduling.run_when_idle")
+        mode = AppMode()
+        assert mode.has_trigger_changes()
+        assert [r.app_id for r in mode.get_triggers()] == ["a.desktop", "b.desktop"]
+        on_done = refresh.call_args.args[0]
+        on_done(False)
+        assert not mode.has_trigger_changes()
+        run_when_idle.assert_not_called()
+
+        app_info_monitor.connect.call_args.args[1](app_info_monitor)  # "changed"
+        assert refresh.call_count == 2
+        assert not mode.has_trigger_changes(), "the saved index is used until the update is done"
+        on_done(True)
+        assert mode.has_trigger_changes()
+        run_when_idle.assert_called_once()
+
+    @pytest.mark.usefixtures("entries")
+    def test_updates_the_index_one_at_a_time(self, refresh: MagicMock) -> None:
+        mode = AppMode()
+        mode._update_index()
+        mode._update_index()
+        assert refresh.call_count == 1
+        refresh.call_args.args[0](True)
+        assert refresh.call_count == 2, "updated again for the changes made during the update"
+        refresh.call_args.args[0](False)
+        assert refresh.call_count == 2
+
+    def test_changes_in_sub_dirs_update_the_index(
+        self, index: MagicMock, refresh: MagicMock, tmp_path: Path, mocker: MockerFixture
+    ) -> None:
+        apps_dir, sub_dir = tmp_path / "applications", tmp_path / "applications" / "kde"
+        sub_dir.mkdir(parents=True)
+        mocker.patch("ulauncher.modes.apps.app_mode.get_apps_dirs", return_value=[str(apps_dir)])
+        mode = AppMode()
+        assert list(mode._dir_monitors) == [str(apps_dir)]
+        index.sub_dirs = [str(sub_dir)]
+        refresh.call_args.args[0](False)
+        assert list(mode._dir_monitors) == [str(apps_dir), str(sub_dir)]
+
+        sub_dir.joinpath("foo.desktop").write_text("[Desktop Entry]\n")
+        context = GLib.MainContext.default()
+        deadline = time.monotonic() + 5
+        while refresh.call_count == 1 and time.monotonic() < deadline:
+            context.iteration(False)
+        assert refresh.call_count == 2
+
+        index.sub_dirs = []
+        refresh.call_args.args[0](False)
+        assert list(mode._dir_monitors) == [str(apps_dir)]
+
+    @pytest.mark.usefixtures("entries")
+    def test_reloads_when_settings_change_but_not_on_launches(self, settings: Settings, rankings: MagicMock) -> None:
+        mode = AppMode()
+        list(mode.get_triggers())
+        rankings.generation = 1
+        assert not mode.has_trigger_changes()
+        settings.disable_desktop_filters = True
+        assert mode.has_trigger_changes()
+
+    @pytest.mark.usefixtures("entries")
+    def test_rankings_weigh_the_score_when_scoring(self, rankings: MagicMock) -> None:
+        rankings.get_frequency_weight.side_effect = lambda app_id: 1.05 if app_id == "b.desktop" else 0.95
+        a_result, b_result = AppMode().get_triggers()
+        # the fields are indexed without the rankings, so they don't change when an app is launched
+        assert [w for _, w in a_result.get_searchable_fields()] == [w for _, w in b_result.get_searchable_fields()]
+        assert b_result.search_score("b") == pytest.approx(a_result.search_score("a") / 0.95 * 1.05)
+
+    def test_reuses_the_results_of_unchanged_apps(self, entries: list[AppEntry]) -> None:
+        mode = AppMode()
+        first = list(mode.get_triggers())
+        entries[1] = _entry("b.desktop")  # modified
+        entries.append(_entry("c.desktop"))  # added
+        second = list(mode.get_triggers())
+        assert second[0] is first[0]
+        assert second[1] is not first[1]
+        assert [r.app_id for r in second] == ["a.desktop", "b.desktop", "c.desktop"]
+
+    @pytest.mark.usefixtures("entries")
+    def test_home_results_come_from_the_loaded_apps(self, rankings: MagicMock, mocker: MockerFixture) -> None:
+        from_id = mocker.patch("ulauncher.modes.apps.app_mode.AppResult.from_id", return_value=None)
+        rankings.get_app_ids.return_value = ["b.desktop", "removed.desktop", "a.desktop", "c.desktop"]
+        mode = AppMode()
+        triggers = list(mode.get_triggers())
+        home_results = mode.get_home_results(2)
+        assert home_results[0] is triggers[1]
+        assert home_results[1] is triggers[0]
+        from_id.assert_called_once_with("removed.desktop")  # c.desktop is past the limit
+
+        assert mode.get_home_results(2) is home_results
+        rankings.generation = 1
+        assert mode.get_home_results(2) is not home_results
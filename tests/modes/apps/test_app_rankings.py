@@ -1,16 +1,39 @@
 from __future__ import annotations
 
+import random
 from typing import Any
+from unittest.mock import MagicMock
 
+import pytest
+from pytest_mock import MockerFixture
+
+from ulauncher.modes.apps import app_rankings as app_rankings_module
+from ulauncher.modes.apps.app_rankings import DECAY_RATE
 from ulauncher.modes.apps.app_rankings import AppRankings as _AppRankings
 
 
 class AppRankings(_AppRankings):
+    saves = 0
+
     def save(self, *_args: Any, **_kwargs: Any) -> bool:
+        self.saves += 1
         return False
 
 
+def reference_bump(scores: dict[str, float], app_id: str) -> None:
+    """The original implementation, that decays every score on each launch."""
+    n = max(0, round((DECAY_RATE + 1) * sum(scores.values()) - DECAY_RATE))
+    decay = n / (n + DECAY_RATE)
+    for k in list(scores):
+        scores[k] *= decay
+    scores[app_id] = scores.get(app_id, 0) + 1.0
+
+
 class TestAppRankings:
+    @pytest.fixture(autouse=True)
+    def timer(self, mocker: MockerFixture) -> MagicMock:
+        return mocker.patch.object(app_rankings_module.scheduling, "timer")
+
     def test_get_app_ids_sorted_by_score(self) -> None:
         app_rankings = AppRankings({"a.desktop": 2.0, "b.desktop": 5.0, "c.desktop": 1.0})
         assert app_rankings.get_app_ids() == ["b.desktop", "a.desktop", "c.desktop"]
@@ -38,3 +61,52 @@ class TestAppRankings:
 
         # light history should be more volatile per launch
         assert heavy_retention_ratio > light_retention_ratio
+
+    def test_frequency_weights_follow_the_ranking(self) -> None:
+        app_rankings = AppRankings({"a.desktop": 2.0, "b.desktop": 5.0})
+        assert app_rankings.get_frequency_weights() == {"b.desktop": 1.05, "a.desktop": 1.0}
+        assert app_rankings.get_frequency_weight("c.desktop") == 0.95
+        assert AppRankings().get_frequency_weight("c.desktop") == 1.0
+
+    def test_bump_invalidates_frequency_weights(self) -> None:
+        app_rankings = AppRankings({"a.desktop": 1.0, "b.desktop": 1.0})
+        generation = app_rankings.generation
+        assert app_rankings.get_frequency_weight("b.desktop") < app_rankings.get_frequency_weight("a.desktop")
+        app_rankings.bump("b.desktop")
+        assert app_rankings.generation != generation
+        assert app_rankings.get_frequency_weight("b.desktop") > app_rankings.get_frequency_weight("a.desktop")
+
+    @pytest.mark.parametrize("seed", range(20))
+    def test_bump_decays_like_the_reference(self, seed: int, mocker: MockerFixture) -> None:
+        rng = random.Random(seed)  # noqa: S311 - seeded, to generate reproducible launch histories
+        # also cover the scale being folded back into the scores
+        mocker.patch.object(app_rankings_module, "MIN_SCALE", rng.choice([1e-100, 0.5]))
+        app_ids = [f"{i}.desktop" for i in range(rng.randint(1, 30))]
+        initial = {app_id: rng.uniform(0, 10) for app_id in rng.sample(app_ids, rng.randint(0, len(app_ids)))}
+        expected = dict(initial)
+        app_rankings = AppRankings(initial)
+        for _ in range(rng.randint(1, 500)):
+            app_id = rng.choice(app_ids)
+            reference_bump(expected, app_id)
+            app_rankings.bump(app_id)
+            assert app_rankings._total_launches() == max(
+                0, round((DECAY_RATE + 1) * sum(expected.values()) - DECAY_RATE)
+            )
+        assert dict(app_rankings) == pytest.approx(expected, rel=1e-9, abs=1e-12)
+
+    def test_bump_from_empty_rankings(self) -> None:
+        expected = {"a.desktop": 0.0}
+        reference_bump(expected, "b.desktop")
+        app_rankings = AppRankings({"a.desktop": 0.0})
+        app_rankings.bump("b.desktop")
+        assert dict(app_rankings) == expected
+
+    def test_saves_are_coalesced(self, timer: MagicMock) -> None:
+        app_rankings = AppRankings()
+        app_rankings.bump("a.desktop")
+        app_rankings.bump("b.desktop")
+        timer.assert_called_once_with(app_rankings_module.SAVE_DELAY, app_rankings.flush)
+        assert app_rankings.saves == 0
+        app_rankings.flush()
+        app_rankings.flush()
+        assert app_rankings.saves == 1
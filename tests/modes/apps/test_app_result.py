@@ -7,6 +7,7 @@ import pytest
 from pytest_mock import MockerFixture
 
 from ulauncher.gi import GioUnix
+from ulauncher.internals.result import Result
 from ulauncher.modes.apps.app_result import AppResult
 
 # Note: These mock apps actually need real values for Exec or Icon, or they won't load,
@@ -37,3 +38,6 @@ class TestAppResult:
 
     def test_search_score(self, app1: AppResult) -> None:
         assert app1.search_score("true") > app1.search_score("trivago")
+
+    def test_launch_plan_is_not_result_data(self, app1: AppResult) -> None:
+        assert set(app1) == set(Result()) | {"app_id", "keywords", "_executable"}
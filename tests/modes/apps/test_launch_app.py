@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+from pytest_mock import MockerFixture
+
+from ulauncher.gi import GioUnix
+from ulauncher.modes.apps import launch_app as launch_app_module
+from ulauncher.modes.apps.app_index import AppEntry
+from ulauncher.modes.apps.launch_app import launch_app
+from ulauncher.utils.settings import Settings
+
+DESKTOP_ENTRY = """[Desktop Entry]
+Name=Editor
+Exec=true --new %U
+Path=/tmp
+StartupWMClass=EditorWindow
+Actions=private;
+Type=Application
+
+[Desktop Action private]
+Name=Private window
+Exec=true --private %k
+"""
+
+
+class TestLaunchApp:
+    @pytest.fixture
+    def entry(self, tmp_path: Path) -> AppEntry:
+        path = tmp_path / "editor.desktop"
+        path.write_text(DESKTOP_ENTRY)
+        app_info = GioUnix.DesktopAppInfo.new_from_filename(str(path))
+        assert app_info
+        return AppEntry.from_app_info(app_info, "editor.desktop")
+
+    @pytest.fixture(autouse=True)
+    def settings(self, mocker: MockerFixture) -> Settings:
+        settings = Settings()
+        mocker.patch.object(launch_app_module.Settings, "load", return_value=settings)
+        return settings
+
+    @pytest.fixture(autouse=True)
+    def launch_detached(self, mocker: MockerFixture) -> MagicMock:
+        return mocker.patch.object(launch_app_module, "launch_detached")
+
+    @pytest.fixture(autouse=True)
+    def try_raise_app(self, mocker: MockerFixture) -> MagicMock:
+        return mocker.patch.object(launch_app_module, "try_raise_app", return_value=False)
+
+    def test_launch_plan(self, entry: AppEntry) -> None:
+        assert entry.exec_line == "true --new"
+        assert entry.action_exec_lines == {"private": f"true --private {entry.filename}"}
+        assert entry.working_dir == "/tmp"
+        assert entry.wm_class == "EditorWindow"
+        assert not entry.dbus_activatable
+        assert not entry.terminal
+
+    def test_launch_does_not_read_the_desktop_file(
+        self, entry: AppEntry, launch_detached: MagicMock, mocker: MockerFixture
+    ) -> None:
+        Path(entry.filename).unlink()
+        keyfile = mocker.patch.object(launch_app_module.GLib, "KeyFile")
+        assert launch_app(entry)
+        launch_detached.assert_called_once_with(["true", "--new"], "/tmp")
+        assert launch_app(entry, "private")
+        launch_detached.assert_called_with(["true", "--private", entry.filename], "/tmp")
+        keyfile.assert_not_called()
+
+    def test_raises_by_wm_class(self, entry: AppEntry, settings: Settings, try_raise_app: MagicMock) -> None:
+        settings.raise_if_started = True
+        try_raise_app.return_value = True
+        assert launch_app(entry)
+        try_raise_app.assert_called_once_with("editorwindow")
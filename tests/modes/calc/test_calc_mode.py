@@ -99,6 +99,14 @@ class TestCalcMode:
         assert not mode.matches_query_str("5*mysin(")
         assert not mode.matches_query_str("co")
 
+    def test_query_prefilter(self, mode: CalcMode) -> None:
+        prefilter = mode.query_prefilter
+        assert prefilter
+        for query_str in ("5", "-5", "(5/0", ".5", ",5", "+5*2", "sqrt(2)", "pi * 2", "e^2", "erfc(1)", "-s"):
+            assert prefilter.match(query_str), query_str
+        for query_str in ("firefox", "a+b", "asdf()", "pie", "exponent", ")+3"):
+            assert not prefilter.match(query_str), query_str
+
     def test_get_completions(self) -> None:
         assert get_completions("5*s") == (("sin", "5*sin("), ("sinh", "5*sinh("), ("sqrt", "5*sqrt("))
         assert get_completions("5 * sq") == (("sqrt", "5 * sqrt("),)
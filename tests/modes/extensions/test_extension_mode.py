@@ -7,6 +7,8 @@ from unittest.mock import MagicMock, call
 from pytest_mock import MockerFixture
 
 from ulauncher.internals import effects
+from ulauncher.internals.effects import EffectMessage, EffectType
+from ulauncher.internals.ipc import EventType
 from ulauncher.internals.query import Query
 from ulauncher.internals.result import Result
 from ulauncher.modes.extensions.extension_record import ExtensionRecord
@@ -160,3 +162,79 @@ def test_handle_response__streamed_batches_keep_callback_until_final() -> None:
     assert mode._pending_callback is None, "the final batch clears the callback"
 
     assert callback.call_args_list == [call(non_final), call(final)]
+
+
+def _make_caching_mode() -> tuple[ExtensionMode, MagicMock]:
+    mode, service = _make_mode()
+    mode._active_ext = MagicMock(id="test.ext")
+    mode._active_ext.display_manifest.result_cache_ttl = 60
+    service.is_running.return_value = True
+    return mode, service
+
+
+def _respond(mode: ExtensionMode, request_id: int, effect: EffectMessage) -> None:
+    mode._request_id = request_id
+    mode._pending_callback = mode._pending_callback or MagicMock()
+    mode.handle_message("test.ext", {"name": "response", "request_id": request_id, "response": {"effect": effect}})
+
+
+def _render(mode: ExtensionMode, request_id: int, results: list[dict[str, object]]) -> list[Result]:
+    effect = effects.render_results(results)  # type: ignore[arg-type]
+    _respond(mode, request_id, effect)
+    return effect["results"]
+
+
+def test_activate_result__ignores_results_the_extension_no_longer_keeps() -> None:
+    mode, service = _make_caching_mode()
+    (outdated,) = _render(mode, 1, [{"name": "outdated", "__result_id__": 0}])
+    (live,) = _render(mode, 2, [{"name": "live", "__result_id__": 0}])
+    callback = MagicMock()
+    mode.activate_result("action", outdated, Query(None, ""), callback)
+    callback.assert_called_once_with(effects.do_nothing())
+    service.send_message.assert_not_called()
+
+    mode.activate_result("action", live, Query(None, ""), callback)
+    service.send_message.assert_called_once()
+
+
+def test_activate_result__replays_cached_results_on_the_live_result() -> None:
+    mode, service = _make_caching_mode()
+    (cached,) = _render(mode, 1, [{"name": "result", "__result_id__": 0}])
+    mode._pending_callback = MagicMock()  # the refreshing query
+    callback = MagicMock()
+    mode.activate_result("action", Result(cached), Query(None, ""), callback)
+    service.send_message.assert_not_called()
+
+    _render(mode, 2, [{"name": "other", "__result_id__": 0}, {"name": "result", "__result_id__": 1}])
+    service.send_message.assert_called_once_with(
+        mode._active_ext, {"type": EventType.RESULT_ACTIVATION, "args": ("action", 1)}, 3
+    )
+    assert mode._pending_callback is callback
+
+
+def test_activate_result__gives_up_when_the_live_response_lacks_the_result() -> None:
+    mode, service = _make_caching_mode()
+    mode._pending_callback = MagicMock()
+    callback = MagicMock()
+    mode.activate_result("action", Result(name="gone"), Query(None, ""), callback)
+
+    _render(mode, 1, [{"name": "other", "__result_id__": 0}])
+    callback.assert_called_once_with(effects.do_nothing())
+    service.send_message.assert_not_called()
+
+
+def test_activate_result__tracks_results_nested_in_legacy_run_many() -> None:
+    mode, service = _make_caching_mode()
+    rendered = effects.render_results([{"name": "nested", "__result_id__": 0}])  # type: ignore[list-item]
+    _respond(mode, 1, {"type": EffectType.LEGACY_RUN_MANY, "effects": [rendered]})  # type: ignore[typeddict-item]
+    mode.activate_result("action", rendered["results"][0], Query(None, ""), MagicMock())
+    service.send_message.assert_called_once()
+
+
+def test_activate_result__activates_results_of_extensions_without_result_cache() -> None:
+    mode, service = _make_mode()
+    mode._active_ext = MagicMock(id="test.ext")
+    mode._active_ext.display_manifest.result_cache_ttl = None
+    service.is_running.return_value = True
+    mode.activate_result("action", Result(name="result", __result_id__=0), Query(None, ""), MagicMock())
+    service.send_message.assert_called_once()
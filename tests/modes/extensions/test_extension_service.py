@@ -27,12 +27,14 @@ def test_save_user_preferences__saves_and_sends_changed_values(mocker: MockerFix
     user_prefs_json = MagicMock()
     mocker.patch("ulauncher.modes.extensions.extension_record._load_preferences", return_value=user_prefs_json)
     send_message = mocker.patch.object(service, "send_message")
+    service.listener = MagicMock()
 
     data = {"preferences": {"city": "Berlin", "units": "metric", "undeclared": "value"}}
 
     service.save_user_preferences(record, data)
 
     user_prefs_json.save.assert_called_once_with(data)
+    service.listener.invalidate_cache.assert_called_once_with()  # the trigger keywords may have changed
     send_message.assert_called_once_with(
         record, {"type": EventType.UPDATE_PREFERENCES, "args": ("city", "Berlin", "Stockholm")}
     )
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from pathlib import Path
 from types import SimpleNamespace
 from unittest.mock import MagicMock
 
@@ -83,3 +84,15 @@ class TestFileBrowserMode:
     def test_handle_query__invalid_path__empty_list_rendered(self, mode: FileBrowserMode) -> None:
         query = Query(None, "~~")
         assert get_results(mode, query) == []
+
+    def test_results_are_cached_until_the_dir_is_modified(self, mode: FileBrowserMode, tmp_path: Path) -> None:
+        query = Query(None, f"{tmp_path}/fo")
+        policy = mode.get_result_cache_policy(query)
+        assert policy
+        assert policy.token == mode.get_result_cache_policy(query).token  # type: ignore[union-attr]
+        (tmp_path / "foo").mkdir()
+        assert policy.token != mode.get_result_cache_policy(query).token  # type: ignore[union-attr]
+        assert mode.get_result_cache_policy(Query(None, "")) is None
+
+    def test_dir_listings_sorted_by_access_time_are_not_cached(self, mode: FileBrowserMode, tmp_path: Path) -> None:
+        assert mode.get_result_cache_policy(Query(None, f"{tmp_path}/")) is None
@@ -11,7 +11,7 @@ from ulauncher.internals.query import Query
 from ulauncher.internals.result import Result
 from ulauncher.modes.shortcuts.results import ShortcutResult, ShortcutStaticTrigger
 from ulauncher.modes.shortcuts.shortcut_mode import ShortcutMode
-from ulauncher.modes.shortcuts.shortcuts import Shortcut
+from ulauncher.modes.shortcuts.shortcuts import Shortcut, Shortcuts
 
 
 def get_results(mode: ShortcutMode, query: Query) -> list[Result]:
@@ -117,3 +117,14 @@ class TestShortcutMode:
         result = ShortcutResult(keyword="kw", cmd="/bin/asdf", run_without_argument=True)
         mode.activate_result("run", result, query, lambda _: None)
         run_shortcut.assert_not_called()
+
+    def test_has_trigger_changes(self, mode: ShortcutMode) -> None:
+        mode.shortcuts = Shortcuts({"a": Shortcut(keyword="a")})
+        assert mode.has_trigger_changes()
+        list(mode.get_triggers())
+        assert not mode.has_trigger_changes()
+        mode.shortcuts["a"] = Shortcut(keyword="b")
+        assert mode.has_trigger_changes()
+        list(mode.get_triggers())
+        del mode.shortcuts["a"]
+        assert mode.has_trigger_changes()
@@ -1,14 +1,18 @@
 from __future__ import annotations
 
+import re
+import time
 from typing import Callable
 from unittest.mock import MagicMock, PropertyMock
 
+import pytest
 from pytest_mock import MockerFixture
 
-from ulauncher.core import UlauncherCore
+from ulauncher.core import RESULT_CACHE_SIZE, UlauncherCore
 from ulauncher.internals import effects
 from ulauncher.internals.query import Query
 from ulauncher.internals.result import Result
+from ulauncher.modes.mode import ResultCachePolicy
 
 
 class TestStreamingResults:
@@ -47,3 +51,143 @@ class TestStreamingResults:
         core.activate_result(Result(name="a"), MagicMock(), alt=True)
         captured[0]()  # the stale flush fires after activation
         render.assert_not_called()
+
+
+class TestSearch:
+    def test_new_query_cancels_pending_search(self, mocker: MockerFixture) -> None:
+        mocker.patch("ulauncher.core.get_modes", return_value=[])
+        contexts: list[MagicMock] = []
+        mocker.patch(
+            "ulauncher.internals.trigger_search.scheduling.run_when_idle",
+            side_effect=lambda _fn: (contexts.append(MagicMock()), contexts[-1])[1],
+        )
+        core = UlauncherCore()
+        render = MagicMock()
+        core.set_query("fir", render)
+        core.set_query("fire", render)
+        contexts[0].cancel.assert_called_once_with()
+        contexts[1].cancel.assert_not_called()
+        render.assert_not_called()  # the search is scored when the main loop is idle
+
+    def test_results_typed_faster_than_searched_are_activated(self, mocker: MockerFixture) -> None:
+        mode = MagicMock(query_prefilter=None)
+        mode.matches_query_str.return_value = False
+        firefox = Result(name="Firefox", searchable=True, actions={"launch": {"name": "Launch"}})
+        mode.get_triggers.return_value = [Result(name="Files", searchable=True), firefox]
+        mocker.patch("ulauncher.core.get_modes", return_value=[mode])
+        mocker.patch("ulauncher.internals.trigger_search.scheduling.run_when_idle")  # the main loop doesn't iterate
+        mocker.patch("ulauncher.core.QueryHistory")
+        core = UlauncherCore()
+        render = MagicMock()
+        core.set_query("fir", render)
+        render.assert_not_called()
+
+        core.finish_search()  # on Enter, before the results to activate are picked
+        (update,) = render.call_args.args
+        assert update["results"][0] is firefox
+        core.activate_result(firefox, render)
+        assert mode.activate_result.call_args.args[:2] == ("launch", firefox)
+
+    def test_empty_partial_results_are_not_rendered(self) -> None:
+        core = UlauncherCore()
+        render = MagicMock()
+        core._render_partial_search([], render)
+        render.assert_not_called()
+
+    def test_candidates_are_scored_by_search_weight(self, mocker: MockerFixture) -> None:
+        class WeightedResult(Result):
+            def get_search_weight(self) -> float:
+                return 1.05
+
+        core = UlauncherCore()
+        weighted = WeightedResult(name="foo bar")
+        mocker.patch.object(core, "load_triggers")
+        mocker.patch.object(core._search_index, "get_candidates", return_value=[Result(name="foo"), weighted])
+        trigger_search = mocker.patch("ulauncher.core.TriggerSearch")
+        core.query = Query(None, "foo")
+        core.search_triggers(MagicMock())
+        assert trigger_search.call_args.args[1][0] is weighted
+
+
+class TestQueryRouting:
+    def test_only_modes_passing_the_prefilter_run_the_full_check(self, mocker: MockerFixture) -> None:
+        mocker.patch("ulauncher.core.UlauncherCore.handle_change")
+        calc_mode = mocker.patch("ulauncher.modes.calc.calc_mode.CalcMode").return_value
+        calc_mode.query_prefilter = re.compile(r"\d")
+        mocker.patch("ulauncher.core.get_modes", return_value=[calc_mode])
+        core = UlauncherCore()
+        core.set_query("firefox", MagicMock())
+        calc_mode.matches_query_str.assert_not_called()
+        core.set_query("5+5", MagicMock())
+        calc_mode.matches_query_str.assert_called_once_with("5+5")
+        assert core._mode is calc_mode
+
+    def test_keywords_of_all_modes_are_looked_up_at_once(self, mocker: MockerFixture) -> None:
+        mocker.patch("ulauncher.core.UlauncherCore.handle_change")
+        modes = [MagicMock(query_prefilter=None), MagicMock(query_prefilter=None)]
+        modes[0].get_triggers.return_value = [Result(name="Google", keyword="g")]
+        modes[1].get_triggers.return_value = [Result(name="Wikipedia", keyword="w")]
+        mocker.patch("ulauncher.core.get_modes", return_value=modes)
+        core = UlauncherCore()
+        core.load_triggers(force=True)
+        core.set_query("w foo", MagicMock())
+        assert core._mode is modes[1]
+        assert (core.query.keyword, core.query.argument) == ("w", "foo")
+        modes[0].matches_query_str.assert_not_called()
+
+
+class TestResultCache:
+    @pytest.fixture
+    def mode(self, mocker: MockerFixture) -> MagicMock:
+        mode = MagicMock(query_prefilter=None)
+        mode.matches_query_str.return_value = True
+        mode.get_result_cache_policy.return_value = ResultCachePolicy()
+        mode.handle_query.side_effect = lambda query, callback: callback(
+            effects.render_results([Result(name=str(query))])
+        )
+        mocker.patch("ulauncher.core.get_modes", return_value=[mode])
+        mocker.patch("ulauncher.core.scheduling.timer")
+        return mode
+
+    def test_renders_cached_results_when_the_query_is_entered_again(self, mode: MagicMock) -> None:
+        core = UlauncherCore()
+        render = MagicMock()
+        core.set_query("5+5", render)
+        core.set_query("5+", render)
+        core.set_query("5+5", render)
+        assert mode.handle_query.call_count == 2
+        assert render.call_args_list[2].args[0]["results"] == render.call_args_list[0].args[0]["results"]
+
+    def test_stale_results_are_not_reused(self, mode: MagicMock, mocker: MockerFixture) -> None:
+        core = UlauncherCore()
+        mode.get_result_cache_policy.return_value = ResultCachePolicy(token=1)
+        core.set_query("~/foo", MagicMock())
+        mode.get_result_cache_policy.return_value = ResultCachePolicy(token=2)
+        core.set_query("~/foo", MagicMock())
+        assert mode.handle_query.call_count == 2
+
+        mode.get_result_cache_policy.return_value = ResultCachePolicy(token=2, ttl=10)
+        core.set_query("~/bar", MagicMock())
+        core.set_query("~/bar", MagicMock())
+        assert mode.handle_query.call_count == 3
+        mocker.patch("ulauncher.core.time.monotonic", return_value=time.monotonic() + 11)
+        core.set_query("~/bar", MagicMock())
+        assert mode.handle_query.call_count == 4
+
+    def test_refreshes_the_cached_results(self, mode: MagicMock) -> None:
+        mode.get_result_cache_policy.return_value = ResultCachePolicy(refresh=True)
+        core = UlauncherCore()
+        core.set_query("g foo", MagicMock())
+        render = MagicMock()
+        core.set_query("g foo", render)
+        assert mode.handle_query.call_count == 2
+        assert render.call_count == 2  # the cached results, then the refreshed ones
+
+    def test_is_bounded(self, mode: MagicMock) -> None:
+        core = UlauncherCore()
+        for i in range(RESULT_CACHE_SIZE + 1):
+            core.set_query(str(i), MagicMock())
+        core.set_query(str(RESULT_CACHE_SIZE), MagicMock())
+        assert mode.handle_query.call_count == RESULT_CACHE_SIZE + 1
+        core.set_query("0", MagicMock())
+        assert mode.handle_query.call_count == RESULT_CACHE_SIZE + 2
@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+import os
+import time
+from pathlib import Path
+from typing import Any, cast
+from unittest.mock import MagicMock
+
+import pytest
+from pytest_mock import MockerFixture
+
+from ulauncher.ui import load_icon_surface as load_icon_surface_module
+from ulauncher.ui.load_icon_surface import (
+    _DISK_CACHE_HEADER,
+    DEFAULT_EXE_ICON,
+    ICON_CACHE_MAX_BYTES,
+    _prepare_disk_cache_dir,
+    _surface_from_cache_data,
+    _surface_to_cache_data,
+    _SurfaceCache,
+    load_icon_surface_async,
+)
+
+
+def _surface(side: int) -> Any:
+    surface = MagicMock()
+    surface.get_stride.return_value = side * 4
+    surface.get_height.return_value = side
+    return cast("Any", surface)
+
+
+class TestSurfaceCache:
+    def test_evicts_the_least_recently_used_surfaces_over_the_byte_limit(self) -> None:
+        cache = _SurfaceCache(max_bytes=4 * 40 * 40 * 4)
+        surfaces = [_surface(40) for _ in range(3)]
+        for index, surface in enumerate(surfaces):
+            cache.add((f"icon{index}", 40, 1), surface)
+        assert cache.get(("icon0", 40, 1)) is surfaces[0]
+        cache.add(("big", 30, 2), _surface(60))
+        assert cache.get(("icon0", 40, 1)) is surfaces[0]
+        assert cache.get(("icon1", 40, 1)) is None
+        assert cache.get(("icon2", 40, 1)) is None
+        assert cache.byte_size == 40 * 40 * 4 + 60 * 60 * 4
+
+    def test_keeps_a_surface_larger_than_the_limit(self) -> None:
+        cache = _SurfaceCache(max_bytes=100)
+        surface = _surface(40)
+        cache.add(("icon", 40, 1), surface)
+        assert cache.get(("icon", 40, 1)) is surface
+
+
+class TestDiskCache:
+    def test_restores_the_surface(self) -> None:
+        import cairo
+
+        surface = cairo.ImageSurface(cairo.Format.ARGB32, 4, 3)
+        context = cairo.Context(surface)
+        context.set_source_rgba(1, 0, 0, 0.5)
+        context.paint()
+        data = _surface_to_cache_data(surface, 123)
+
+        cached = _surface_from_cache_data(data, 123, 2)
+        assert cached
+        assert (cached.get_width(), cached.get_height()) == (4, 3)
+        assert cached.get_device_scale() == (2, 2)
+        assert bytes(cached.get_data()) == bytes(surface.get_data())
+
+    def test_ignores_outdated_or_truncated_data(self) -> None:
+        import cairo
+
+        data = _surface_to_cache_data(cairo.ImageSurface(cairo.Format.ARGB32, 4, 3), 123)
+        assert _surface_from_cache_data(data, 124, 1) is None  # the icon file was modified
+        assert _surface_from_cache_data(data[:-1], 123, 1) is None
+
+    def test_ignores_a_corrupt_header(self) -> None:
+        import cairo
+
+        data = _surface_to_cache_data(cairo.ImageSurface(cairo.Format.ARGB32, 4, 3), 123)
+        magic, mtime_us, cairo_format, width, height, stride = _DISK_CACHE_HEADER.unpack_from(data)
+        pixels = data[_DISK_CACHE_HEADER.size :]
+        unknown_format = _DISK_CACHE_HEADER.pack(magic, mtime_us, 99, width, height, stride) + pixels
+        assert _surface_from_cache_data(unknown_format, 123, 1) is None
+        narrow_stride = _DISK_CACHE_HEADER.pack(magic, mtime_us, cairo_format, width, height, 4) + bytes(4 * height)
+        assert _surface_from_cache_data(narrow_stride, 123, 1) is None
+
+    def test_prunes_the_least_recently_written_icons(self, mocker: MockerFixture, tmp_path: Path) -> None:
+        from ulauncher.gi import GLib
+
+        mocker.patch.object(load_icon_surface_module, "ICON_CACHE_DIR", str(tmp_path))
+        mocker.patch.object(load_icon_surface_module, "ICON_DISK_CACHE_MAX_BYTES", 250)
+        for mtime, name in enumerate(["oldest", "older", "new"]):
+            (tmp_path / name).write_bytes(bytes(100))
+            os.utime(tmp_path / name, (mtime, mtime))
+
+        cast("Any", _prepare_disk_cache_dir).cache_clear()
+        _prepare_disk_cache_dir()
+        assert len(list(tmp_path.iterdir())) == 3, "pruned in the background"
+        context = GLib.MainContext.default()
+        deadline = time.monotonic() + 5
+        while len(list(tmp_path.iterdir())) == 3 and time.monotonic() < deadline:
+            context.iteration(False)
+        assert sorted(path.name for path in tmp_path.iterdir()) == ["new", "older"]
+
+
+class TestLoadIconSurfaceAsync:
+    @pytest.fixture(autouse=True)
+    def undecodable_icon(self, mocker: MockerFixture) -> None:
+        from gi.repository import GdkPixbuf
+
+        from ulauncher.gi import Gio, GLib
+
+        mocker.patch.object(load_icon_surface_module, "_cache", _SurfaceCache(ICON_CACHE_MAX_BYTES))
+        file = mocker.patch.object(Gio.File, "new_for_path").return_value
+        file.query_info_async.side_effect = lambda *args: args[-1](file, MagicMock())
+        file.query_info_finish.side_effect = GLib.Error("no mtime, so the disk cache isn't used")
+        file.read_async.side_effect = lambda _priority, _cancellable, callback: callback(file, MagicMock())
+        mocker.patch.object(
+            GdkPixbuf.Pixbuf, "new_from_stream_at_scale_async", side_effect=lambda *args: args[-1](None, MagicMock())
+        )
+        # a pixbuf that couldn't be created makes _create_surface raise a RuntimeError
+        mocker.patch.object(GdkPixbuf.Pixbuf, "new_from_stream_finish", return_value=None)
+
+    def test_falls_back_to_the_default_icon(self, mocker: MockerFixture) -> None:
+        fallback = _surface(40)
+        load_icon_surface_module._cache.add((DEFAULT_EXE_ICON, 40, 1), fallback)
+        load_icon_surface = mocker.patch.object(load_icon_surface_module, "load_icon_surface")
+        callbacks = [MagicMock(), MagicMock()]
+        load_icon_surface_async("/broken.png", 40, 1, callbacks[0])
+        load_icon_surface_async("/other-broken.png", 40, 1, callbacks[1])
+        for callback in callbacks:
+            callback.assert_called_once_with(fallback)
+        load_icon_surface.assert_not_called()  # the cached fallback is reused, and not loaded synchronously
+        assert not load_icon_surface_module._pending_callbacks
+
+    def test_forgets_the_pending_icon_when_the_fallback_fails(self) -> None:
+        callback = MagicMock()
+        load_icon_surface_async("/broken.png", 40, 1, callback)
+        callback.assert_not_called()
+        assert not load_icon_surface_module._pending_callbacks
@@ -21,11 +21,23 @@ class TestResultWidget:
         return mocker.patch("ulauncher.ui.result_widget.ResultWidget.scroll_to_focus")
 
     def test_descr(self) -> None:
-        assert len(ResultWidget(Result(), 0, Query("", None), noop, noop, JUMP_KEYS).text_container.get_children()) == 1
+        assert not ResultWidget(Result(), 0, Query("", None), noop, noop, JUMP_KEYS).descr_label.get_visible()
         res = Result(description="descr")
-        assert len(ResultWidget(res, 0, Query("", None), noop, noop, JUMP_KEYS).text_container.get_children()) == 2
+        assert ResultWidget(res, 0, Query("", None), noop, noop, JUMP_KEYS).descr_label.get_visible()
         res = Result(description="descr", compact=True)
-        assert len(ResultWidget(res, 0, Query("", None), noop, noop, JUMP_KEYS).text_container.get_children()) == 1
+        assert not ResultWidget(res, 0, Query("", None), noop, noop, JUMP_KEYS).descr_label.get_visible()
+
+    def test_bind_replaces_the_previous_result(self) -> None:
+        from gi.repository import Pango
+
+        widget = ResultWidget(Result(name="first", description="descr", wrap=True), 0, Query("", None), noop, noop, [])
+        widget.select()
+        widget.bind(Result(name="second"), 6, Query("", None), JUMP_KEYS)
+        assert widget.title_label.get_text() == "second"
+        assert not widget.descr_label.get_visible()
+        assert widget.title_label.get_ellipsize() == Pango.EllipsizeMode.MIDDLE
+        assert widget.shortcut_label.get_text() == ""
+        assert "selected" not in widget.item_box.get_style_context().list_classes()
 
     def test_select(self) -> None:
         result_wgt = ResultWidget(Result(), 0, Query("query", None), noop, noop, JUMP_KEYS)
@@ -36,6 +48,22 @@ class TestResultWidget:
         result_wgt.deselect()
         assert "selected" not in style.list_classes()
 
+    def test_highlight_style_is_kept_until_the_style_is_updated(self) -> None:
+        widget = ResultWidget(Result(name="Firefox", searchable=True), 0, Query(None, "fire"), noop, noop, JUMP_KEYS)
+        widget._highlight_attributes = {"foreground": "#123456"}
+        widget.highlight_name()
+        assert "#123456" in widget.title_label.get_label()
+        widget.title_label.emit("style-updated")
+        assert "#123456" not in widget.title_label.get_label()
+        assert 'weight="' in widget.title_label.get_label()
+
+    def test_highlight_style_is_read_again_when_rebound(self) -> None:
+        widget = ResultWidget(Result(name="Firefox", searchable=True), 0, Query(None, "fire"), noop, noop, JUMP_KEYS)
+        widget.select()
+        widget._highlight_attributes = {"foreground": "#123456"}  # of the selected row
+        widget.bind(Result(name="Firefox", searchable=True), 0, Query(None, "fire"), JUMP_KEYS)
+        assert "#123456" not in widget.title_label.get_label()
+
     def test_shortcut(self) -> None:
         result_wgt = ResultWidget(Result(), 0, Query("query", None), noop, noop, JUMP_KEYS)
         assert result_wgt.shortcut_label.get_text() == "Alt+1"
@@ -66,14 +94,22 @@ class TestResultWidget:
             assert not label.get_line_wrap()
             assert label.get_ellipsize() == Pango.EllipsizeMode.MIDDLE
 
-    def test_wrap__highlighting_is_skipped(self) -> None:
+    def test_wrap__highlighted_name_is_one_label(self) -> None:
         from gi.repository import Gtk
 
         res = Result(name="wrapped name", wrap=True, highlightable=True)
         widget = ResultWidget(res, 0, Query("wrap", None), noop, noop, JUMP_KEYS)
 
-        # highlighting would split the name over multiple labels, which cannot wrap as one paragraph
+        # the highlight is markup, so the name still wraps as one paragraph
         children = widget.title_box.get_children()
         assert len(children) == 1
         assert cast("Gtk.Label", children[0]).get_text() == "wrapped name"
-        assert not any("item-highlight" in c.get_style_context().list_classes() for c in children)
+        assert "<span" in cast("Gtk.Label", children[0]).get_label()
+
+    def test_highlight_reuses_the_blocks_from_scoring(self, mocker: MockerFixture) -> None:
+        res = Result(name="Firefox", searchable=True)
+        res.search_score("fifox")
+        get_matching_blocks = mocker.patch("ulauncher.utils.fuzzy_search.get_matching_blocks")
+        widget = ResultWidget(res, 0, Query(None, "fifox"), noop, noop, JUMP_KEYS)
+        get_matching_blocks.assert_not_called()
+        assert widget.name_blocks == [(0, "Fi"), (4, "fox")]
@@ -15,8 +15,7 @@ from ulauncher.ui.results_view import ResultsView
 
 def _named_widget(name: str, *, searchable: bool = True) -> MagicMock:
     widget = MagicMock()
-    widget.result.name = name
-    widget.result.searchable = searchable
+    widget.result = Result(name=name, searchable=searchable)
     return widget
 
 
@@ -146,8 +145,7 @@ class TestResultsViewSelection:
     def test_apply_selection_preserves_user_pick(self, view: ResultsView) -> None:
         view._widgets = cast("Any", [_named_widget("a"), _named_widget("keep"), _named_widget("b")])
         view._user_selected = True
-        previous = cast("Any", MagicMock(name="prev"))
-        previous.name = "keep"
+        previous = Result(name="keep")
         view._apply_selection(None, previous)
         assert view._index == 1
         assert view._user_selected
@@ -155,8 +153,7 @@ class TestResultsViewSelection:
     def test_apply_selection_falls_back_when_user_pick_gone(self, view: ResultsView) -> None:
         view._widgets = cast("Any", [_named_widget("a"), _named_widget("b")])
         view._user_selected = True
-        previous = cast("Any", MagicMock(name="prev"))
-        previous.name = "gone"
+        previous = Result(name="gone")
         view._apply_selection("a", previous)
         assert view._index == 0
         assert not view._user_selected
@@ -206,3 +203,36 @@ class TestResultsViewStreaming:
         view.render(self._update(["a", "b"], query="q2"))
         assert view._user_selected is False
         assert view._index == 0
+
+    def test_rebinds_the_pooled_widgets(self, view: ResultsView) -> None:
+        view.render(self._update(["a", "b", "c"], query="q1"))
+        pool = list(view._widgets)
+        view.render(self._update(["d", "e"], query="q2"))
+        assert view._widgets == pool[:2]
+        assert [widget.result.name for widget in view._widgets] == ["d", "e"]
+        assert not pool[2].get_visible()
+        view.render(self._update(["f", "g", "h"], query="q3"))
+        assert view._widgets == pool
+        assert pool[2].get_visible()
+
+    def test_keeps_the_rows_of_the_results_that_stay(self, view: ResultsView, mocker: MockerFixture) -> None:
+        view.render(self._update(["a", "b", "c"], query="q1"))
+        rows = {widget.result.name: widget for widget in view._widgets}
+        load_icon = mocker.patch("ulauncher.ui.result_widget.load_icon_surface_async")
+        view.render(self._update(["c", "d", "a"], query="q2"))
+        assert [widget.result.name for widget in view._widgets] == ["c", "d", "a"]
+        assert view._widgets[0] is rows["c"]
+        assert view._widgets[1] is rows["b"]  # the row of the result that left shows the new one
+        assert view._widgets[2] is rows["a"]
+        assert view._box.get_children() == view._widgets
+        load_icon.assert_not_called()  # the rows show the same icon as before
+
+    def test_only_applies_css_to_new_rows(self, view: ResultsView) -> None:
+        apply_css = MagicMock()
+        view._apply_css = apply_css
+        view.render(self._update(["a", "b"], query="q1"))
+        assert [call.args[0] for call in apply_css.call_args_list] == view._widgets
+        apply_css.reset_mock()
+        view.render(self._update(["c", "d"], query="q2"))
+        view.render(self._update(["e"], query="q2", append=True))
+        assert [call.args[0] for call in apply_css.call_args_list] == [view._widgets[2]]
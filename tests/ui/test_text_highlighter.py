@@ -1,3 +1,4 @@
+from ulauncher.ui.helpers.text_highlighter import get_highlight_markup
 from ulauncher.ui.helpers.text_highlighter import highlight_text as hl
 
 
@@ -7,3 +8,12 @@ def test_highlight_text() -> None:
     assert list(hl("dome", "Documents")) == [("Do", True), ("cu", False), ("me", True), ("nts", False)]
     assert list(hl("e tom", "São tomé & príncipe")) == [("São", False), (" tom", True), ("é & príncipe", False)]
     assert list(hl("date", "Date &amp; Time")) == [("Date", True), (" &amp; Time", False)]
+
+
+def test_get_highlight_markup() -> None:
+    blocks = [(0, "Date"), (11, "Ti")]
+    markup = get_highlight_markup("Date &amp; Time", blocks, {"foreground": "#ff0000"})
+    assert markup == '<span foreground="#ff0000">Date</span> &amp; <span foreground="#ff0000">Ti</span>me'
+    assert get_highlight_markup("<b>", [], {"foreground": "#ff0000"}) == "&lt;b&gt;"
+    markup = get_highlight_markup("Date", [(0, "D")], {"foreground": "#ff0000", "weight": "700", "style": "italic"})
+    assert markup == '<span foreground="#ff0000" weight="700" style="italic">D</span>ate'
@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+import sys
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+from pytest_mock import MockerFixture
+
+from ulauncher.gi import GLib
+from ulauncher.modes.apps import try_raise_app as try_raise_app_module
+from ulauncher.modes.apps.try_raise_app import try_raise_app
+
+CLIENT_LIST_STACKING = 2
+
+
+class FakeDisplay:
+    """Display connection with the events in `queue` pending, and the stacking client list in `client_list`"""
+
+    def __init__(self) -> None:
+        self.queue: list[SimpleNamespace] = []
+        self.client_list: list[int] = []
+        self.windows: dict[int, MagicMock] = {}
+
+    def pending_events(self) -> int:
+        return len(self.queue)
+
+    def next_event(self) -> SimpleNamespace:
+        return self.queue.pop(0)
+
+    def add_window(self, win_id: int, wm_class: tuple[str, str]) -> MagicMock:
+        win = self.windows[win_id] = MagicMock(name=f"window {win_id}")
+        win.get_wm_class.return_value = wm_class
+        return win
+
+
+@pytest.fixture
+def display(mocker: MockerFixture) -> FakeDisplay:
+    ewmh = pytest.importorskip("ulauncher.utils.ewmh")
+    fake_display = FakeDisplay()
+    ewmh_instance = mocker.patch.object(ewmh, "EWMH").return_value
+    ewmh_instance.display.get_atom.side_effect = {"_NET_CLIENT_LIST": 1, "_NET_CLIENT_LIST_STACKING": 2}.__getitem__
+    ewmh_instance.display.pending_events.side_effect = fake_display.pending_events
+    ewmh_instance.display.next_event.side_effect = fake_display.next_event
+    ewmh_instance._getProperty.side_effect = lambda _prop: list(fake_display.client_list)
+    ewmh_instance._createWindow.side_effect = fake_display.windows.get
+    mocker.patch.object(GLib, "io_add_watch")
+    mocker.patch.object(ewmh.WindowTracker, "_instance", None)
+    return fake_display
+
+
+def _property_notify(atom: int) -> SimpleNamespace:
+    from Xlib import X
+
+    return SimpleNamespace(type=X.PropertyNotify, atom=atom)
+
+
+class TestWindowTracker:
+    def test_maps_the_app_ids_to_the_topmost_window(self, display: FakeDisplay) -> None:
+        from ulauncher.utils.ewmh import WindowTracker
+
+        display.add_window(10, ("Navigator", "Firefox"))
+        topmost = display.add_window(11, ("Navigator", "Firefox"))
+        display.client_list = [10, 11]
+        tracker = WindowTracker.get()
+        assert tracker.windows == {"navigator": topmost, "firefox": topmost}
+
+    def test_updates_on_client_list_changes(self, display: FakeDisplay) -> None:
+        from ulauncher.utils.ewmh import WindowTracker
+
+        tracker = WindowTracker.get()
+        assert tracker.windows == {}
+        win = display.add_window(10, ("gedit", "Gedit"))
+        display.client_list = [10]
+        display.queue = [_property_notify(atom=99)]
+        tracker._on_events(0, GLib.IOCondition.IN)
+        assert tracker.windows == {}, "other properties don't update the windows"
+
+        display.queue = [_property_notify(CLIENT_LIST_STACKING)]
+        assert tracker._on_events(0, GLib.IOCondition.IN)
+        assert tracker.windows == {"gedit": win}
+
+    def test_forgets_closed_windows_and_only_reads_the_class_of_new_ones(self, display: FakeDisplay) -> None:
+        from ulauncher.utils.ewmh import WindowTracker
+
+        gedit = display.add_window(10, ("gedit", "Gedit"))
+        display.add_window(11, ("Navigator", "Firefox"))
+        display.client_list = [10, 11]
+        tracker = WindowTracker.get()
+
+        display.client_list = [10]
+        display.queue = [_property_notify(CLIENT_LIST_STACKING)]
+        tracker._on_events(0, GLib.IOCondition.IN)
+        assert tracker.windows == {"gedit": gedit}
+        assert tracker._window_ids == {10: ("gedit", "gedit")}
+        gedit.get_wm_class.assert_called_once_with()
+
+    def test_raises_the_window(self, display: FakeDisplay) -> None:
+        from ulauncher.utils.ewmh import WindowTracker
+
+        win = display.add_window(10, ("gedit", "Gedit"))
+        display.client_list = [10]
+        tracker = WindowTracker.get()
+        assert tracker.raise_window("gedit")
+        tracker.ewmh.setActiveWindow.assert_called_once_with(win)
+        assert not tracker.raise_window("firefox")
+
+    @pytest.mark.usefixtures("display")
+    def test_reconnects_after_the_connection_is_lost(self) -> None:
+        from ulauncher.utils.ewmh import WindowTracker
+
+        tracker = WindowTracker.get()
+        assert not tracker._on_events(0, GLib.IOCondition.HUP)
+        assert WindowTracker.get() is not tracker
+
+
+class TestTryRaiseApp:
+    def test_falls_back_without_python_xlib(self, mocker: MockerFixture) -> None:
+        mocker.patch.object(try_raise_app_module, "IS_X11", True)
+        mocker.patch.dict(sys.modules, {"ulauncher.utils.ewmh": None})
+        assert not try_raise_app("gedit")
+
+    def test_falls_back_without_an_x11_display(self, mocker: MockerFixture) -> None:
+        xlib_error = pytest.importorskip("Xlib.error")
+        from ulauncher.utils.ewmh import WindowTracker
+
+        mocker.patch.object(try_raise_app_module, "IS_X11", True)
+        mocker.patch.object(WindowTracker, "get", side_effect=xlib_error.DisplayNameError(":1"))
+        assert not try_raise_app("gedit")
@@ -1,4 +1,16 @@
-from ulauncher.utils.fuzzy_search import _normalize, get_matching_blocks, get_score
+import pytest
+
+from ulauncher.utils.fuzzy_search import (
+    NormalizedText,
+    _get_lcs_lengths_native,
+    _get_lcs_lengths_numpy,
+    _normalize,
+    get_matching_blocks,
+    get_score,
+    get_scored_blocks,
+    get_top_scored,
+    score_many,
+)
 
 
 def test_normalize() -> None:
@@ -8,8 +20,38 @@ def test_normalize() -> None:
     assert _normalize("Füße") == "fusse"
 
 
+@pytest.mark.parametrize(
+    "text",
+    ["Virransäästö", "Éditeur d’image GIMP", "Ögbelgilengen Uyğulamalar", "Füße", "Firefox", ""],  # noqa: RUF001
+)
+def test_normalized_text(text: str) -> None:
+    normalized_text = NormalizedText(text)
+    assert normalized_text.normalized == _normalize(text)
+    assert len(normalized_text.offsets) == len(normalized_text.normalized)
+
+
+def test_normalized_text_offsets() -> None:
+    assert list(NormalizedText("Füße x").offsets) == [0, 1, 2, 2, 3, 4, 5]
+    assert list(NormalizedText("d’i").offsets) == [0, 2]  # noqa: RUF001
+
+
 def test_get_matching_indexes() -> None:
     assert get_matching_blocks("thfima", "Thunar File Manager") == ([(0, "Th"), (7, "Fi"), (12, "Ma")], 6)
+    # the blocks are mapped back to the original text, where "ß" is a single character
+    assert get_matching_blocks("fusse x", "Füße x") == ([(0, "Füße x")], 7)
+    assert get_matching_blocks("x", "Füße x") == ([(5, "x")], 1)
+
+
+def test_get_score_with_normalized_text() -> None:
+    for text in ["Contacts", "LibreOffice Calc", "Füße", ""]:
+        assert get_score("calc", NormalizedText(text)) == get_score("calc", text)
+
+
+def test_get_scored_blocks() -> None:
+    text = "Thunar File Manager"
+    blocks = [(0, "Th"), (7, "Fi"), (12, "Ma")]
+    assert get_scored_blocks("thfima", NormalizedText(text)) == (get_score("thfima", text), blocks)
+    assert get_scored_blocks("", NormalizedText(text)) == (0.0, [])
 
 
 def test_get_score() -> None:
@@ -17,3 +59,52 @@ def test_get_score() -> None:
     assert get_score("pla", "Pycharm") < get_score("pla", "Google Play Music")
     assert get_score("", "LibreOffice Calc") == 0
     assert get_score("0", "LibreOffice Calc") == 0
+
+
+def test_get_top_scored() -> None:
+    names = ["Contacts", "LibreOffice Calc", "Calculator", "calc", "Calc"]
+    calls: list[str] = []
+
+    def score(name: str) -> float:
+        calls.append(name)
+        return get_score("calc", name)
+
+    assert get_top_scored(names, score, 2, 50) == ["calc", "Calc"]  # ties keep their original order
+    assert calls == names  # each item is scored exactly once
+    assert get_top_scored(names, score, 10, 50) == ["calc", "Calc", "Calculator", "LibreOffice Calc"]
+    assert get_top_scored(names, score, 10, 1000) == []
+
+
+TEXTS = [
+    "Thunar File Manager",
+    "LibreOffice Calc",
+    "Contacts",
+    "Google Play Music",
+    "Pycharm",
+    "Virransäästö",
+    "Füße",
+    "",
+    "calc",
+    "a very long description of an application that does nothing in particular " * 3,
+] * 10
+
+
+@pytest.mark.parametrize("query", ["thfima", "calc", "pla", "fusse", "virr", "ä", "x", "app nothing", "c" * 70])
+def test_score_many_matches_get_score(query: str) -> None:
+    expected = [get_score(query, text) for text in TEXTS]
+    assert score_many(query, TEXTS) == expected
+    for score, bounded_score in zip(expected, score_many(query, TEXTS, 50)):
+        assert bounded_score == score if score > 50 else bounded_score in (score, 0.0)
+    assert score_many("", TEXTS) == [0.0] * len(TEXTS)
+    assert score_many(query, []) == []
+
+
+@pytest.mark.parametrize("query", ["thfima", "calc", "aaa", "nothing in", "c" * 64])
+def test_lcs_lengths_numpy_matches_native(query: str) -> None:
+    pytest.importorskip("numpy")
+    texts = [_normalize(text) for text in TEXTS]
+    assert _get_lcs_lengths_numpy(query, texts) == _get_lcs_lengths_native(query, texts)
+
+
+def test_lcs_lengths_native() -> None:
+    assert _get_lcs_lengths_native("thfima", ["thunar file manager", "", "amifht", "thfima"]) == [6, 0, 1, 6]
@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+from typing import Any, Callable
+from unittest.mock import MagicMock, call
+
+import pytest
+from pytest_mock import MockerFixture
+
+from ulauncher.gi import GLib
+from ulauncher.utils import systemd_controller
+from ulauncher.utils.systemd_controller import SystemdController, SystemdUnitStatus
+
+UNIT_PATH = "/org/freedesktop/systemd1/unit/ulauncher_2eservice"
+
+
+class FakeBus:
+    """Session bus answering the systemd calls from `properties`, with the replies delivered on `flush()`"""
+
+    def __init__(self, properties: dict[str, Any]) -> None:
+        self.properties = properties
+        self.methods: list[str] = []
+        self.signal_callbacks: dict[str | None, Callable[..., None]] = {}
+        self._pending: list[tuple[Callable[..., None], str]] = []
+
+    def call(self, *args: Any) -> None:
+        method_name = args[3]
+        self.methods.append(method_name)
+        self._pending.append((args[9], method_name))
+
+    def call_finish(self, method_name: str) -> GLib.Variant:
+        if method_name == "LoadUnit":
+            return GLib.Variant("(o)", (UNIT_PATH,))
+        if method_name == "GetAll":
+            return GLib.Variant("(a{sv})", ({k: _variant(v) for k, v in self.properties.items()},))
+        return GLib.Variant("()", ())
+
+    def signal_subscribe(self, *args: Any) -> None:
+        self.signal_callbacks[args[2]] = args[6]
+
+    def flush(self) -> None:
+        while self._pending:
+            callback, method_name = self._pending.pop(0)
+            callback(self, method_name, method_name)
+
+    def emit(self, member: str | None, signal_name: str, parameters: GLib.Variant) -> None:
+        self.signal_callbacks[member](self, "", "", "", signal_name, parameters)
+
+
+def _variant(value: Any) -> GLib.Variant:
+    return GLib.Variant("b", value) if isinstance(value, bool) else GLib.Variant("s", value)
+
+
+class TestSystemdController:
+    @pytest.fixture(autouse=True)
+    def watchers(self, mocker: MockerFixture) -> dict[str, Any]:
+        mocker.patch.object(systemd_controller, "which", return_value="/usr/bin/systemctl")
+        return mocker.patch.dict(systemd_controller._watchers, clear=True)
+
+    @pytest.fixture
+    def systemctl_run(self, mocker: MockerFixture) -> MagicMock:
+        return mocker.patch.object(
+            systemd_controller, "systemctl_run", return_value="CanStart=yes\nActiveState=inactive"
+        )
+
+    @pytest.fixture
+    def bus(self, mocker: MockerFixture) -> FakeBus:
+        bus = FakeBus({"ActiveState": "active", "CanStart": True, "UnitFileState": "enabled"})
+        gio = mocker.patch.object(systemd_controller.Gio, "bus_get")
+        gio.side_effect = lambda _bus_type, _cancellable, callback: callback(None, None)
+        mocker.patch.object(systemd_controller.Gio, "bus_get_finish", return_value=bus)
+        return bus
+
+    def test_status_from_properties(self) -> None:
+        status = SystemdUnitStatus.from_properties({"ActiveState": "active", "CanStart": False})
+        assert status.is_active
+        assert not status.can_start
+
+    def test_cached_status_is_read_once_and_kept_current(self, bus: FakeBus, systemctl_run: MagicMock) -> None:
+        controller = SystemdController("ulauncher")
+        controller.watch()
+        # falls back to systemctl until D-Bus replies
+        assert not controller.cached_status().is_active
+        bus.flush()
+        assert bus.methods == ["Subscribe", "LoadUnit", "GetAll"]
+        assert controller.cached_status().is_active
+        assert controller.cached_status().is_enabled
+
+        changed = GLib.Variant("(sa{sv}as)", ("org.freedesktop.systemd1.Unit", {"ActiveState": _variant("failed")}, []))
+        bus.emit("PropertiesChanged", "PropertiesChanged", changed)
+        assert not SystemdController("ulauncher").cached_status().is_active
+        assert controller.cached_status().is_enabled
+
+        bus.properties["UnitFileState"] = "disabled"
+        bus.emit(None, "UnitFilesChanged", GLib.Variant("()", ()))
+        bus.flush()
+        assert not controller.cached_status().is_enabled
+        systemctl_run.assert_called_once()
+
+    @pytest.mark.usefixtures("systemctl_run")
+    def test_reloads_the_daemon_when_needed(self, bus: FakeBus) -> None:
+        bus.properties["NeedDaemonReload"] = True
+        SystemdController("ulauncher").watch()
+        bus.flush()
+        assert bus.methods == ["Subscribe", "LoadUnit", "GetAll", "Reload", "GetAll"]
+
+    def test_toggle_reloads_the_daemon_when_the_cached_status_is_outdated(self, systemctl_run: MagicMock) -> None:
+        unit_file = {"CanStart": "no", "NeedDaemonReload": "no"}
+
+        def run(*args: str) -> str:
+            if args == ("daemon-reload",):
+                unit_file.update(CanStart="yes", NeedDaemonReload="no")
+            if args == ("show", "--property=NeedDaemonReload", "ulauncher"):
+                return f"NeedDaemonReload={unit_file['NeedDaemonReload']}"
+            if args == ("show", "ulauncher"):
+                return "\n".join(f"{k}={v}" for k, v in unit_file.items())
+            return ""
+
+        systemctl_run.side_effect = run
+        controller = SystemdController("ulauncher")
+        with pytest.raises(OSError, match="Autostart is not allowed"):
+            controller.toggle(True)
+
+        unit_file["NeedDaemonReload"] = "yes"  # the unit file was changed on disk
+        controller.toggle(True)
+        assert call("daemon-reload") in systemctl_run.call_args_list
+        assert systemctl_run.call_args == call("reenable", "ulauncher")
+
+    def test_unwatched_status_is_not_cached(self, systemctl_run: MagicMock) -> None:
+        controller = SystemdController("ulauncher")
+        controller.cached_status()
+        controller.cached_status()
+        assert systemctl_run.call_count == 2
@@ -1,8 +1,8 @@
 from __future__ import annotations
 
-import itertools
 import logging
-from collections import defaultdict
+import time
+from collections import OrderedDict, defaultdict
 from typing import Callable, Iterable
 from weakref import WeakKeyDictionary
 
@@ -12,7 +12,9 @@ from ulauncher.internals.query_history import QueryHistory
 from ulauncher.internals.result import ActionResult, KeywordTrigger, Result
 from ulauncher.internals.result_buffer import ResultBuffer
 from ulauncher.internals.results_update import ResultsUpdate, results_update
-from ulauncher.modes.mode import Mode
+from ulauncher.internals.search_index import SearchIndex
+from ulauncher.internals.trigger_search import TriggerSearch
+from ulauncher.modes.mode import Mode, ResultCachePolicy
 from ulauncher.utils import scheduling
 from ulauncher.utils.eventbus import EventBus
 from ulauncher.utils.lru_cache import lru_cache
@@ -22,6 +24,7 @@ _events = EventBus()
 logger = logging.getLogger(__name__)
 
 PLACEHOLDER_DELAY = 0.3  # delay in sec before Loading... is rendered
+RESULT_CACHE_SIZE = 100  # queries to keep the results of, for the modes that allow it
 
 ResultsCallback = Callable[[ResultsUpdate], None]
 
@@ -44,21 +47,33 @@ def get_modes() -> list[Mode]:
     return [FileBrowserMode(), CalcMode(), ShortcutMode(), ExtensionMode(ext_service), get_app_mode()]
 
 
+class _CachedResults:
+    def __init__(self, results: list[Result], token: object, expires_at: float | None) -> None:
+        self.results = results
+        self.token = token
+        self.expires_at = expires_at
+
+
 class UlauncherCore:
     """Core application logic to handle the query events and delegate them to the modes."""
 
     _mode: Mode | None = None
     _keyword_cache: defaultdict[Mode, dict[str, Result]]
+    _keyword_modes: dict[str, Mode]  # the keywords of all the modes merged, for the query routing
     _trigger_cache: defaultdict[Mode, list[Result]]
     _mode_map: WeakKeyDictionary[Result, Mode]
     query: Query = Query(None, "")
     _placeholder_timer: scheduling.Context | None = None
+    _search: TriggerSearch | None = None
 
     def __init__(self) -> None:
         self._result_buffer = ResultBuffer()
         self._keyword_cache = defaultdict(dict)
+        self._keyword_modes = {}
         self._trigger_cache = defaultdict(list)
+        self._search_index = SearchIndex()
         self._mode_map = WeakKeyDictionary()
+        self._result_cache: OrderedDict[tuple[Mode, str], _CachedResults] = OrderedDict()
 
     @property
     def last_query_result_pick(self) -> str | None:
@@ -101,12 +116,21 @@ class UlauncherCore:
                             current_trigger.__class__.__name__,
                         )
 
+            self._search_index.update(mode, triggers)
+
+        if outdated_modes:
+            self._keyword_modes = {
+                keyword: mode for mode, keywords in self._keyword_cache.items() for keyword in keywords
+            }
+
     def set_query(self, query_str: str, callback: ResultsCallback) -> None:
         """Set the query string and propagate the update to the modes."""
         if not query_str:
             self._mode = None
             self.query = Query(None, "")
             self._result_buffer.reset()
+            self._cancel_search()
+            self._search_index.reset_query_cache()
             self._render_results(self.get_home_results(), callback, append=False)
             return
 
@@ -116,32 +140,78 @@ class UlauncherCore:
         # keyword match
         keyword, argument = query_str.split(" ", 1) if " " in query_str else (query_str, None)
 
-        for mode, keywords in self._keyword_cache.items():
-            if keyword in keywords and argument is not None:
-                self._mode = mode
-                self.query = Query(keyword, argument)
-                break
+        if argument is not None and (keyword_mode := self._keyword_modes.get(keyword)):
+            self._mode = keyword_mode
+            self.query = Query(keyword, argument)
 
-        # non-keyword match
+        # non-keyword match, only running the full check for the modes whose prefilter the query passes
         if not self._mode:
             for mode in get_modes():
-                if mode.matches_query_str(query_str):
+                prefilter = mode.query_prefilter
+                if (not prefilter or prefilter.match(query_str)) and mode.matches_query_str(query_str):
                     self._mode = mode
                     self.query = Query(None, query_str)
                     break
 
         self.handle_change(callback)
 
-    def search_triggers(self, min_score: int = 50, limit: int = 50) -> list[Result]:
+    def search_triggers(self, callback: ResultsCallback, min_score: int = 50, limit: int = 50) -> None:
+        """Search the triggers for the query. The candidates are scored when the main loop is idle."""
         self.load_triggers()
-        # Cast apps to AppResult objects. Default apps to Gio.DesktopAppInfo.get_all()
-        query_str = self.query.argument
-        if not query_str:
-            return []
+        query_str = self.query.argument or ""
+        # The candidate list is a snapshot, so the search is unaffected by later changes to the index
+        candidates = self._search_index.get_candidates(query_str, min_score)
+        # Score the highest weighted triggers (like the most launched apps) first, so they're in the partial
+        # results if the search runs out of time
+        candidates.sort(key=lambda result: -result.get_search_weight())
+        self._search = TriggerSearch(
+            query_str,
+            candidates,
+            lambda results: self._finish_search(results, callback),
+            min_score,
+            limit,
+            budget=Settings.load().search_time_budget / 1000,
+            on_partial=lambda results: self._render_partial_search(results, callback),
+            boosts=self._search_index.get_initials_scores(query_str),
+        )
+
+    def _render_partial_search(self, results: list[Result], callback: ResultsCallback) -> None:
+        if not results:  # keep showing the previous results rather than blanking them
+            return
+        self._result_buffer.enqueue(
+            effects.render_results(results, final=False),
+            lambda results, append: self._render_results(results, callback, append),
+        )
+        # the budget is for the time to paint, so don't wait for the throttle
+        self._result_buffer.flush()
+
+    def _finish_search(self, results: list[Result], callback: ResultsCallback) -> None:
+        self._search = None
+        # If the search result is empty, add the default items for all other modes (only shortcuts currently)
+        if not results and str(self.query):
+            for mode in get_modes():
+                for fallback_result in mode.get_fallback_results(str(self.query)):
+                    results.append(fallback_result)
+                    self._mode_map[fallback_result] = mode
 
-        flattened_ = itertools.chain.from_iterable(self._trigger_cache.values())
-        sorted_ = sorted(flattened_, key=lambda i: i.search_score(query_str), reverse=True)[:limit]
-        return list(filter(lambda searchable: searchable.search_score(query_str) > min_score, sorted_))
+        result_objects = [res if isinstance(res, Result) else Result(**res) for res in results]
+        self._result_buffer.enqueue(
+            effects.render_results(result_objects),
+            lambda results, append: self._render_results(results, callback, append),
+        )
+
+    def finish_search(self) -> None:
+        """
+        Render the results of the pending search right away, so the result to activate is picked from them
+        rather than from the previous query (when Enter is pressed before the search ran).
+        """
+        if self._search:
+            self._search.finish()
+
+    def _cancel_search(self) -> None:
+        if self._search:
+            self._search.cancel()
+            self._search = None
 
     def get_home_results(self) -> Iterable[Result]:
         if limit := Settings.load().max_recent_apps:
@@ -166,12 +236,26 @@ class UlauncherCore:
 
     def handle_change(self, callback: ResultsCallback) -> None:
         self._result_buffer.reset()
+        self._cancel_search()
         self._clear_placeholder_timer()
 
         if self._mode:
             try:
-                self._placeholder_timer = scheduling.timer(PLACEHOLDER_DELAY, lambda: self._show_placeholder(callback))
-                self._mode.handle_query(self.query, self._mode_callback(self._mode, callback))
+                mode_callback = self._mode_callback(self._mode, callback)
+                cached_results = None
+                if policy := self._mode.get_result_cache_policy(self.query):
+                    cache_key = (self._mode, str(self.query))
+                    cached_results = self._get_cached_results(cache_key, policy)
+                    if cached_results is not None:
+                        self._render_results(cached_results, callback, append=False)
+                        if not policy.refresh:
+                            return
+                    mode_callback = self._caching_callback(cache_key, policy, mode_callback)
+                if cached_results is None:
+                    self._placeholder_timer = scheduling.timer(
+                        PLACEHOLDER_DELAY, lambda: self._show_placeholder(callback)
+                    )
+                self._mode.handle_query(self.query, mode_callback)
             except Exception:
                 # Mode handlers can raise any exception - catch broadly to prevent crashes
                 logger.exception("Mode '%s' triggered an error while handling query '%s'", self._mode, self.query)
@@ -179,16 +263,41 @@ class UlauncherCore:
             return
 
         # No mode selected, which means search
-        results = self.search_triggers()
-        # If the search result is empty, add the default items for all other modes (only shortcuts currently)
-        if not results and str(self.query):
-            for mode in get_modes():
-                for fallback_result in mode.get_fallback_results(str(self.query)):
-                    results.append(fallback_result)
-                    self._mode_map[fallback_result] = mode
+        self.search_triggers(callback)
+
+    def _get_cached_results(self, key: tuple[Mode, str], policy: ResultCachePolicy) -> list[Result] | None:
+        cached = self._result_cache.get(key)
+        if not cached:
+            return None
+        if cached.token != policy.token or (cached.expires_at is not None and time.monotonic() > cached.expires_at):
+            del self._result_cache[key]
+            return None
+        self._result_cache.move_to_end(key)
+        return cached.results
+
+    def _caching_callback(
+        self,
+        key: tuple[Mode, str],
+        policy: ResultCachePolicy,
+        mode_callback: Callable[[effects.EffectMessage], None],
+    ) -> Callable[[effects.EffectMessage], None]:
+        """Wrap the mode callback to cache the results rendered for the query, once they're final."""
+        results: list[Result] = []
 
-        result_objects = [res if isinstance(res, Result) else Result(**res) for res in results]
-        self._render_results(result_objects, callback, append=False)
+        def _callback(effect_msg: effects.EffectMessage) -> None:
+            if effect_msg["type"] == effects.EffectType.RENDER_RESULTS:
+                if not effect_msg.get("append"):
+                    results.clear()
+                results.extend(effect_msg["results"])
+                if effect_msg.get("final", True):
+                    expires_at = time.monotonic() + policy.ttl if policy.ttl is not None else None
+                    self._result_cache[key] = _CachedResults(list(results), policy.token, expires_at)
+                    self._result_cache.move_to_end(key)
+                    if len(self._result_cache) > RESULT_CACHE_SIZE:
+                        self._result_cache.popitem(last=False)
+            mode_callback(effect_msg)
+
+        return _callback
 
     def handle_backspace(self, query_str: str) -> bool:
         if self._mode:
@@ -200,8 +309,9 @@ class UlauncherCore:
         return False
 
     def activate_result(self, result: Result, callback: ResultsCallback, alt: bool = False) -> None:
-        # drop any pending buffer so it doesn't interfere with the activation results
+        # drop any pending buffer or search so it doesn't interfere with the activation results
         self._result_buffer.reset()
+        self._cancel_search()
         action_id: str | None = None
 
         if not alt:
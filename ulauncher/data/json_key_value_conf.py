@@ -16,6 +16,7 @@ class JsonKeyValueConf(MutableMapping[str, V], Generic[K, V]):
     """File-backed mapping config for JSON objects with arbitrary string keys."""
 
     _value_type: type[object] | None = None
+    generation = 0  # incremented when the data changes, so derived data can tell it's outdated
 
     def __init_subclass__(cls) -> None:
         super().__init_subclass__()
@@ -78,6 +79,7 @@ class JsonKeyValueConf(MutableMapping[str, V], Generic[K, V]):
     def __setitem__(self, key: str, value: Any) -> None:
         # None is treated as a delete signal rather than stored, matching the pattern used in
         # the preferences UI where setting a key to None removes it from the config.
+        self.generation += 1
         if value is None:
             self._data.pop(key, None)
             return
@@ -85,6 +87,7 @@ class JsonKeyValueConf(MutableMapping[str, V], Generic[K, V]):
 
     def __delitem__(self, key: str) -> None:
         del self._data[key]
+        self.generation += 1
 
     def __iter__(self) -> Iterator[str]:
         return iter(self._data)
@@ -124,6 +124,14 @@ class DesktopAppInfo:
             return DesktopAppInfo(app_info)
         return None
 
+    @staticmethod
+    def new_from_keyfile(key_file: GLib.KeyFile) -> DesktopAppInfo | None:
+        try:
+            app_info = DesktopAppInfo._raw.new_from_keyfile(key_file)
+        except TypeError:  # "constructor returned NULL", for hidden entries or if TryExec is not installed
+            return None
+        return DesktopAppInfo(app_info) if app_info else None
+
     @staticmethod
     def get_all() -> list[DesktopAppInfo]:
         return [DesktopAppInfo(app_info) for app_info in DesktopAppInfo._raw.get_all()]  # type: ignore[arg-type]
@@ -1,9 +1,14 @@
 from __future__ import annotations
 
-from typing import Literal
+from typing import TYPE_CHECKING, Literal
 
 from ulauncher.data import BaseDataClass
 
+MAX_SEARCH_WEIGHT = 1.05  # the highest Result.get_search_weight(), which the search index bounds the scores with
+
+if TYPE_CHECKING:
+    from ulauncher.utils.fuzzy_search import NormalizedText
+
 
 class Result(BaseDataClass):
     """
@@ -24,19 +29,61 @@ class Result(BaseDataClass):
     #: An icon path relative to the extension root. If not set, the default icon of the extension will be used
     icon: str = ""
     actions: dict[str, dict[Literal["name", "icon"], str]] = {}  #: dict of actions with display names and icons
+    # The search caches (the normalized fields, and the query and the name blocks that matched it) are kept
+    # in the instance __dict__ rather than declared as props, so they're not part of the dict data
 
     def get_highlightable_input(self, query_str: str) -> str:
         return query_str
 
+    def get_key(self) -> tuple[str, ...]:
+        """Identifies the result across queries, so the row showing it can be kept when the results update."""
+        return (self.name, self.description)
+
     def get_searchable_fields(self) -> list[tuple[str, float]]:
         return [(self.name, 1.0), (self.description, 0.8)]
 
+    def get_search_weight(self) -> float:
+        """
+        Multiplier for the search score (at most MAX_SEARCH_WEIGHT). Unlike the field weights it's applied
+        when the result is scored, so it can change without re-indexing the triggers.
+        """
+        return 1.0
+
+    def get_normalized_fields(self) -> list[tuple[NormalizedText, float]]:
+        """The searchable fields, normalized the first time they are seen (when the triggers are indexed)."""
+        from ulauncher.utils.fuzzy_search import NormalizedText
+
+        cache: dict[str, NormalizedText] = vars(self).setdefault("_normalized_fields", {})
+        fields = []
+        for field, weight in self.get_searchable_fields():
+            if field:
+                if field not in cache:
+                    cache[field] = NormalizedText(field)
+                fields.append((cache[field], weight))
+        return fields
+
     def search_score(self, query_str: str) -> float:
         if not self.searchable:
             return 0
-        from ulauncher.utils.fuzzy_search import get_score
+        from ulauncher.utils.fuzzy_search import get_scored_blocks
+
+        best_score = 0.0
+        for field, weight in self.get_normalized_fields():
+            score, blocks = get_scored_blocks(query_str, field)
+            if field.text == self.name:
+                # keep the blocks, so highlighting the name doesn't have to match it again
+                vars(self)["_name_blocks"] = (query_str, blocks)
+            best_score = max(best_score, score * weight)
+        return best_score * self.get_search_weight()
+
+    def get_name_blocks(self, query_str: str) -> list[tuple[int, str]]:
+        """The blocks of the name that match the query, as tuples of the index and the matching text."""
+        blocks_query_str, blocks = vars(self).get("_name_blocks", ("", []))
+        if blocks_query_str == query_str:
+            return blocks
+        from ulauncher.utils.fuzzy_search import get_matching_blocks
 
-        return max(get_score(query_str, field) * weight for field, weight in self.get_searchable_fields() if field)
+        return get_matching_blocks(query_str, self.name)[0]
 
 
 class ActionResult(Result):
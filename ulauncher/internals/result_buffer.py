@@ -48,6 +48,11 @@ class ResultBuffer:
         elif not self._timer:
             self._timer = scheduling.timer(RENDER_THROTTLE, self._throttled_paint)
 
+    def flush(self) -> None:
+        """Paint the buffered results now, instead of waiting for the throttle timer."""
+        if self._timer is not None:
+            self._paint()
+
     def _throttled_paint(self) -> None:
         # the throttle timer fired; ignore it if reset() cancelled us in the meantime
         if self._timer is not None:
@@ -0,0 +1,216 @@
+from __future__ import annotations
+
+import re
+from collections import Counter
+from typing import Hashable, Iterable
+
+from ulauncher.internals.result import MAX_SEARCH_WEIGHT, Result
+from ulauncher.utils.fuzzy_search import NormalizedText, _normalize
+
+MIN_ACRONYM_LEN = 2  # a single char is too ambiguous to be read as an acronym
+
+
+def _get_words(text: str) -> list[str]:
+    """Normalized words of the text, also splitting camelCase words ("LibreOffice" -> "libre", "office")."""
+    spaced = re.sub(r"(?<=[a-z])(?=[A-Z])", " ", text)
+    return [word for word in map(_normalize, re.split(r"[\W_]+", spaced)) if word]
+
+
+def _discard(index: dict[str, set[int]], key: str, entry_id: int) -> None:
+    entry_ids = index[key]
+    entry_ids.discard(entry_id)
+    if not entry_ids:
+        del index[key]
+
+
+class _IndexedField:
+    __slots__ = ("char_counts", "entry_id", "weight")
+
+    def __init__(self, entry_id: int, text: NormalizedText, weight: float) -> None:
+        self.entry_id = entry_id
+        self.weight = weight
+        self.char_counts = Counter(text.normalized)
+
+
+class _IndexedEntry:
+    __slots__ = ("field_ids", "fields", "name_weight", "name_words", "result")
+
+    def __init__(self, result: Result, fields: list[tuple[NormalizedText, float]]) -> None:
+        self.result = result
+        self.fields = fields
+        self.field_ids: list[int] = []
+        self.name_words = _get_words(result.name)
+        self.name_weight = 0.0
+
+    def get_acronym_prefixes(self) -> list[str]:
+        acronym = "".join(word[0] for word in self.name_words)
+        return [acronym[:i] for i in range(MIN_ACRONYM_LEN, len(acronym) + 1)]
+
+    def get_word_prefixes(self) -> set[str]:
+        return {word[:i] for word in self.name_words for i in range(1, len(word) + 1)}
+
+    def get_initials_score(self, matched_words: int) -> float:
+        return 100 * self.name_weight * matched_words / len(self.name_words) * self.result.get_search_weight()
+
+
+class SearchIndex:
+    """
+    Character posting index over the searchable fields of the triggers, grouped by the mode that
+    provided them, so a single mode can be re-indexed without touching the others.
+
+    The fuzzy score can never exceed the share of query characters found in a field (times the field
+    weight), so the postings give a cheap upper bound for each trigger, and only the triggers where that
+    bound reaches the minimum score need to be scored for real.
+
+    The overlaps are cached by (normalized) query, so extending the query only walks the postings of the
+    added characters, and backspacing returns to the cached state of the shorter query. Only the chain of
+    prefixes of the last query is kept.
+
+    The names are also indexed by the initials and the prefixes of their words, so acronyms like "vsc"
+    for "Visual Studio Code" and word prefixes like "lib wri" for "LibreOffice Writer" are looked up
+    directly instead of relying on the fuzzy matcher (see get_initials_scores).
+    """
+
+    def __init__(self) -> None:
+        self._next_id = 0
+        self._entries: dict[int, _IndexedEntry] = {}
+        self._fields: dict[int, _IndexedField] = {}
+        self._groups: dict[Hashable, list[int]] = {}  # group -> entry ids
+        self._postings: dict[str, dict[int, int]] = {}  # char -> {field id: occurrences}
+        self._acronyms: dict[str, set[int]] = {}  # acronym prefix -> entry ids
+        self._word_prefixes: dict[str, set[int]] = {}  # word prefix -> entry ids
+        self._overlap_cache: dict[str, dict[int, int]] = {}  # normalized query -> {field id: matched chars}
+        self._initials_cache: tuple[str, dict[int, float]] | None = None  # last query, {entry id: score}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def update(self, group: Hashable, results: Iterable[Result]) -> None:
+        """
+        Replace all the indexed triggers of the group. Results that are already indexed in the group with
+        the same fields are kept as they are, so a mode that reuses its unchanged results only costs the delta.
+        """
+        self.reset_query_cache()
+        # keyed by id because results compare by value
+        indexed_ids = {id(self._entries[entry_id].result): entry_id for entry_id in self._groups.pop(group, [])}
+        entry_ids = self._groups[group] = []
+        for result in results:
+            if not result.searchable:
+                continue
+            fields = result.get_normalized_fields()
+            entry_id = indexed_ids.pop(id(result), None)
+            if entry_id is not None:
+                if self._entries[entry_id].fields == fields:
+                    entry_ids.append(entry_id)
+                    continue
+                self._remove_entry(entry_id)
+            entry_ids.append(self._add_entry(result, fields))
+
+        for entry_id in indexed_ids.values():
+            self._remove_entry(entry_id)
+
+    def remove(self, group: Hashable) -> None:
+        self.reset_query_cache()
+        for entry_id in self._groups.pop(group, []):
+            self._remove_entry(entry_id)
+
+    def get_candidates(self, query_str: str, min_score: float) -> list[Result]:
+        """Indexed triggers that could score at least min_score for the query, in index order."""
+        if not query_str:
+            return []
+        query_len = len(query_str)
+        candidate_ids = set()
+        for field_id, matched in self._get_overlap(_normalize(query_str)).items():
+            field = self._fields[field_id]
+            if 100 * matched / query_len * field.weight * MAX_SEARCH_WEIGHT >= min_score:
+                candidate_ids.add(field.entry_id)
+        for entry_id, score in self._get_initials_scores(query_str).items():
+            if score > min_score:
+                candidate_ids.add(entry_id)
+        return [self._entries[entry_id].result for entry_id in sorted(candidate_ids)]
+
+    def get_initials_scores(self, query_str: str) -> dict[Result, float]:
+        """
+        Scores for the triggers with names matching the query as an acronym, or as prefixes of their words
+        (in order). The score is the share of the name's words that are matched, times the weight of the name.
+        """
+        scores = self._get_initials_scores(query_str)
+        return {self._entries[entry_id].result: score for entry_id, score in scores.items()}
+
+    def reset_query_cache(self) -> None:
+        """Forget the cached overlaps and initials scores, for when a new query is started from scratch."""
+        self._overlap_cache.clear()
+        self._initials_cache = None
+
+    def _get_initials_scores(self, query_str: str) -> dict[int, float]:
+        # computed once per query, for both the candidates and the boosts
+        if self._initials_cache and self._initials_cache[0] == query_str:
+            return self._initials_cache[1]
+        tokens = _get_words(query_str)
+        acronym = "".join(tokens)
+        scores: dict[int, float] = {}
+        for entry_id in self._acronyms.get(acronym, ()):
+            entry = self._entries[entry_id]
+            scores[entry_id] = entry.get_initials_score(len(acronym))
+
+        if len(tokens) > 1:
+            for entry_id in set.intersection(*(self._word_prefixes.get(token, set()) for token in tokens)):
+                entry = self._entries[entry_id]
+                words = iter(entry.name_words)
+                # every token is the prefix of a different word, in the same order (skipping words is fine)
+                if all(any(word.startswith(token) for word in words) for token in tokens):
+                    scores[entry_id] = max(entry.get_initials_score(len(tokens)), scores.get(entry_id, 0))
+        self._initials_cache = (query_str, scores)
+        return scores
+
+    def _get_overlap(self, query_str: str) -> dict[int, int]:
+        """Number of query chars found in each field (counting repeated chars only as often as they occur)."""
+        cached = self._overlap_cache.get(query_str)
+        if cached is None:
+            prefix = max((q for q in self._overlap_cache if query_str.startswith(q)), key=len, default="")
+            cached = dict(self._overlap_cache.get(prefix, {}))
+            query_counts = Counter(prefix)
+            for char in query_str[len(prefix) :]:
+                query_counts[char] += 1
+                # one more match for every field where this char occurs at least as often as in the query
+                for field_id, count in self._postings.get(char, {}).items():
+                    if count >= query_counts[char]:
+                        cached[field_id] = cached.get(field_id, 0) + 1
+
+        self._overlap_cache = {q: o for q, o in self._overlap_cache.items() if query_str.startswith(q)}
+        self._overlap_cache[query_str] = cached
+        return cached
+
+    def _add_entry(self, result: Result, fields: list[tuple[NormalizedText, float]]) -> int:
+        entry_id = self._new_id()
+        entry = self._entries[entry_id] = _IndexedEntry(result, fields)
+        for text, weight in fields:
+            field_id = self._new_id()
+            field = self._fields[field_id] = _IndexedField(entry_id, text, weight)
+            entry.field_ids.append(field_id)
+            for char, count in field.char_counts.items():
+                self._postings.setdefault(char, {})[field_id] = count
+            if text.text == result.name:
+                entry.name_weight = max(entry.name_weight, weight)
+        for acronym in entry.get_acronym_prefixes():
+            self._acronyms.setdefault(acronym, set()).add(entry_id)
+        for prefix in entry.get_word_prefixes():
+            self._word_prefixes.setdefault(prefix, set()).add(entry_id)
+        return entry_id
+
+    def _remove_entry(self, entry_id: int) -> None:
+        entry = self._entries.pop(entry_id)
+        for field_id in entry.field_ids:
+            for char in self._fields.pop(field_id).char_counts:
+                posting = self._postings[char]
+                del posting[field_id]
+                if not posting:
+                    del self._postings[char]
+        for acronym in entry.get_acronym_prefixes():
+            _discard(self._acronyms, acronym, entry_id)
+        for prefix in entry.get_word_prefixes():
+            _discard(self._word_prefixes, prefix, entry_id)
+
+    def _new_id(self) -> int:
+        self._next_id += 1
+        return self._next_id
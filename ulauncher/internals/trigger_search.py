@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import time
+from operator import itemgetter
+from typing import TYPE_CHECKING, Callable
+
+from ulauncher.utils import scheduling
+from ulauncher.utils.fuzzy_search import get_top_scored
+
+if TYPE_CHECKING:
+    from ulauncher.internals.result import Result
+
+SLICE_DURATION = 0.004  # max time in sec to score candidates before yielding to the main loop
+
+
+class TriggerSearch:
+    """
+    Scores the search candidates for a query in short slices that run when the main loop is idle,
+    so a long search doesn't block typing or drawing. A search that is cancelled (because the query
+    changed) never calls on_done.
+
+    If the search is still running when the time budget (in sec) runs out, on_partial is called once
+    with the best results so far. Pass the candidates in priority order to make those count.
+
+    Results in boosts are given that score instead of their search score if it's higher.
+    """
+
+    def __init__(
+        self,
+        query_str: str,
+        candidates: list[Result],
+        on_done: Callable[[list[Result]], None],
+        min_score: float = 50,
+        limit: int = 50,
+        budget: float | None = None,
+        on_partial: Callable[[list[Result]], None] | None = None,
+        boosts: dict[Result, float] | None = None,
+    ) -> None:
+        self._query_str = query_str
+        self._candidates = iter(candidates)
+        self._on_done = on_done
+        self._min_score = min_score
+        self._limit = limit
+        self._deadline = time.perf_counter() + budget if budget is not None and on_partial else None
+        self._on_partial = on_partial
+        self._boosts = boosts or {}
+        self._scored: list[tuple[float, Result]] = []
+        self._context: scheduling.Context | None = scheduling.run_when_idle(self._run_slice)
+
+    def cancel(self) -> None:
+        if self._context:
+            self._context.cancel()
+            self._context = None
+
+    def finish(self) -> None:
+        """Score the remaining candidates right away, for when the results are needed before the main loop is idle."""
+        if not self._context:  # done or cancelled
+            return
+        self.cancel()
+        for result in self._candidates:
+            self._score(result)
+        self._on_done(self.get_results())
+
+    def get_results(self) -> list[Result]:
+        """The best results scored so far, best first."""
+        return [result for _, result in get_top_scored(self._scored, itemgetter(0), self._limit, self._min_score)]
+
+    def _run_slice(self) -> None:
+        deadline = time.perf_counter() + SLICE_DURATION
+        for result in self._candidates:
+            self._score(result)
+            if time.perf_counter() > deadline:
+                self._context = scheduling.run_when_idle(self._run_slice)
+                if self._on_partial and self._deadline is not None and time.perf_counter() > self._deadline:
+                    self._deadline = None
+                    self._on_partial(self.get_results())
+                return
+
+        self._context = None
+        self._on_done(self.get_results())
+
+    def _score(self, result: Result) -> None:
+        score = max(result.search_score(self._query_str), self._boosts.get(result, 0))
+        if score > self._min_score:
+            self._scored.append((score, result))
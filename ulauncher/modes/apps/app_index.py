@@ -0,0 +1,249 @@
+"""
+Persistent index of the installed desktop entries, so the apps don't have to be parsed every time
+the triggers are loaded. Each entry is keyed by the path of its .desktop file and re-parsed only
+when the modification time of the file changes. The index is updated asynchronously: the files to
+parse are read concurrently by GIO, and merged into the index once they're all parsed.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import time
+from os.path import basename
+from typing import Callable, Iterator
+
+from ulauncher import paths
+from ulauncher.data import BaseDataClass, JsonKeyValueConf
+from ulauncher.gi import Gio, GioUnix, GLib
+from ulauncher.modes.apps.launch_app import get_action_exec_lines, get_exec_line
+
+logger = logging.getLogger(__name__)
+
+APP_INDEX_PATH = f"{paths.STATE}/app_index.json"
+ENTRY_VERSION = 2  # entries indexed with another version are parsed again, so new fields are filled in
+
+
+class AppEntry(BaseDataClass):
+    """
+    The fields of a desktop entry that AppMode and AppResult use,
+    and what launch_app needs to launch the app or its actions without reading the desktop file again.
+    """
+
+    version: int = 0
+    mtime: int = 0  # modification time of the .desktop file in ns
+    desktop: str = ""  # the desktop environment show_in was evaluated for
+    app_id: str = ""
+    name: str = ""
+    icon: str = ""
+    description: str = ""
+    keywords: list[str] = []
+    executable: str = ""
+    command_name: str = ""  # name of/path to the app to start (TryExec if specified, else the executable)
+    actions: dict[str, str] = {}  # action name -> display name
+    show_in: bool = False
+    nodisplay: bool = False
+    # launch plan
+    filename: str = ""
+    exec_line: str = ""  # with the field codes resolved
+    action_exec_lines: dict[str, str] = {}  # action name -> exec line with the field codes resolved
+    working_dir: str = ""
+    dbus_activatable: bool = False
+    terminal: bool = False
+    single_main_window: bool = False
+    wm_class: str = ""
+    # for skipped entries: the TryExec or Exec program that isn't installed, so the entry is parsed again once it is
+    missing_program: str = ""
+
+    @classmethod
+    def from_app_info(
+        cls,
+        app_info: GioUnix.DesktopAppInfo,
+        app_id: str | None = None,
+        filename: str | None = None,
+        keyfile: GLib.KeyFile | None = None,
+    ) -> AppEntry:
+        """
+        Pass the filename and keyfile when the app info is made from a keyfile,
+        otherwise they are read from the app info and the desktop file.
+        """
+        executable = app_info.get_executable() or ""
+        action_names = app_info.list_actions()
+        filename = filename or app_info.get_filename() or ""
+        if keyfile is None and action_names and filename:
+            keyfile = _load_keyfile(filename)
+        return cls(
+            version=ENTRY_VERSION,
+            desktop=os.environ.get("XDG_CURRENT_DESKTOP", ""),
+            app_id=app_id or app_info.get_id() or "",
+            name=app_info.get_display_name() or "",
+            icon=app_info.get_string("Icon") or "",
+            description=app_info.get_description() or app_info.get_generic_name() or "",
+            keywords=app_info.get_keywords() or [],
+            executable=executable,
+            # TryExec is what we actually want (name of/path to exec), but it's often not specified
+            # get_executable uses Exec, which is always specified, but it will return the actual executable.
+            # Sometimes the actual executable is not the app to start, but a wrappers like "env" or "sh -c"
+            command_name=basename(app_info.get_string("TryExec") or executable),
+            actions={
+                action_name: display_name
+                for action_name in action_names
+                if (display_name := app_info.get_action_name(action_name))
+            },
+            show_in=app_info.get_show_in(),
+            nodisplay=app_info.get_nodisplay(),
+            filename=filename,
+            exec_line=get_exec_line(app_info, filename) or "",
+            action_exec_lines=get_action_exec_lines(keyfile, filename, action_names) if keyfile else {},
+            working_dir=app_info.get_string("Path") or "",
+            dbus_activatable=app_info.get_boolean("DBusActivatable"),
+            terminal=app_info.get_boolean("Terminal"),
+            single_main_window=app_info.get_boolean("SingleMainWindow"),
+            wm_class=app_info.get_string("StartupWMClass") or "",
+        )
+
+
+def _load_keyfile(path: str, contents: bytes | None = None) -> GLib.KeyFile | None:
+    """The desktop entry, parsed from the contents of the file if they're already read."""
+    keyfile = GLib.KeyFile()
+    try:
+        if contents is None:
+            keyfile.load_from_file(path, GLib.KeyFileFlags.NONE)
+        else:
+            keyfile.load_from_bytes(GLib.Bytes.new(contents), GLib.KeyFileFlags.NONE)
+    except GLib.Error as e:
+        logger.debug("Could not parse desktop entry %s: %s", path, e)
+        return None
+    return keyfile
+
+
+def _get_missing_program(keyfile: GLib.KeyFile) -> str:
+    """The TryExec or Exec program of the desktop entry if it's not installed (which GIO skips the entry for)."""
+    for key in ("TryExec", "Exec"):
+        try:
+            value = keyfile.get_string(GLib.KEY_FILE_DESKTOP_GROUP, key)
+            program = GLib.shell_parse_argv(value)[1][0] if key == "Exec" else value
+        except GLib.Error:
+            continue
+        if program and not GLib.find_program_in_path(program):
+            return program
+    return ""
+
+
+def get_apps_dirs() -> list[str]:
+    """The dirs with desktop entries, in the order of precedence of the XDG data dirs."""
+    return [
+        os.path.join(data_dir, "applications") for data_dir in [GLib.get_user_data_dir(), *GLib.get_system_data_dirs()]
+    ]
+
+
+def _get_desktop_files(sub_dirs: list[str]) -> Iterator[tuple[str, str]]:
+    """
+    The desktop ids and file paths of the installed desktop entries, in the order of precedence.
+    Files in sub dirs get ids like "kde-foo.desktop" for "kde/foo.desktop", as in the spec.
+    The sub dirs that are walked are added to sub_dirs.
+    """
+    for apps_dir in get_apps_dirs():
+        for dir_path, _dir_names, file_names in os.walk(apps_dir, followlinks=True):
+            if dir_path != apps_dir:
+                sub_dirs.append(dir_path)
+            for file_name in sorted(file_names):
+                if file_name.endswith(".desktop"):
+                    path = os.path.join(dir_path, file_name)
+                    yield os.path.relpath(path, apps_dir).replace(os.sep, "-"), path
+
+
+class AppIndex(JsonKeyValueConf[str, AppEntry]):
+    sub_dirs: list[str] = []  # the sub dirs of the apps dirs, as of the last refresh
+
+    def get_entries(self) -> list[AppEntry]:
+        """The indexed desktop entries (excluding entries that are hidden or fail TryExec), as of the last update."""
+        return [entry for entry in self.values() if entry.app_id]
+
+    def refresh(self, on_done: Callable[[bool], None]) -> None:
+        """
+        Parse the new or modified desktop files and drop the removed ones, without blocking the main loop for
+        the whole build: the files are read concurrently in the GIO worker threads, and each is parsed in its own
+        main loop callback. Once they're all parsed, they're merged into the index (which is saved if anything
+        changed), and on_done is called with whether anything did.
+        """
+        start_time = time.perf_counter()
+        files: list[tuple[str, str, int]] = []  # (app id, path, mtime), in the order of precedence
+        seen_ids: set[str] = set()
+        desktop = os.environ.get("XDG_CURRENT_DESKTOP", "")
+        self.sub_dirs = []
+        for app_id, path in _get_desktop_files(self.sub_dirs):
+            # an entry with the same id in a dir with higher precedence overrides this one
+            if app_id in seen_ids:
+                continue
+            seen_ids.add(app_id)
+            try:
+                files.append((app_id, path, os.stat(path).st_mtime_ns))
+            except OSError:
+                continue
+
+        outdated = [
+            (app_id, path, mtime)
+            for app_id, path, mtime in files
+            if not (entry := self.get(path))
+            or entry.mtime != mtime
+            or entry.desktop != desktop
+            or entry.version != ENTRY_VERSION
+            # a cheap PATH lookup, as the program is often installed after its desktop file
+            or (entry.missing_program and GLib.find_program_in_path(entry.missing_program))
+        ]
+        parsed: dict[str, AppEntry] = {}
+
+        def merge() -> None:
+            seen_paths = {path for _app_id, path, _mtime in files}
+            changed = bool(parsed) or any(path not in seen_paths for path in self)
+            if changed:
+                entries = {path: parsed.get(path) or self[path] for _app_id, path, _mtime in files}
+                self.clear()
+                self.update(entries)
+                self.save()
+            logger.debug(
+                "Loaded %i apps in %.0f ms (%i desktop entries parsed)",
+                len(self.get_entries()),
+                (time.perf_counter() - start_time) * 1000,
+                len(parsed),
+            )
+            on_done(changed)
+
+        def on_loaded(file: Gio.File, result: Gio.AsyncResult, outdated_file: tuple[str, str, int]) -> None:
+            app_id, path, mtime = outdated_file
+            try:
+                _success, contents, _etag = file.load_contents_finish(result)
+            except GLib.Error as e:
+                logger.debug("Could not read desktop entry %s: %s", path, e)
+                contents = None
+            parsed[path] = self._parse(app_id, path, mtime, contents)
+            if len(parsed) == len(outdated):
+                merge()
+
+        if not outdated:
+            merge()
+        for outdated_file in outdated:
+            Gio.File.new_for_path(outdated_file[1]).load_contents_async(None, on_loaded, outdated_file)
+
+    @staticmethod
+    def _parse(app_id: str, path: str, mtime: int, contents: bytes | None) -> AppEntry:
+        keyfile = _load_keyfile(path, contents) if contents is not None else None
+        app_info = GioUnix.DesktopAppInfo.new_from_keyfile(keyfile) if keyfile else None
+        if not app_info or app_info.get_boolean("Hidden"):
+            # hidden, or the program is not installed. Kept so the file isn't parsed again until it's modified
+            # (or until the program is installed)
+            logger.debug("Skipping desktop entry %s", path)
+            return AppEntry(
+                version=ENTRY_VERSION,
+                mtime=mtime,
+                desktop=os.environ.get("XDG_CURRENT_DESKTOP", ""),
+                missing_program=_get_missing_program(keyfile) if keyfile and not app_info else "",
+            )
+        entry = AppEntry.from_app_info(app_info, app_id, path, keyfile)
+        entry.mtime = mtime
+        return entry
+
+    @classmethod
+    def load(cls) -> AppIndex:  # type: ignore[override]
+        return super().load(APP_INDEX_PATH)
@@ -4,50 +4,140 @@ import logging
 from typing import Callable, Iterator
 
 from ulauncher import app_id
-from ulauncher.gi import GioUnix
+from ulauncher.gi import Gio, GLib
 from ulauncher.internals import effects
 from ulauncher.internals.query import Query
 from ulauncher.internals.result import Result
+from ulauncher.modes.apps.app_index import AppEntry, AppIndex, get_apps_dirs
 from ulauncher.modes.apps.app_rankings import AppRankings
 from ulauncher.modes.apps.app_result import ACTION_PREFIX, AppResult
-from ulauncher.modes.apps.launch_app import launch_app
 from ulauncher.modes.mode import Mode
+from ulauncher.utils import scheduling
+from ulauncher.utils.eventbus import EventBus
 from ulauncher.utils.settings import Settings
 
 logger = logging.getLogger(__name__)
+events = EventBus()
 
 
 class AppMode(Mode):
+    """
+    The app triggers are only reloaded when the installed apps change (or the settings they depend on),
+    and the results of the apps that didn't change are reused. Launching an app doesn't reload them, since
+    the rankings are applied when the results are scored (see AppResult.get_search_weight).
+    The app index is updated in the background, and the triggers are served from the saved index meanwhile.
+    """
+
+    _outdated = True
+    _loaded_state: tuple[bool, bool] | None = None
+    _catalog_generation = 0  # incremented when the triggers are reloaded
+    _home_results: tuple[tuple[int, int, int], list[AppResult]] | None = None  # (limit and generations, results)
+    _updating_index = False
+    _update_index_again = False  # the apps changed while the index was being updated
+
+    def __init__(self) -> None:
+        self._results: dict[str, tuple[AppEntry, AppResult]] = {}  # app id -> (index entry, result)
+        self._app_info_monitor = Gio.AppInfoMonitor.get()
+        self._app_info_monitor.connect("changed", lambda *_: self._update_index())
+        # AppInfoMonitor only reports changes once GLib has listed the apps itself, so watch the dirs too
+        self._dir_monitors: dict[str, Gio.FileMonitor] = {}
+        self._monitor_dirs(get_apps_dirs())
+        self._update_index()
+
+    def _monitor_dirs(self, dirs: list[str]) -> None:
+        """Monitor the dirs (directory monitors aren't recursive), and stop monitoring the dirs that were removed."""
+        for removed_dir in set(self._dir_monitors) - set(dirs):
+            self._dir_monitors.pop(removed_dir).cancel()
+        for apps_dir in dirs:
+            if apps_dir in self._dir_monitors:
+                continue
+            try:
+                monitor = Gio.File.new_for_path(apps_dir).monitor_directory(Gio.FileMonitorFlags.NONE, None)
+            except GLib.Error:
+                logger.debug("Could not monitor %s for app changes", apps_dir)
+                continue
+            monitor.connect("changed", lambda *_: self._update_index())
+            self._dir_monitors[apps_dir] = monitor
+
+    def _update_index(self) -> None:
+        """Update the app index in the background (one update at a time)."""
+        if self._updating_index:
+            self._update_index_again = True
+            return
+        self._updating_index = True
+        self._update_index_again = False
+        AppIndex.load().refresh(self._on_index_updated)
+
+    def _on_index_updated(self, changed: bool) -> None:
+        self._updating_index = False
+        # the sub dirs are only known once walked, including the ones added since the last update
+        self._monitor_dirs([*get_apps_dirs(), *AppIndex.load().sub_dirs])
+        if changed:
+            self._outdated = True
+            # reload the triggers and search the current query again with them
+            scheduling.run_when_idle(lambda: events.emit("app:reload_query"))
+        if self._update_index_again:
+            self._update_index()
+
+    def _get_state(self) -> tuple[bool, bool]:
+        """The settings the triggers are filtered by."""
+        settings = Settings.load()
+        return settings.enable_application_mode, settings.disable_desktop_filters
+
+    def has_trigger_changes(self) -> bool:
+        return self._outdated or self._loaded_state != self._get_state()
+
     def handle_query(self, _query: Query, callback: Callable[[effects.EffectMessage], None]) -> None:
         # App mode contributes search triggers but does not handle direct query-mode execution.
         callback(effects.render_results([]))
 
     def get_triggers(self) -> Iterator[AppResult]:
         settings = Settings.load()
+        self._outdated = False
+        self._loaded_state = self._get_state()
+        self._catalog_generation += 1
+        results = self._results
+        self._results = {}
 
         if not settings.enable_application_mode:
             return
 
-        apps: list[GioUnix.DesktopAppInfo] = GioUnix.DesktopAppInfo.get_all()
-        for app in apps:
-            executable = app.get_executable()
-            if not executable or not app.get_display_name():
+        for entry in AppIndex.load().get_entries():
+            if not entry.executable or not entry.name:
                 continue
-            if not app.get_show_in() and not settings.disable_desktop_filters:
+            if not entry.show_in and not settings.disable_desktop_filters:
                 continue
             # Make an exception for gnome-control-center, because all the very useful specific settings
             # like "Keyboard", "Wi-Fi", "Sound" etc have NoDisplay=true
-            if app.get_nodisplay() and executable != "gnome-control-center":
+            if entry.nodisplay and entry.executable != "gnome-control-center":
                 continue
             # Don't show Ulauncher app in own list
-            if app.get_id() == f"{app_id}.desktop":
+            if entry.app_id == f"{app_id}.desktop":
                 continue
 
-            yield AppResult(app)
+            # the index keeps the same entry object until the desktop file is modified
+            cached = results.get(entry.app_id)
+            result = cached[1] if cached and cached[0] is entry else AppResult(entry)
+            self._results[entry.app_id] = (entry, result)
+            yield result
 
     def get_home_results(self, limit: int) -> list[AppResult]:
         """Get the top {N} apps (by recency-weighted score) to show when the query is empty"""
-        return list(filter(None, map(AppResult.from_id, AppRankings.load().get_app_ids())))[:limit]
+        rankings = AppRankings.load()
+        key = (limit, rankings.generation, self._catalog_generation)
+        if self._home_results and self._home_results[0] == key:
+            return self._home_results[1]
+
+        home_results: list[AppResult] = []
+        for ranked_app_id in rankings.get_app_ids():
+            if len(home_results) >= limit:
+                break
+            # apps that are not among the triggers (like when app mode is off) are loaded from their desktop file
+            cached = self._results.get(ranked_app_id)
+            if result := cached[1] if cached else AppResult.from_id(ranked_app_id):
+                home_results.append(result)
+        self._home_results = (key, home_results)
+        return home_results
 
     def activate_result(
         self,
@@ -63,9 +153,9 @@ class AppMode(Mode):
                 return
             AppRankings.load().bump(result.app_id)
             if action_id == "launch":
-                if not launch_app(result.app_id):
+                if not result.launch():
                     logger.error("Could not launch app %s", result.app_id)
-            elif not launch_app(result.app_id, action_name=action_id[len(ACTION_PREFIX) :]):
+            elif not result.launch(action_name=action_id[len(ACTION_PREFIX) :]):
                 logger.error("Could not run action %s of app %s", action_id, result.app_id)
             callback(effects.close_window())
             return
@@ -5,14 +5,21 @@ surface above apps that were once popular but are no longer being opened.
 
 from __future__ import annotations
 
+from typing import Any
+
 from ulauncher import paths
 from ulauncher.data import JsonKeyValueConf
+from ulauncher.utils import scheduling
 
 APP_RANKINGS_PATH = f"{paths.STATE}/app_rankings.json"
 # Controls decay aggressiveness. The new app needs N*(2^(1/(DECAY_RATE+1))-1) launches
 # to overtake an old app with N total history - about 19% of history at DECAY_RATE=3.
 # Higher values make old habits fade faster; lower values make rankings more stable.
 DECAY_RATE = 3
+SAVE_DELAY = 2  # seconds to wait for more launches before saving
+# The scores are stored relative to a global scale. When the scale gets this small, it's folded
+# back into the scores, long before the float precision runs out.
+MIN_SCALE = 1e-100
 
 
 class AppRankings(JsonKeyValueConf[str, float]):
@@ -28,26 +35,87 @@ class AppRankings(JsonKeyValueConf[str, float]):
     it only needs to be opened consistently while the old one goes unused.
     The total launch count is recovered from the sum of all scores, so no
     separate counter is needed.
+
+    Reducing every other app's score is done by scaling them all at once: the
+    scores are kept relative to a global scale, so a launch only updates the
+    scale and the score of the launched app. The file has the actual scores.
     """
 
     _ranking_cache: list[str] | None = None
+    _weight_cache: dict[str, float] | None = None
+    _save_timer: scheduling.Context | None = None
+    generation = 0  # incremented when the rankings change, so derived data can tell it's outdated
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        self._scale = 1.0
+        self._relative_sum = 0.0  # sum of the relative scores, so the total doesn't have to be summed up
+        super().__init__(*args, **kwargs)
+
+    def __getitem__(self, key: str) -> float:
+        return self._data[key] * self._scale
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        self._relative_sum -= self._data.get(key, 0.0)
+        super().__setitem__(key, None if value is None else float(value) / self._scale)
+        self._relative_sum += self._data.get(key, 0.0)
+
+    def __delitem__(self, key: str) -> None:
+        self._relative_sum -= self._data[key]
+        super().__delitem__(key)
 
     def _total_launches(self) -> int:
-        return max(0, round((DECAY_RATE + 1) * sum(self.values()) - DECAY_RATE))
+        return max(0, round((DECAY_RATE + 1) * self._relative_sum * self._scale - DECAY_RATE))
+
+    def _normalize(self) -> None:
+        """Fold the scale into the scores (which also clears any float drift of the sum)."""
+        self._data = {key: score * self._scale for key, score in self._data.items()}
+        self._scale = 1.0
+        self._relative_sum = sum(self._data.values())
 
     def get_app_ids(self) -> list[str]:
         if self._ranking_cache is None:
             self._ranking_cache = sorted(self, key=self.__getitem__, reverse=True)
         return self._ranking_cache
 
+    def get_frequency_weights(self) -> dict[str, float]:
+        """Search weight per ranked app, from 1.05 for the top app down towards 0.95 for the last one"""
+        if self._weight_cache is None:
+            app_ids = self.get_app_ids()
+            count = len(app_ids)
+            self._weight_cache = {app_id: 1.0 - (index / count * 0.1) + 0.05 for index, app_id in enumerate(app_ids)}
+        return self._weight_cache
+
+    def get_frequency_weight(self, app_id: str) -> float:
+        weights = self.get_frequency_weights()
+        if app_id in weights:
+            return weights[app_id]
+        # unranked apps weigh the same as one ranked after the last one, or neutral if nothing is ranked
+        return 0.95 if weights else 1.0
+
     def bump(self, app_id: str) -> None:
         n = self._total_launches()
         decay = n / (n + DECAY_RATE)
-        for k in list(self):
-            self[k] *= decay
+        if decay:
+            self._scale *= decay
+            if self._scale < MIN_SCALE:
+                self._normalize()
+        else:
+            self._data = dict.fromkeys(self._data, 0.0)
+            self._normalize()
         self[app_id] = self.get(app_id, 0) + 1.0
         self._ranking_cache = None
-        self.save()
+        self._weight_cache = None
+        self.generation += 1
+        # coalesce the saves of launches in quick succession, and keep the write off the launch
+        if not self._save_timer:
+            self._save_timer = scheduling.timer(SAVE_DELAY, self.flush)
+
+    def flush(self) -> None:
+        """Save now if there's a save pending."""
+        if self._save_timer:
+            self._save_timer.cancel()
+            self._save_timer = None
+            self.save()
 
     @classmethod
     def load(cls) -> AppRankings:  # type: ignore[override]
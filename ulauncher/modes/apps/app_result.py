@@ -2,12 +2,13 @@ from __future__ import annotations
 
 import contextlib
 import logging
-from os.path import basename
 from typing import Literal
 
 from ulauncher.gi import GioUnix
 from ulauncher.internals.result import Result
+from ulauncher.modes.apps.app_index import AppEntry
 from ulauncher.modes.apps.app_rankings import AppRankings
+from ulauncher.modes.apps.launch_app import launch_app
 
 logger = logging.getLogger(__name__)
 
@@ -20,23 +21,17 @@ class AppResult(Result):
     keywords: list[str] = []
     _executable: str = ""
 
-    def __init__(self, app_info: GioUnix.DesktopAppInfo) -> None:
+    def __init__(self, app_info: GioUnix.DesktopAppInfo | AppEntry) -> None:
+        entry = app_info if isinstance(app_info, AppEntry) else AppEntry.from_app_info(app_info)
         actions: dict[str, dict[Literal["name", "icon"], str]] = {"launch": {"name": "Launch application"}}
-        for action_name in app_info.list_actions():
-            if display_name := app_info.get_action_name(action_name):
-                actions[f"{ACTION_PREFIX}{action_name}"] = {"name": display_name}
-        super().__init__(
-            name=app_info.get_display_name(),
-            icon=app_info.get_string("Icon") or "",
-            description=app_info.get_description() or app_info.get_generic_name() or "",
-            actions=actions,
-        )
-        self.keywords = app_info.get_keywords() or []
-        self.app_id = app_info.get_id() or ""
-        # TryExec is what we actually want (name of/path to exec), but it's often not specified
-        # get_executable uses Exec, which is always specified, but it will return the actual executable.
-        # Sometimes the actual executable is not the app to start, but a wrappers like "env" or "sh -c"
-        self._executable = basename(app_info.get_string("TryExec") or app_info.get_executable() or "")
+        for action_name, display_name in entry.actions.items():
+            actions[f"{ACTION_PREFIX}{action_name}"] = {"name": display_name}
+        super().__init__(name=entry.name, icon=entry.icon, description=entry.description, actions=actions)
+        self.keywords = list(entry.keywords)
+        self.app_id = entry.app_id
+        self._executable = entry.command_name
+        # the launch plan is kept in the instance __dict__, so it's not part of the dict data (see Result)
+        vars(self)["_entry"] = entry
 
     @staticmethod
     def from_id(app_id: str) -> AppResult | None:
@@ -46,16 +41,21 @@ class AppResult(Result):
                 return AppResult(app_info)
         return None
 
-    def get_searchable_fields(self) -> list[tuple[str, float]]:
-        frequency_weight = 1.0
-        sorted_app_ids = AppRankings.load().get_app_ids()
-        if count := len(sorted_app_ids):
-            index = sorted_app_ids.index(self.app_id) if self.app_id in sorted_app_ids else count
-            frequency_weight = 1.0 - (index / count * 0.1) + 0.05
+    def get_key(self) -> tuple[str, ...]:
+        return ("app", self.app_id)
+
+    def launch(self, action_name: str | None = None) -> bool:
+        """Launch the app, or one of its actions."""
+        entry: AppEntry = vars(self)["_entry"]
+        return launch_app(entry, action_name)
 
+    def get_searchable_fields(self) -> list[tuple[str, float]]:
         return [
-            (self.name, 1 * frequency_weight),
-            (self._executable, 0.8 * frequency_weight),  # command names, such as "baobab" or "nautilus"
-            (self.description, 0.7 * frequency_weight),
-            *[(k, 0.6 * frequency_weight) for k in self.keywords],
+            (self.name, 1),
+            (self._executable, 0.8),  # command names, such as "baobab" or "nautilus"
+            (self.description, 0.7),
+            *[(k, 0.6) for k in self.keywords],
         ]
+
+    def get_search_weight(self) -> float:
+        return AppRankings.load().get_frequency_weight(self.app_id)
@@ -1,70 +1,71 @@
 from __future__ import annotations
 
+import contextlib
 import logging
 import os
 import re
 import shlex
 from pathlib import Path
+from typing import TYPE_CHECKING
 
 from ulauncher.gi import Gio, GioUnix, GLib
 from ulauncher.modes.apps.try_raise_app import try_raise_app
 from ulauncher.utils.launch_detached import launch_detached
 from ulauncher.utils.settings import Settings
 
-logger = logging.getLogger(__name__)
-
+if TYPE_CHECKING:
+    from ulauncher.modes.apps.app_index import AppEntry
 
-def _get_action_exec(action_name: str, desktop_entry_path: str | None) -> str | None:
-    if not desktop_entry_path:
-        return None
-    keyfile = GLib.KeyFile()
-    try:
-        keyfile.load_from_file(desktop_entry_path, GLib.KeyFileFlags.NONE)
-        return keyfile.get_string(f"Desktop Action {action_name}", "Exec")
-    except GLib.Error:
-        return None
+logger = logging.getLogger(__name__)
 
 
-def _get_exec(app: GioUnix.DesktopAppInfo, action_name: str | None = None) -> str | None:
-    """Return the launch command for the app, or one of its actions, with field codes resolved."""
-    desktop_entry_path = app.get_filename()
-    exec_line = _get_action_exec(action_name, desktop_entry_path) if action_name else app.get_commandline()
-    if not exec_line:
-        return None
+def _resolve_field_codes(exec_line: str, desktop_entry_path: str | None) -> str:
     if desktop_entry_path:
         exec_line = exec_line.replace("%k", desktop_entry_path)
     # strip field codes %f, %F, %u, %U, etc
     return re.sub(r"\%[uUfFdDnNickvm]", "", exec_line).strip()
 
 
-def _load_app(desktop_entry_name: str) -> GioUnix.DesktopAppInfo | None:
-    app = GioUnix.DesktopAppInfo.new(desktop_entry_name)
-    if not app:
-        logger.error("Could not load app %s", desktop_entry_name)
-    return app
+def get_exec_line(app: GioUnix.DesktopAppInfo, desktop_entry_path: str | None) -> str | None:
+    """Return the launch command for the app, with field codes resolved."""
+    exec_line = app.get_commandline()
+    return _resolve_field_codes(exec_line, desktop_entry_path) if exec_line else None
 
 
-def launch_app(desktop_entry_name: str, action_name: str | None = None) -> bool:
-    app_id = Path(desktop_entry_name).stem if desktop_entry_name.endswith(".desktop") else desktop_entry_name
-    settings = Settings.load()
-    app = _load_app(desktop_entry_name)
-    if not app:
-        return False
+def get_action_exec_lines(
+    keyfile: GLib.KeyFile, desktop_entry_path: str | None, action_names: list[str]
+) -> dict[str, str]:
+    """Return the launch commands for the actions of the app, with field codes resolved."""
+    exec_lines = {}
+    for action_name in action_names:
+        with contextlib.suppress(GLib.Error):
+            if exec_line := keyfile.get_string(f"Desktop Action {action_name}", "Exec"):
+                exec_lines[action_name] = _resolve_field_codes(exec_line, desktop_entry_path)
+    return exec_lines
+
 
-    is_dbus = app.get_boolean("DBusActivatable")
-    is_terminal = app.get_boolean("Terminal")
+def launch_app(app: AppEntry, action_name: str | None = None) -> bool:
+    """Launch the app or one of its actions, from the launch plan in its index entry."""
+    app_id = Path(app.app_id).stem if app.app_id.endswith(".desktop") else app.app_id
+    settings = Settings.load()
+    is_dbus = app.dbus_activatable
+    is_terminal = app.terminal
     use_custom_terminal = is_terminal and bool(settings.terminal_command)
-    app_exec = _get_exec(app, action_name)
+    app_exec = app.action_exec_lines.get(action_name) if action_name else app.exec_line
 
     if action_name is not None and (is_dbus or not app_exec or (is_terminal and not use_custom_terminal)):
         # for actions where we have no command to spawn, let Gio invoke the action
+        app_info = GioUnix.DesktopAppInfo.new_from_filename(app.filename) if app.filename else None
+        if not app_info:
+            logger.error("Could not load app %s", app.app_id)
+            return False
         launch_context = Gio.AppLaunchContext()
         if os.environ.get("GDK_BACKEND") != "wayland":
             launch_context.unsetenv("GDK_BACKEND")
-        app.launch_action(action_name, launch_context)
+        app_info.launch_action(action_name, launch_context)
         return True
-    if action_name is None and (settings.raise_if_started or app.get_boolean("SingleMainWindow")):
-        app_wm_id = (app.get_string("StartupWMClass") or (Path(app_exec).name if app_exec else app_id)).lower()
+    if action_name is None and (settings.raise_if_started or app.single_main_window):
+        app_wm_id = (app.wm_class or (Path(app_exec).name if app_exec else app_id)).lower()
         if try_raise_app(app_wm_id):
             return True
 
@@ -88,5 +89,5 @@ def launch_app(desktop_entry_name: str, action_name: str | None = None) -> bool:
         return False
 
     logger.info("Run %s (%s) Exec %s", f"action {action_name}" if action_name else "application", app_id, cmd)
-    launch_detached(cmd, app.get_string("Path"))
+    launch_detached(cmd, app.working_dir or None)
     return True
@@ -13,7 +13,7 @@ from ulauncher.internals import effects
 from ulauncher.internals.query import Query
 from ulauncher.internals.result import Result
 from ulauncher.modes.calc.calc_result import CalcCompletionResult, CalcErrorResult, CalcResult
-from ulauncher.modes.mode import Mode
+from ulauncher.modes.mode import Mode, ResultCachePolicy
 from ulauncher.utils.eventbus import EventBus
 from ulauncher.utils.lru_cache import lru_cache
 
@@ -90,6 +90,8 @@ _trailing_operator_re = re.compile(r"\s*[.+\-*/%]\*?\s*$")
 _incomplete_call_re = re.compile(rf"\s*[.+\-*/%]?\*?\s*(?:(?<![\w.])(?:{'|'.join(functions)}))?\(\s*$")
 # A name is only completable where an operand can start, so it must follow an operator or a bracket
 _partial_name_re = re.compile(r"^(?P<head>.*[-+*/%^(]\s*)(?P<partial>[a-zA-Z_]\w*)$")
+# Math can only start with a number, a bracket, a unary operator, or a known function or constant
+_math_start_re = re.compile(rf"\s*(?:[\d.,(+\-~]|(?:{'|'.join((*functions, *constants))})\b)")
 
 
 # Show a friendlier output for incomplete queries, instead of "Invalid"
@@ -247,9 +249,15 @@ def _evaluate(query_str: str) -> Result:
 
 
 class CalcMode(Mode):
+    query_prefilter = _math_start_re
+
     def matches_query_str(self, query_str: str) -> bool:
         return bool(get_completions(query_str)) or _is_enabled(normalize_expr(query_str))
 
+    def get_result_cache_policy(self, _query: Query) -> ResultCachePolicy:
+        # the result of an expression never changes
+        return ResultCachePolicy()
+
     def handle_query(self, query: Query, callback: Callable[[effects.EffectMessage], None]) -> None:
         query_str = query.argument or ""
         completions = get_completions(query_str)
@@ -65,6 +65,7 @@ class ExtensionManifest(JsonConf):
     icon: str = ""
     instructions: str = ""
     input_debounce: float = 0.05
+    result_cache_ttl: float | None = None  # seconds to cache the results of a query for, to show them when re-entered
     urls: ExtensionManifestUrls = ExtensionManifestUrls()
     triggers: dict[str, ExtensionManifestTrigger] = {}
     preferences: dict[str, ExtensionManifestPreference] = {}
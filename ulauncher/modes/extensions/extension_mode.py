@@ -3,6 +3,7 @@ from __future__ import annotations
 import html
 import logging
 from typing import TYPE_CHECKING, Callable, Iterator
+from weakref import WeakSet
 
 from ulauncher.internals import effect_utils, effects, ipc
 from ulauncher.internals.effects import EffectMessage, EffectType
@@ -13,7 +14,7 @@ from ulauncher.modes.extensions.extension_record import (
     ExtensionRecord,
     ExtensionRecordTrigger,
 )
-from ulauncher.modes.mode import Mode
+from ulauncher.modes.mode import Mode, ResultCachePolicy
 from ulauncher.utils import scheduling
 from ulauncher.utils.eventbus import EventBus
 from ulauncher.utils.socket_msg_controller import summarize_ipc_args
@@ -46,9 +47,13 @@ class ExtensionMode(Mode):
     _pending_callback: Callable[[EffectMessage], None] | None = None
     _loading_timer: scheduling.Context | None = None
     _request_id: int = 0
+    _live_request_id: int = 0  # the request the extension keeps the rendered results for (to activate them)
+    # activation of a cached result, replayed on the live result with the same key once it's rendered
+    _pending_activation: tuple[str, tuple[str, ...], Callable[[EffectMessage], None]] | None = None
 
     def __init__(self, service: ExtensionService) -> None:
         self._trigger_cache = {}
+        self._live_results: WeakSet[Result] = WeakSet()
         self._service = service
         service.activate(self)
 
@@ -72,8 +77,22 @@ class ExtensionMode(Mode):
         if self._active_ext and self._active_ext.id == ext_id:
             scheduling.run_when_idle(lambda: events.emit("app:reload_query"))
 
+    def get_result_cache_policy(self, query: Query) -> ResultCachePolicy | None:
+        """
+        Extensions opt in by declaring result_cache_ttl in the manifest. The cached results are always refreshed,
+        because the extension only keeps the results of its last response for activation.
+        """
+        self._ensure_trigger_cache()
+        trigger_cache_entry = self._trigger_cache.get(query.keyword or "")
+        ext = self._service.get(trigger_cache_entry[1]) if trigger_cache_entry else None
+        ttl = _get_result_cache_ttl(ext) if trigger_cache_entry and ext else None
+        if not ttl:
+            return None
+        return ResultCachePolicy(token=trigger_cache_entry, ttl=ttl, refresh=True)
+
     def handle_query(self, query: Query, callback: Callable[[EffectMessage], None]) -> None:
         self._clear_loading_timer()
+        self._pending_activation = None
         if not query.keyword:
             msg = f"Extensions currently only support queries with a keyword ('{query}' given)"
             raise RuntimeError(msg)
@@ -179,6 +198,14 @@ class ExtensionMode(Mode):
             }
             self._send_request(launch_event, callback)
             return
+        elif self._active_ext and _get_result_cache_ttl(self._active_ext) and result not in self._live_results:
+            # rendered from the result cache of the core, so the extension doesn't keep it
+            if self._pending_callback:  # activate the live result replacing it, once the response arrives
+                self._pending_activation = (action_id, result.get_key(), callback)
+            else:
+                logger.warning("Ignoring activation of outdated extension result '%s'", result.name)
+                callback(effects.do_nothing())
+            return
         else:
             activation_event: ipc.ResultActivationEvent = {
                 "type": EventType.RESULT_ACTIVATION,
@@ -236,7 +263,9 @@ class ExtensionMode(Mode):
                 return
             response = message["response"]
             response["effect"] = self._rehydrate_results(self._active_ext, response["effect"])
+            self._track_live_results(message["request_id"], response["effect"])
             self._handle_response(response)
+            self._replay_pending_activation(response["effect"])
         elif message["name"] == "clipboard_store":
             if "text" not in message:
                 logger.warning("Received malformed 'clipboard_store' message from %s: %s", ext_id, message)
@@ -261,6 +290,26 @@ class ExtensionMode(Mode):
         else:
             logger.warning("Received unknown message from %s: %s", ext_id, message)
 
+    def _track_live_results(self, request_id: int, effect_msg: EffectMessage) -> None:
+        # the extension replaces the results it keeps when it responds to another request
+        if self._live_request_id != request_id:
+            self._live_request_id = request_id
+            self._live_results = WeakSet()
+        self._live_results.update(_iter_rendered_results(effect_msg))
+
+    def _replay_pending_activation(self, effect_msg: EffectMessage) -> None:
+        if not self._pending_activation:
+            return
+        action_id, key, callback = self._pending_activation
+        live_result = next((result for result in _iter_rendered_results(effect_msg) if result.get_key() == key), None)
+        if live_result:
+            self._pending_activation = None
+            self.activate_result(action_id, live_result, Query(None, ""), callback)
+        elif not self._pending_callback:  # the response is complete, without the activated result
+            self._pending_activation = None
+            logger.warning("Ignoring activation of extension result '%s', which is no longer rendered", key[0])
+            callback(effects.do_nothing())
+
     def _handle_response(self, response: ipc.Response) -> None:
         if not self._pending_callback:
             logger.debug("Ignoring outdated extension response")
@@ -323,3 +372,17 @@ class ExtensionMode(Mode):
             rendered.append(result)
         effect_msg["results"] = rendered
         return effect_msg
+
+
+def _get_result_cache_ttl(ext: ExtensionRecord) -> float | None:
+    ttl = ext.display_manifest.result_cache_ttl
+    return ttl if isinstance(ttl, (int, float)) and ttl > 0 else None
+
+
+def _iter_rendered_results(effect_msg: EffectMessage) -> Iterator[Result]:
+    """The results rendered by the effect, including those nested in LEGACY_RUN_MANY."""
+    if effect_msg["type"] == EffectType.LEGACY_RUN_MANY:
+        for nested_effect in effect_msg["effects"]:
+            yield from _iter_rendered_results(nested_effect)
+    elif effect_msg["type"] == EffectType.RENDER_RESULTS:
+        yield from effect_msg["results"]
@@ -400,6 +400,9 @@ class ExtensionService(ExtensionRegistry):
 
         old_preferences = {p_id: pref.value for p_id, pref in record.preferences.items()}
         record.persist_preferences(data)
+        # the trigger keywords are part of the preferences
+        if listener := self.listener:
+            listener.invalidate_cache()
         for p_id, new_value in data.get("preferences", {}).items():
             # Only notify about values changing for preferences declared in the manifest
             if p_id in old_preferences and new_value != old_preferences[p_id]:
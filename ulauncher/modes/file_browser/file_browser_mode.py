@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import logging
 import os
+import re
 from os.path import dirname, expandvars, join
 from pathlib import Path
 from typing import Callable
@@ -10,7 +11,7 @@ from ulauncher.internals import effects
 from ulauncher.internals.query import Query
 from ulauncher.internals.result import Result
 from ulauncher.modes.file_browser.results import FileResult
-from ulauncher.modes.mode import Mode
+from ulauncher.modes.mode import Mode, ResultCachePolicy
 from ulauncher.utils.eventbus import EventBus
 from ulauncher.utils.fold_user_path import fold_user_path
 
@@ -18,9 +19,15 @@ _events = EventBus()
 logger = logging.getLogger(__name__)
 
 
+def _get_closest_parent(path: Path) -> str:
+    """The path, or its closest parent that exists"""
+    return str(next(parent for parent in [path, *list(path.parents)] if parent.exists()))
+
+
 class FileBrowserMode(Mode):
     LIMIT = 50
     THRESHOLD = 40
+    query_prefilter = re.compile(r"\s*[~/$]")
 
     def matches_query_str(self, query_str: str) -> bool:
         """
@@ -48,6 +55,22 @@ class FileBrowserMode(Mode):
     def filter_dot_files(self, file_list: list[str]) -> list[str]:
         return [f for f in file_list if not f.startswith(".")]
 
+    def get_result_cache_policy(self, query: Query) -> ResultCachePolicy | None:
+        """
+        The results are listed from the closest existing dir, so they're fresh until the dir is modified.
+        Except for the listings of a dir itself, which are sorted by access time.
+        """
+        if not query.argument:
+            return None
+        try:
+            path = Path(expandvars(query.argument.strip())).expanduser()
+            closest_parent = _get_closest_parent(path)
+            if closest_parent == str(path):
+                return None
+            return ResultCachePolicy(token=(closest_parent, os.stat(closest_parent).st_mtime_ns))
+        except (RuntimeError, OSError):
+            return None
+
     def handle_query(self, query: Query, callback: Callable[[effects.EffectMessage], None]) -> None:
         results: list[Result] = []
         try:
@@ -57,7 +80,7 @@ class FileBrowserMode(Mode):
                 return
             path = Path(expandvars(path_str.strip())).expanduser()
 
-            closest_parent = str(next(parent for parent in [path, *list(path.parents)] if parent.exists()))
+            closest_parent = _get_closest_parent(path)
             remainder = "/".join(path.parts[closest_parent.count("/") + 1 :])
 
             if closest_parent != ".":  # valid path
@@ -74,12 +97,10 @@ class FileBrowserMode(Mode):
                     if not path_str.startswith("."):
                         file_names = self.filter_dot_files(file_names)
 
-                    from ulauncher.utils.fuzzy_search import get_score
+                    from ulauncher.utils.fuzzy_search import get_top_scored, score_many
 
-                    sorted_files = sorted(file_names, key=lambda fn: get_score(path_str, fn), reverse=True)
-                    filtered = list(filter(lambda fn: get_score(path_str, fn) > self.THRESHOLD, sorted_files))[
-                        : self.LIMIT
-                    ]
+                    scores = dict(zip(file_names, score_many(path_str, file_names, self.THRESHOLD)))
+                    filtered = get_top_scored(file_names, scores.__getitem__, self.LIMIT, self.THRESHOLD)
                     for name in filtered:
                         file_path = join(closest_parent, name)
                         results.append(FileResult(file_path))
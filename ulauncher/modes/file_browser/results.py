@@ -38,3 +38,6 @@ class FileResult(Result):
 
     def get_highlightable_input(self, query_str: str) -> str:
         return basename(query_str)
+
+    def get_key(self) -> tuple[str, ...]:
+        return ("file", self.path)
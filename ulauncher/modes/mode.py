@@ -1,14 +1,31 @@
 from __future__ import annotations
 
+import re
 from abc import ABC, abstractmethod
-from typing import Callable, Iterable
+from typing import Callable, Hashable, Iterable
 
 from ulauncher.internals.effects import EffectMessage
 from ulauncher.internals.query import Query
 from ulauncher.internals.result import Result
 
 
+class ResultCachePolicy:
+    """How long the results of a query stay fresh in the result cache of UlauncherCore."""
+
+    def __init__(self, token: Hashable = None, ttl: float | None = None, refresh: bool = False) -> None:
+        # the cached results are discarded when the mode returns a policy with another token for the query
+        self.token = token
+        # seconds until the cached results expire (None to never expire)
+        self.ttl = ttl
+        # handle the query again after rendering the cached results, to replace them
+        self.refresh = refresh
+
+
 class Mode(ABC):
+    # Cheap check (with re.match) that a query must pass before matches_query_str is called for it.
+    # It may let through queries the mode doesn't match, but never the other way around
+    query_prefilter: re.Pattern[str] | None = None
+
     def matches_query_str(self, _query_str: str) -> bool:
         """
         Returns if the input should be handled by the mode (only for dynamic modes without extensions).
@@ -28,6 +45,13 @@ class Mode(ABC):
         """
         ...
 
+    def get_result_cache_policy(self, _query: Query) -> ResultCachePolicy | None:
+        """
+        Returns how the results rendered for the query can be reused when the query is entered again
+        (like when backspacing), or None if they can't be cached (the default).
+        """
+        return None
+
     def get_placeholder_icon(self) -> str | None:
         """
         Returns icon for the placeholder result to show while waiting for async results.
@@ -43,8 +67,8 @@ class Mode(ABC):
     def has_trigger_changes(self) -> bool:
         """
         Returns True if this mode's triggers may need to be reloaded.
-        Note that all triggers are reloaded when the Ulauncher window is shown,
-        so this is mainly for modes that load trigger asynchronously and won't be ready initially.
+        The triggers are only reloaded when this returns True (or when the reload is forced),
+        so modes with triggers that can change have to track it.
         """
         return False
 
@@ -34,10 +34,14 @@ def convert_to_result(shortcut: Shortcut, query: Query | None = None) -> results
 
 class ShortcutMode(Mode):
     shortcuts: Shortcuts
+    _loaded_generation: int | None = None  # of the shortcuts the triggers were loaded from
 
     def __init__(self) -> None:
         self.shortcuts = Shortcuts.load()
 
+    def has_trigger_changes(self) -> bool:
+        return self._loaded_generation != self.shortcuts.generation
+
     def _get_active_shortcut(self, query: Query) -> Shortcut | None:
         for s in self.shortcuts.values():
             if query.keyword == s.keyword and (query.is_active or s.run_without_argument):
@@ -59,6 +63,7 @@ class ShortcutMode(Mode):
         return [convert_to_result(s, query) for s in self.shortcuts.values() if s["is_default_search"]]
 
     def get_triggers(self) -> Iterator[Result]:
+        self._loaded_generation = self.shortcuts.generation
         for shortcut in self.shortcuts.values():
             yield (
                 results.ShortcutStaticTrigger(**shortcut, description=get_description(shortcut))
@@ -70,13 +70,17 @@ class UlauncherApp(Gtk.Application):
     def activate_result(self, result: Result, alt: bool) -> None:
         self.core.activate_result(result, self.show_results, alt)
 
+    def finish_search(self) -> None:
+        self.core.finish_search()
+
     def handle_backspace(self, query_str: str) -> bool:
         """Whether a mode consumed the backspace by rewriting the query (smart backspace)."""
         return self.core.handle_backspace(query_str)
 
     def window_ready(self) -> None:
         # The window decides when this runs, to control startup performance.
-        self.core.load_triggers(force=True)
+        # Only the modes with trigger changes are reloaded, so in most cases this does nothing.
+        self.core.load_triggers()
         self.core.set_query(self.query, self.show_results)
 
     @events.on
@@ -120,6 +124,10 @@ class UlauncherApp(Gtk.Application):
         self.run([])
 
     def setup(self) -> None:
+        from ulauncher.utils.systemd_controller import SystemdController
+
+        # Launching apps and the settings read the unit status on every use, so keep it cached
+        SystemdController("ulauncher").watch()
         settings = Settings.load()
         self.core = UlauncherCore()
         # Always hold on app start (conditionally release after closing window)
@@ -299,9 +307,11 @@ class UlauncherApp(Gtk.Application):
         from contextlib import suppress
         from shutil import rmtree
 
+        from ulauncher.modes.apps.app_rankings import AppRankings
         from ulauncher.modes.extensions.extension_service import ext_service
 
         ext_service.detach_preview_log()
+        AppRankings.load().flush()
 
         # Prune staging entries, except recent entries (within 1h) since they could be ongoing installs via the cli
         threshold = time.time() - 3600
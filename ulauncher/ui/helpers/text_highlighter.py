@@ -1,13 +1,19 @@
 from __future__ import annotations
 
+from html import escape, unescape
 from typing import Iterator
 
 from ulauncher.utils.fuzzy_search import get_matching_blocks
 
 
 def highlight_text(query_str: str, text: str) -> Iterator[tuple[str, bool]]:
+    return split_text(text, get_matching_blocks(query_str, text)[0])
+
+
+def split_text(text: str, blocks: list[tuple[int, str]]) -> Iterator[tuple[str, bool]]:
+    """Split the text into the matching blocks and the text between them, flagging the matching ones."""
     block_index = 0
-    for index, chars in get_matching_blocks(query_str, text)[0]:
+    for index, chars in blocks:
         chars_len = len(chars)
         if index != block_index:
             yield (text[block_index:index], False)
@@ -15,3 +21,13 @@ def highlight_text(query_str: str, text: str) -> Iterator[tuple[str, bool]]:
         block_index = index + chars_len
     if block_index < len(text):
         yield (text[block_index:], False)
+
+
+def get_highlight_markup(text: str, blocks: list[tuple[int, str]], attributes: dict[str, str]) -> str:
+    """Pango markup for the text, with the matching blocks in spans with the highlight attributes (like foreground)."""
+    span = "<span{}>".format("".join(f' {name}="{escape(value)}"' for name, value in attributes.items()))
+    markup = []
+    for chunk, is_highlight in split_text(text, blocks):
+        escaped_chunk = escape(unescape(chunk), quote=False)
+        markup.append(f"{span}{escaped_chunk}</span>" if is_highlight else escaped_chunk)
+    return "".join(markup)
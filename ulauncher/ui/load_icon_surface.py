@@ -1,41 +1,379 @@
 from __future__ import annotations
 
+import hashlib
 import logging
-from typing import TYPE_CHECKING
+import os
+import struct
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Callable, Tuple
 
 from ulauncher import paths
 from ulauncher.utils.lru_cache import lru_cache
 
 if TYPE_CHECKING:
     from cairo import ImageSurface
+    from gi.repository import GdkPixbuf
+
+    from ulauncher.gi import Gio
 
 
 logger = logging.getLogger(__name__)
 
 DEFAULT_EXE_ICON = f"{paths.ASSETS}/icons/executable.png"
+ICON_CACHE_MAX_BYTES = 32 * 1024 * 1024  # about 1300 icons of 40px at scale 2
+# rasterized icons, so they don't have to be decoded again after a restart
+ICON_CACHE_DIR = f"{paths.CACHE}/icons"
+ICON_DISK_CACHE_MAX_BYTES = 64 * 1024 * 1024  # the least recently written icons are pruned over this
+_DISK_CACHE_MAGIC = b"ULI2"
+_DISK_CACHE_HEADER = struct.Struct("<4sqiiii")  # magic, icon file mtime (us), cairo format, width, height, stride
+_MTIME_ATTRIBUTES = "time::modified,time::modified-usec"
+
+_IconKey = Tuple[str, int, int]  # (icon, size, scaling factor)
+_DiskCacheEntry = Tuple[str, int]  # (path of the rasterized icon, mtime of the icon file it was rasterized from)
+
+
+class _SurfaceCache:
+    """LRU cache of the icon surfaces, bounded by the size of their pixel data rather than by their number."""
+
+    def __init__(self, max_bytes: int) -> None:
+        self.max_bytes = max_bytes
+        self.byte_size = 0
+        self._surfaces: OrderedDict[_IconKey, ImageSurface] = OrderedDict()
+
+    def get(self, key: _IconKey) -> ImageSurface | None:
+        surface = self._surfaces.get(key)
+        if surface:
+            self._surfaces.move_to_end(key)
+        return surface
+
+    def add(self, key: _IconKey, surface: ImageSurface) -> None:
+        if key in self._surfaces:
+            self.byte_size -= _get_byte_size(self._surfaces.pop(key))
+        self._surfaces[key] = surface
+        self.byte_size += _get_byte_size(surface)
+        while self.byte_size > self.max_bytes and len(self._surfaces) > 1:
+            _key, evicted = self._surfaces.popitem(last=False)
+            self.byte_size -= _get_byte_size(evicted)
+
+
+_cache = _SurfaceCache(ICON_CACHE_MAX_BYTES)
+_pending_callbacks: dict[_IconKey, list[Callable[[ImageSurface], None]]] = {}
+
+
+def _get_byte_size(surface: ImageSurface) -> int:
+    return surface.get_stride() * surface.get_height()
+
+
+def _get_icon_file(icon: str, real_size: int) -> str:
+    if icon.startswith("/"):
+        return icon
+    from ulauncher.ui.get_icon_path import get_icon_path
+
+    return get_icon_path(icon, real_size) or DEFAULT_EXE_ICON
+
+
+def _create_surface(pixbuf: GdkPixbuf.Pixbuf | None, icon_file: str, scaling_factor: int) -> ImageSurface:
+    from gi.repository import Gdk
+
+    if not pixbuf:
+        msg = f"Could not load icon pixbuf: {icon_file}"
+        raise RuntimeError(msg)
+    return Gdk.cairo_surface_create_from_pixbuf(pixbuf, scaling_factor)
+
+
+def _get_disk_cache_path(icon_file: str, real_size: int, scaling_factor: int) -> str:
+    from gi.repository import Gtk
+
+    gtk_settings = Gtk.Settings.get_default()
+    theme_name = gtk_settings.props.gtk_icon_theme_name if gtk_settings else ""
+    cache_key = f"{icon_file}\0{real_size}\0{scaling_factor}\0{theme_name}"
+    return f"{ICON_CACHE_DIR}/{hashlib.sha256(cache_key.encode()).hexdigest()}"
+
+
+def _get_disk_cache_entry(icon_file: str, real_size: int, scaling_factor: int) -> _DiskCacheEntry | None:
+    try:
+        mtime_us = os.stat(icon_file).st_mtime_ns // 1000
+    except OSError:
+        return None
+    return _get_disk_cache_path(icon_file, real_size, scaling_factor), mtime_us
+
+
+def _get_mtime_us(info: Gio.FileInfo) -> int:
+    """The modification time (in microseconds) of the file info queried with _MTIME_ATTRIBUTES"""
+    return info.get_attribute_uint64("time::modified") * 1_000_000 + info.get_attribute_uint32("time::modified-usec")
+
+
+def _surface_to_cache_data(surface: ImageSurface, mtime_us: int) -> bytes:
+    surface.flush()
+    header = _DISK_CACHE_HEADER.pack(
+        _DISK_CACHE_MAGIC,
+        mtime_us,
+        int(surface.get_format()),
+        surface.get_width(),
+        surface.get_height(),
+        surface.get_stride(),
+    )
+    return header + bytes(surface.get_data())
+
+
+def _surface_from_cache_data(data: bytes, mtime_us: int, scaling_factor: int) -> ImageSurface | None:
+    """The surface stored in the cache data, or None if it's invalid or outdated."""
+    import cairo
+
+    if len(data) < _DISK_CACHE_HEADER.size:
+        return None
+    magic, cached_mtime_us, cairo_format, width, height, stride = _DISK_CACHE_HEADER.unpack_from(data)
+    if magic != _DISK_CACHE_MAGIC or cached_mtime_us != mtime_us:
+        return None
+    if len(data) != _DISK_CACHE_HEADER.size + stride * height:
+        return None
+    pixels = bytearray(data[_DISK_CACHE_HEADER.size :])
+    try:
+        surface = cairo.ImageSurface.create_for_data(pixels, cairo.Format(cairo_format), width, height, stride)
+    except (ValueError, cairo.Error):  # a corrupt header, like an unknown format or a stride too small for the width
+        return None
+    surface.set_device_scale(scaling_factor, scaling_factor)
+    return surface
+
+
+def _read_disk_cache(entry: _DiskCacheEntry, scaling_factor: int) -> ImageSurface | None:
+    cache_path, mtime_us = entry
+    try:
+        with open(cache_path, "rb") as cache_file:
+            return _surface_from_cache_data(cache_file.read(), mtime_us, scaling_factor)
+    except OSError:
+        return None
+
+
+@lru_cache(maxsize=None)
+def _prepare_disk_cache_dir() -> None:
+    """Create the cache dir before the first write, and start pruning it in the background."""
+    os.makedirs(ICON_CACHE_DIR, exist_ok=True)
+    _prune_disk_cache()
+
+
+def _prune_disk_cache() -> None:
+    """
+    Remove the least recently written icons over ICON_DISK_CACHE_MAX_BYTES, as the icons of uninstalled apps and
+    previous icon themes are never read again. The cache dir is listed and pruned asynchronously, at low priority.
+    """
+    from ulauncher.gi import Gio, GLib
+
+    cache_files: list[tuple[int, int, Gio.File]] = []  # (mtime, size, file)
+
+    def on_removed(file: Gio.File, result: Gio.AsyncResult) -> None:
+        try:
+            file.delete_finish(result)
+        except GLib.Error as e:
+            logger.warning("Could not remove the icon cache file %s (%s)", file.get_path(), e)
+
+    def prune() -> None:
+        total_bytes = sum(size for _mtime, size, _file in cache_files)
+        for _mtime, size, file in sorted(cache_files, key=lambda cache_file: cache_file[0]):
+            if total_bytes <= ICON_DISK_CACHE_MAX_BYTES:
+                break
+            file.delete_async(GLib.PRIORITY_LOW, None, on_removed)
+            total_bytes -= size
+
+    def on_next_files(enumerator: Gio.FileEnumerator, result: Gio.AsyncResult) -> None:
+        try:
+            infos = enumerator.next_files_finish(result)
+        except GLib.Error as e:
+            logger.warning("Could not list the icon cache (%s)", e)
+            return
+        if not infos:
+            prune()
+            return
+        cache_files.extend((_get_mtime_us(info), info.get_size(), enumerator.get_child(info)) for info in infos)
+        enumerator.next_files_async(100, GLib.PRIORITY_LOW, None, on_next_files)
+
+    def on_enumerated(cache_dir: Gio.File, result: Gio.AsyncResult) -> None:
+        try:
+            enumerator = cache_dir.enumerate_children_finish(result)
+        except GLib.Error as e:
+            logger.warning("Could not list the icon cache (%s)", e)
+            return
+        enumerator.next_files_async(100, GLib.PRIORITY_LOW, None, on_next_files)
+
+    Gio.File.new_for_path(ICON_CACHE_DIR).enumerate_children_async(
+        f"standard::size,{_MTIME_ATTRIBUTES}", Gio.FileQueryInfoFlags.NONE, GLib.PRIORITY_LOW, None, on_enumerated
+    )
+
+
+def _write_disk_cache(entry: _DiskCacheEntry, surface: ImageSurface) -> None:
+    from ulauncher.gi import Gio, GLib
+
+    cache_path, mtime_us = entry
+
+    def on_written(file: Gio.File, result: Gio.AsyncResult) -> None:
+        try:
+            file.replace_contents_finish(result)
+        except GLib.Error as e:
+            logger.warning("Could not write the icon cache file %s (%s)", cache_path, e)
+
+    _prepare_disk_cache_dir()
+    data = GLib.Bytes.new(_surface_to_cache_data(surface, mtime_us))
+    # replaces the file atomically, so a reader never gets a partly written icon
+    Gio.File.new_for_path(cache_path).replace_contents_bytes_async(
+        data, None, False, Gio.FileCreateFlags.NONE, None, on_written
+    )
+
+
+def _get_fallback_surface(icon_file: str, size: int, scaling_factor: int, error: Exception) -> ImageSurface:
+    if icon_file == DEFAULT_EXE_ICON:
+        msg = f"Could not load fallback icon: {icon_file}"
+        raise RuntimeError(msg) from error
+
+    logger.warning("Could not load specified icon %s (%s). Will use fallback icon", icon_file, error)
+    return load_icon_surface(DEFAULT_EXE_ICON, size, scaling_factor)
 
 
-@lru_cache(maxsize=50)
 def load_icon_surface(icon: str, size: int, scaling_factor: int = 1) -> ImageSurface:
-    from gi.repository import Gdk, GdkPixbuf
+    from gi.repository import GdkPixbuf
 
     from ulauncher.gi import GLib
 
+    key = (icon, size, scaling_factor)
+    if surface := _cache.get(key):
+        return surface
+
     real_size = size * scaling_factor
+    icon_file = _get_icon_file(icon, real_size)
+    disk_cache_entry = _get_disk_cache_entry(icon_file, real_size, scaling_factor)
+    if disk_cache_entry and (surface := _read_disk_cache(disk_cache_entry, scaling_factor)):
+        _cache.add(key, surface)
+        return surface
+
     try:
-        if not icon.startswith("/"):
-            from ulauncher.ui.get_icon_path import get_icon_path
-
-            icon = get_icon_path(icon, real_size) or DEFAULT_EXE_ICON
-        pixbuf = GdkPixbuf.Pixbuf.new_from_file_at_size(icon, real_size, real_size)
-        if not pixbuf:
-            msg = f"Could not load icon pixbuf: {icon}"
-            raise RuntimeError(msg)
-        return Gdk.cairo_surface_create_from_pixbuf(pixbuf, scaling_factor)
-    except GLib.Error as e:
-        if icon == DEFAULT_EXE_ICON:
-            msg = f"Could not load fallback icon: {icon}"
-            raise RuntimeError(msg) from e
-
-        logger.warning("Could not load specified icon %s (%s). Will use fallback icon", icon, e)
-        return load_icon_surface(DEFAULT_EXE_ICON, size, scaling_factor)
+        pixbuf = GdkPixbuf.Pixbuf.new_from_file_at_size(icon_file, real_size, real_size)
+        surface = _create_surface(pixbuf, icon_file, scaling_factor)
+    except (GLib.Error, RuntimeError) as e:
+        surface = _get_fallback_surface(icon_file, size, scaling_factor, e)
+    else:
+        if disk_cache_entry:
+            _write_disk_cache(disk_cache_entry, surface)
+    _cache.add(key, surface)
+    return surface
+
+
+class _AsyncIconLoader:
+    """
+    Loads the surface of an icon for load_icon_surface_async, from the disk cache if the icon file wasn't modified
+    since, or else by decoding the icon file. The callbacks pending for the icon are called with it when done.
+    """
+
+    def __init__(self, key: _IconKey) -> None:
+        icon, self.size, self.scaling_factor = key
+        self.key = key
+        self.real_size = self.size * self.scaling_factor
+        self.icon_file = _get_icon_file(icon, self.real_size)
+        self.disk_cache_entry: _DiskCacheEntry | None = None
+
+    def start(self) -> None:
+        from ulauncher.gi import Gio, GLib
+
+        Gio.File.new_for_path(self.icon_file).query_info_async(
+            _MTIME_ATTRIBUTES, Gio.FileQueryInfoFlags.NONE, GLib.PRIORITY_DEFAULT, None, self._on_icon_file_info
+        )
+
+    def _finish(self, surface: ImageSurface) -> None:
+        _cache.add(self.key, surface)
+        for pending_callback in _pending_callbacks.pop(self.key, []):
+            pending_callback(surface)
+
+    def _finish_with_fallback(self, error: Exception) -> None:
+        if self.icon_file == DEFAULT_EXE_ICON:
+            logger.error("Could not load fallback icon %s (%s)", self.icon_file, error)
+            # forget the pending callbacks, so the next request for the icon tries again
+            _pending_callbacks.pop(self.key, None)
+            return
+        logger.warning("Could not load specified icon %s (%s). Will use fallback icon", self.icon_file, error)
+        # the callbacks wait for the fallback icon instead, so they're dropped along with it if it fails too
+        callbacks = _pending_callbacks.pop(self.key, [])
+
+        def on_fallback_loaded(surface: ImageSurface) -> None:
+            _cache.add(self.key, surface)
+            for callback in callbacks:
+                callback(surface)
+
+        # loaded like any other icon, so it's only decoded once per size and scaling factor, and then reused
+        load_icon_surface_async(DEFAULT_EXE_ICON, self.size, self.scaling_factor, on_fallback_loaded)
+
+    def _on_icon_file_info(self, file: Gio.File, result: Gio.AsyncResult) -> None:
+        from ulauncher.gi import Gio, GLib
+
+        try:
+            info = file.query_info_finish(result)
+        except GLib.Error:  # reading the icon file will fail too, and fall back to the default icon
+            self._decode_icon_file()
+            return
+        cache_path = _get_disk_cache_path(self.icon_file, self.real_size, self.scaling_factor)
+        self.disk_cache_entry = (cache_path, _get_mtime_us(info))
+        Gio.File.new_for_path(cache_path).load_contents_async(None, self._on_disk_cache_read)
+
+    def _on_disk_cache_read(self, file: Gio.File, result: Gio.AsyncResult) -> None:
+        from ulauncher.gi import GLib
+
+        try:
+            _ok, data, _etag = file.load_contents_finish(result)
+        except GLib.Error:  # not cached yet
+            self._decode_icon_file()
+            return
+        if self.disk_cache_entry and (
+            surface := _surface_from_cache_data(data, self.disk_cache_entry[1], self.scaling_factor)
+        ):
+            self._finish(surface)
+        else:
+            self._decode_icon_file()
+
+    def _decode_icon_file(self) -> None:
+        from ulauncher.gi import Gio, GLib
+
+        Gio.File.new_for_path(self.icon_file).read_async(GLib.PRIORITY_DEFAULT, None, self._on_file_opened)
+
+    def _on_file_opened(self, file: Gio.File, result: Gio.AsyncResult) -> None:
+        from gi.repository import GdkPixbuf
+
+        from ulauncher.gi import GLib
+
+        try:
+            stream = file.read_finish(result)
+        except GLib.Error as e:
+            self._finish_with_fallback(e)
+            return
+        GdkPixbuf.Pixbuf.new_from_stream_at_scale_async(
+            stream, self.real_size, self.real_size, True, None, self._on_pixbuf_loaded
+        )
+
+    def _on_pixbuf_loaded(self, _source: object, result: Gio.AsyncResult) -> None:
+        from gi.repository import GdkPixbuf
+
+        from ulauncher.gi import GLib
+
+        try:
+            pixbuf = GdkPixbuf.Pixbuf.new_from_stream_finish(result)
+            surface = _create_surface(pixbuf, self.icon_file, self.scaling_factor)
+        except (GLib.Error, RuntimeError) as e:
+            self._finish_with_fallback(e)
+            return
+        if self.disk_cache_entry:
+            _write_disk_cache(self.disk_cache_entry, surface)
+        self._finish(surface)
+
+
+def load_icon_surface_async(
+    icon: str, size: int, scaling_factor: int, callback: Callable[[ImageSurface], None]
+) -> None:
+    """
+    Like load_icon_surface, but the icon file is read and decoded off the main thread (by GdkPixbuf),
+    and the callback is called from the main loop. Cached icons are passed to the callback right away.
+    """
+    key = (icon, size, scaling_factor)
+    if surface := _cache.get(key):
+        callback(surface)
+        return
+    if key in _pending_callbacks:  # already loading for another row
+        _pending_callbacks[key].append(callback)
+        return
+    _pending_callbacks[key] = [callback]
+    _AsyncIconLoader(key).start()
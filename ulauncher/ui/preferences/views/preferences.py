@@ -138,7 +138,7 @@ class PreferencesView(BaseView):
         run_in_bg_footer = "\n<b>Recommended:</b> Enabling this will make Ulauncher open noticeably faster."
 
         # Run in background (via systemd autostart, or keep-alive fallback)
-        autostart_status = self.autostart_pref.status()
+        autostart_status = self.autostart_pref.cached_status()
         if autostart_status.can_start:
             autostart_switch = Gtk.Switch(active=autostart_status.is_enabled)
             autostart_switch.connect("notify::active", self._on_autostart_toggled)
@@ -291,7 +291,7 @@ class PreferencesView(BaseView):
     def _on_autostart_toggled(self, switch: Gtk.Switch, _: Any) -> None:
         is_enabled = switch.get_active()
         # Skip if already in sync - notably when set_active() below re-fires this handler.
-        if is_enabled == self.autostart_pref.status().is_enabled:
+        if is_enabled == self.autostart_pref.cached_status().is_enabled:
             return
         try:
             self.autostart_pref.toggle(is_enabled)
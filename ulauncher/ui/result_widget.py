@@ -2,31 +2,50 @@ from __future__ import annotations
 
 import logging
 from html import unescape
-from typing import Callable
+from typing import TYPE_CHECKING, Callable
 
 from gi.repository import Gdk, Gtk, Pango
 
 from ulauncher.internals.query import Query
 from ulauncher.internals.result import Result
 from ulauncher.ui.helpers.monitor import get_text_scaling_factor
-from ulauncher.ui.helpers.text_highlighter import highlight_text
-from ulauncher.ui.load_icon_surface import load_icon_surface
+from ulauncher.ui.helpers.text_highlighter import get_highlight_markup
+from ulauncher.ui.load_icon_surface import load_icon_surface_async
+
+if TYPE_CHECKING:
+    from cairo import ImageSurface
 
-ELLIPSIZE_MIN_LENGTH = 6
-ELLIPSIZE_FORCE_AT_LENGTH = 20
 logger = logging.getLogger(__name__)
 
 
+def _get_hex_color(color: Gdk.RGBA) -> str:
+    return "#" + "".join(f"{round(channel * 255):02x}" for channel in (color.red, color.green, color.blue))
+
+
 class ResultWidget(Gtk.EventBox):
+    """
+    Row widget for a result. The widgets are built once, and rebound to other results with bind(),
+    so ResultsView can reuse them instead of building new rows on every keystroke.
+    """
+
     index: int = 0
     name: str
     query: Query
     result: Result
     jump_keys: list[str]
     item_box: Gtk.EventBox
+    item_container: Gtk.Box
+    icon: Gtk.Image
     shortcut_label: Gtk.Label
     title_box: Gtk.Box
+    title_label: Gtk.Label
+    descr_label: Gtk.Label
     text_container: Gtk.Box
+    name_blocks: list[tuple[int, str]] | None = None
+    _highlight_attributes: dict[str, str] | None = None  # of the theme, until the style of the label is updated
+    _reading_highlight_style = False
+    _icon_key: tuple[str, int] | None = None
+    _appearance: tuple[str, bool, bool, str] | None = None  # what the icon and the layout were last updated for
 
     def __init__(
         self,
@@ -37,16 +56,11 @@ class ResultWidget(Gtk.EventBox):
         on_activate: Callable[[int, bool], None],
         jump_keys: list[str],
     ) -> None:
-        self.result = result
-        self.query = query
         self._on_select = on_select
         self._on_activate = on_activate
-        self.jump_keys = jump_keys
-        text_scaling_factor = get_text_scaling_factor()
-        icon_size = 25 if result.compact else 40
-        inner_margin_x = int(12.0 * text_scaling_factor)
-        outer_margin_x = int(18.0 * text_scaling_factor)
-        margin_y = (3 if result.compact else 5) * text_scaling_factor
+        self._text_scaling_factor = get_text_scaling_factor()
+        inner_margin_x = int(12.0 * self._text_scaling_factor)
+        outer_margin_x = int(18.0 * self._text_scaling_factor)
 
         super().__init__()
         self.get_style_context().add_class("item-frame")
@@ -56,75 +70,123 @@ class ResultWidget(Gtk.EventBox):
         self.item_box = Gtk.EventBox()
         self.item_box.get_style_context().add_class("item-box")
         self.add(self.item_box)
-        item_container = Gtk.Box()
-        item_container.get_style_context().add_class("item-container")
-        self.item_box.add(item_container)
+        self.item_container = Gtk.Box()
+        self.item_container.get_style_context().add_class("item-container")
+        self.item_box.add(self.item_container)
 
-        icon = Gtk.Image()
-        icon.set_from_surface(load_icon_surface(result.icon or "gtk-missing-image", icon_size, self.get_scale_factor()))
-        icon.get_style_context().add_class("item-icon")
-        item_container.pack_start(icon, False, True, 0)
+        self.icon = Gtk.Image()
+        self.icon.get_style_context().add_class("item-icon")
+        self.item_container.pack_start(self.icon, False, True, 0)
 
         self.text_container = Gtk.Box(
-            width_request=int(350.0 * text_scaling_factor),
+            width_request=int(350.0 * self._text_scaling_factor),
             margin_start=inner_margin_x,
             margin_end=inner_margin_x,
             orientation=Gtk.Orientation.VERTICAL,
             valign=Gtk.Align.CENTER,
         )
-        item_container.pack_start(self.text_container, True, True, 0)
+        self.item_container.pack_start(self.text_container, True, True, 0)
 
         self.shortcut_label = Gtk.Label(justify=Gtk.Justification.RIGHT, width_request=44)
         self.shortcut_label.get_style_context().add_class("item-shortcut")
         self.shortcut_label.get_style_context().add_class("item-text")
-        item_container.pack_end(self.shortcut_label, False, True, 0)
+        self.item_container.pack_end(self.shortcut_label, False, True, 0)
 
-        self.set_index(index)
-
-        item_container.get_style_context().add_class("small-result-item")
+        self.item_container.get_style_context().add_class("small-result-item")
 
         self.title_box = Gtk.Box()
         self.title_box.get_style_context().add_class("item-name")
         self.title_box.get_style_context().add_class("item-text")
+        self.text_container.pack_start(self.title_box, False, True, 0)
 
-        # title_box should fill vertical space if there's no description
-        should_expand = not result.compact and not result.description
+        self.item_container.set_property("margin-start", outer_margin_x)
+        self.item_container.set_property("margin-end", outer_margin_x)
 
-        self.text_container.pack_start(self.title_box, should_expand, True, 0)
+        self.title_label = Gtk.Label(hexpand=True, xalign=0)
+        # the highlight color comes from the theme, so the markup has to follow style changes
+        self.title_label.connect("style-updated", self._on_title_style_updated)
+        self.title_box.pack_start(self.title_label, True, True, 0)
 
-        item_container.set_property("margin-start", outer_margin_x)
-        item_container.set_property("margin-end", outer_margin_x)
-        item_container.set_property("margin-top", margin_y)
-        item_container.set_property("margin-bottom", margin_y)
+        self.descr_label = Gtk.Label(hexpand=True, xalign=0)
+        self.descr_label.get_style_context().add_class("item-descr")
+        self.descr_label.get_style_context().add_class("item-text")
+        self.text_container.pack_start(self.descr_label, False, True, 0)
 
-        if result.description and not result.compact:
-            descr_label = self._make_text_label()
-            descr_label.get_style_context().add_class("item-descr")
-            descr_label.get_style_context().add_class("item-text")
-            descr_label.set_text(unescape(result.description))
-            self.text_container.pack_start(descr_label, False, True, 0)
+        self.item_box.show_all()
+        # the visibility of the row and the description is set by ResultsView and bind()
+        self.set_no_show_all(True)
+        self.descr_label.set_no_show_all(True)
+        self.bind(result, index, query, jump_keys)
+
+    def bind(self, result: Result, index: int, query: Query, jump_keys: list[str]) -> None:
+        """Show another result in the row, keeping its widgets, and only updating the ones that changed"""
+        self.result = result
+        self.query = query
+        self.jump_keys = jump_keys
+        self.set_index(index)
+        self.item_box.get_style_context().remove_class("selected")
+        self._highlight_attributes = None
+        appearance = (result.icon, result.compact, result.wrap, result.description)
+        if appearance != self._appearance:
+            self._appearance = appearance
+            self._update_appearance()
         self.highlight_name()
 
-    def _make_text_label(self, text: str = "") -> Gtk.Label:
+    def _update_appearance(self) -> None:
+        result = self.result
+        icon_size = 25 if result.compact else 40
+        margin_y = (3 if result.compact else 5) * self._text_scaling_factor
+
+        self._load_icon(result.icon or "gtk-missing-image", icon_size)
+        self.item_container.set_property("margin-top", margin_y)
+        self.item_container.set_property("margin-bottom", margin_y)
+        # title_box should fill vertical space if there's no description
+        self.text_container.child_set_property(self.title_box, "expand", not result.compact and not result.description)
+
+        self._set_wrap(self.title_label)
+        self._set_wrap(self.descr_label)
+        self.descr_label.set_text(unescape(result.description))
+        self.descr_label.set_visible(bool(result.description and not result.compact))
+
+    def _load_icon(self, icon: str, size: int) -> None:
+        """Show the icon when it's loaded, leaving an empty space of its size until then"""
+        icon_key = (icon, size)
+        self._icon_key = icon_key
+        self.icon.clear()
+        self.icon.set_size_request(size, size)
+
+        def set_icon(surface: ImageSurface) -> None:
+            if self._icon_key == icon_key:  # unless the row was bound to another icon meanwhile
+                self.icon.set_from_surface(surface)
+
+        load_icon_surface_async(icon, size, self.get_scale_factor(), set_icon)
+
+    def _set_wrap(self, label: Gtk.Label) -> None:
         if self.result.wrap:
-            return Gtk.Label(label=text, hexpand=True, xalign=0, wrap=True, wrap_mode=Pango.WrapMode.WORD_CHAR)
-        # max_width_chars=1 lets the label shrink below its natural size so ellipsizing kicks in
-        return Gtk.Label(label=text, hexpand=True, max_width_chars=1, xalign=0, ellipsize=Pango.EllipsizeMode.MIDDLE)
+            label.set_properties(wrap=True, wrap_mode=Pango.WrapMode.WORD_CHAR, max_width_chars=-1)
+            label.set_ellipsize(Pango.EllipsizeMode.NONE)
+        else:
+            # max_width_chars=1 lets the label shrink below its natural size so ellipsizing kicks in
+            label.set_properties(wrap=False, max_width_chars=1)
+            label.set_ellipsize(Pango.EllipsizeMode.MIDDLE)
 
     def set_index(self, index: int) -> None:
         """
         Set index for the item and assign shortcut
         """
         self.index = index
-        if index < len(self.jump_keys):
-            self.shortcut_label.set_text(f"Alt+{self.jump_keys[index]}")
+        self.shortcut_label.set_text(f"Alt+{self.jump_keys[index]}" if index < len(self.jump_keys) else "")
 
     def select(self) -> None:
         self.item_box.get_style_context().add_class("selected")
+        self._highlight_attributes = None
+        self.update_name_markup()
         self.scroll_to_focus()
 
     def deselect(self) -> None:
         self.item_box.get_style_context().remove_class("selected")
+        self._highlight_attributes = None
+        self.update_name_markup()
 
     def scroll_to_focus(self) -> None:
         viewport = self.get_ancestor(Gtk.Viewport)
@@ -140,27 +202,60 @@ class ResultWidget(Gtk.EventBox):
             viewport.set_vadjustment(Gtk.Adjustment(bottom - viewport_height, 0, 2**32, 1, 10, 0))
 
     def highlight_name(self) -> None:
-        if self.result.wrap:
-            # highlighting splits the name into labels that cannot reflow as one paragraph
-            labels = [self._make_text_label(self.result.name)]
-        elif (highlightable_input := self.result.get_highlightable_input(str(self.query))) and (
+        self.name_blocks = None
+        if (highlightable_input := self.result.get_highlightable_input(str(self.query))) and (
             self.result.searchable or self.result.highlightable
         ):
-            labels = []
-            for label_text, is_highlight in highlight_text(highlightable_input, self.result.name):
-                ellipsize_min = ELLIPSIZE_MIN_LENGTH if not is_highlight else ELLIPSIZE_FORCE_AT_LENGTH
-                ellipsize = Pango.EllipsizeMode.MIDDLE if len(label_text) > ellipsize_min else Pango.EllipsizeMode.NONE
-                label = Gtk.Label(label=unescape(label_text), ellipsize=ellipsize)
-                if is_highlight:
-                    label.get_style_context().add_class("item-highlight")
-                labels.append(label)
-        else:
-            labels = [Gtk.Label(label=self.result.name, ellipsize=Pango.EllipsizeMode.MIDDLE)]
+            # reuses the blocks found when the result was scored, if it was scored for this query
+            self.name_blocks = self.result.get_name_blocks(highlightable_input)
+            self.update_name_markup()
+        elif self.title_label.get_use_markup() or self.title_label.get_text() != self.result.name:
+            self.title_label.set_text(self.result.name)
+
+    def _on_title_style_updated(self, _label: Gtk.Label) -> None:
+        if self._reading_highlight_style:  # emitted by reading the style with the highlight class
+            return
+        self._highlight_attributes = None
+        self.update_name_markup()
 
-        # a wrapped label must fill the row so it has a width to reflow against
-        expand = self.result.wrap
-        for label in labels:
-            self.title_box.pack_start(label, expand, expand, 0)
+    def _get_highlight_attributes(self) -> dict[str, str]:
+        """
+        The Pango attributes of the highlight style of the theme (.item-highlight).
+        GTK 3 doesn't expose the text decoration of a style, so only the colors and the font are kept.
+        """
+        if self._highlight_attributes is None:
+            style_context = self.title_label.get_style_context()
+            self._reading_highlight_style = True
+            style_context.save()
+            try:
+                style_context.add_class("item-highlight")
+                state = style_context.get_state()
+                color = style_context.get_color(state)
+                background = style_context.get_property("background-color", state)
+                weight = style_context.get_property("font-weight", state)
+                font_style = style_context.get_property("font-style", state)
+            finally:
+                style_context.restore()
+                self._reading_highlight_style = False
+            attributes = {
+                "foreground": _get_hex_color(color),
+                "weight": str(int(weight)),
+                "style": Pango.Style(font_style).value_nick,
+            }
+            if background.alpha:
+                attributes["background"] = _get_hex_color(background)
+                attributes["bgalpha"] = f"{round(background.alpha * 100)}%"
+            self._highlight_attributes = attributes
+        return self._highlight_attributes
+
+    def update_name_markup(self) -> None:
+        """Render the name as a single label, with the matching blocks in the highlight style of the theme."""
+        if self.name_blocks is None:
+            return
+        markup = get_highlight_markup(self.result.name, self.name_blocks, self._get_highlight_attributes())
+        # a row kept for the same result often keeps its highlight too, so skip relayouting the label
+        if not self.title_label.get_use_markup() or self.title_label.get_label() != markup:
+            self.title_label.set_markup(markup)
 
     def on_click(self, _widget: Gtk.Widget, event: Gdk.EventButton | None = None) -> None:
         alt = bool(event and event.button != 1)  # right click
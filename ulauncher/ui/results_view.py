@@ -40,7 +40,8 @@ class ResultsView(Gtk.ScrolledWindow):
         self._settings = settings
         self._apply_css = apply_css
         self._activate_result = activate_result
-        self._widgets: list[ResultWidget] = []
+        self._widgets: list[ResultWidget] = []  # the pool widgets showing the current results
+        self._pool: list[ResultWidget] = []  # row widgets kept in the box, rebound to new results on render
         self._box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL)
         self._box.get_style_context().add_class("result-box")
         self._box.connect("size-allocate", self._fit_results_height)
@@ -81,7 +82,7 @@ class ResultsView(Gtk.ScrolledWindow):
 
     def _replace_results(self, update: ResultsUpdate) -> None:
         previous_pick = self.get_active_result() if self._user_selected else None
-        self._box.foreach(lambda w: w.destroy())
+        previous_widgets = self._widgets
         self._widgets = []
         self._index = 0
 
@@ -95,16 +96,18 @@ class ResultsView(Gtk.ScrolledWindow):
             # Hide the scroll container when there are no results since it normally takes up a
             # minimum amount of space even if it is empty.
             self._user_selected = False
+            self._hide_unused_widgets()
             self.hide()
             logger.debug("Hiding results container, no results found")
             return
 
-        self._add_widgets(result_list, update["query"], start_index=0)
+        self._bind_widgets(result_list, update["query"], previous_widgets)
+        self._hide_unused_widgets()
         self._apply_selection(update["selected_name"], previous_pick)
         self._box.set_margin_bottom(10)
         self._box.set_margin_top(3)
-        self._apply_css(self._box)
-        self.show_all()
+        self._box.show()
+        self.show()
         logger.debug("Render %s results", len(self._widgets))
 
     def _append_results(self, update: ResultsUpdate) -> None:
@@ -114,23 +117,51 @@ class ResultsView(Gtk.ScrolledWindow):
             return
         if any(result.wrap for result in new_results):
             self._has_wrapped_results = True
-        self._add_widgets(new_results, update["query"], start_index=existing)
+        self._bind_widgets(new_results, update["query"], [])
         # keep the user's pick; only (re)evaluate the default when they haven't navigated
         if not self._user_selected:
             self._apply_selection(update["selected_name"], None)
-        self._apply_css(self._box)
-        self.show_all()
 
-    def _add_widgets(self, results: list[Result], query: Query, start_index: int) -> None:
+    def _bind_widgets(self, results: list[Result], query: Query, previous_widgets: list[ResultWidget]) -> None:
+        """
+        Show the results after the current rows. The rows in previous_widgets that showed the same results
+        (by Result.get_key()) are moved to their new position, so only the rows that changed are repainted.
+        """
         from ulauncher.ui.result_widget import ResultWidget
 
         jump_keys = self._settings.get_jump_keys()
-        for offset, result in enumerate(results):
-            widget = ResultWidget(
-                result, start_index + offset, query, self.select, self._select_and_activate, jump_keys
-            )
+        widgets_by_key: dict[tuple[str, ...], list[ResultWidget]] = {}
+        for widget in previous_widgets:
+            widgets_by_key.setdefault(widget.result.get_key(), []).append(widget)
+        matches = [keyed.pop(0) if (keyed := widgets_by_key.get(result.get_key())) else None for result in results]
+        spares = [widget for widget in self._pool[len(self._widgets) :] if widget not in matches]
+
+        for result, match in zip(results, matches):
+            index = len(self._widgets)
+            widget = match or (spares.pop(0) if spares else None)
+            if widget:
+                widget.bind(result, index, query, jump_keys)
+            else:
+                widget = ResultWidget(result, index, query, self.select, self._select_and_activate, jump_keys)
+                self._pool.append(widget)
+                self._box.add(widget)
+                # the theme provider is updated in place, so a row only needs it attached once
+                self._apply_css(widget)
+            if self._pool[index] is not widget:
+                self._pool.remove(widget)
+                self._pool.insert(index, widget)
+                self._box.reorder_child(widget, index)
+            widget.show()
             self._widgets.append(widget)
-            self._box.add(widget)
+
+        # the pool only grows to the result limit, so drop the rows a lowered limit left over
+        for widget in self._pool[self._limit() :]:
+            widget.destroy()
+        del self._pool[self._limit() :]
+
+    def _hide_unused_widgets(self) -> None:
+        for widget in self._pool[len(self._widgets) :]:
+            widget.hide()
 
     def _select_and_activate(self, index: int, alt: bool) -> None:
         self.select(index)
@@ -139,8 +170,9 @@ class ResultsView(Gtk.ScrolledWindow):
     def _apply_selection(self, selected_name: str | None, previous_pick: Result | None) -> None:
         # Keep the user's pick across a streaming replace if it is still present.
         if previous_pick:
+            previous_key = previous_pick.get_key()
             for index, widget in enumerate(self._widgets):
-                if widget.result.name == previous_pick.name:
+                if widget.result.get_key() == previous_key:
                     self.select(index)
                     return
             self._user_selected = False
@@ -271,6 +271,10 @@ class UlauncherWindow(Gtk.ApplicationWindow):
         ):
             return True
 
+        if keyname in ("Return", "KP_Enter"):
+            # if the query was typed faster than it's searched, activate from its results rather than the previous
+            self.get_app().finish_search()
+
         if self.results_view.has_results:
             if keyname in ("Up", "ISO_Left_Tab") or (ctrl and keyname == up_alias):
                 self.results_view.go_up()
@@ -17,6 +17,10 @@ information.
 
 from Xlib import display, X, xobject, protocol, error
 import time
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from ulauncher.gi import GLib
 
 
 class EWMH:
@@ -490,3 +494,98 @@ class EWMH:
         if not f:
             raise KeyError("Unknown writable property: %s" % prop)
         f(self, *args, **kwargs)
+
+
+class WindowTracker:
+    """
+    Long-lived Ulauncher addition to pyewmh: keeps one display connection listening for changes to the client
+    list of the root window (PropertyNotify), and a map of the lowercased WM_CLASS ids and names of the client
+    windows to the topmost window having them. WM_CLASS is only requested for windows that weren't seen before.
+    """
+
+    _instance: "WindowTracker | None" = None
+
+    @classmethod
+    def get(cls) -> "WindowTracker":
+        if not cls._instance:
+            cls._instance = cls()
+        return cls._instance
+
+    def __init__(self) -> None:
+        from ulauncher.gi import GLib
+
+        self.ewmh = EWMH()
+        self._client_list_atoms = {
+            self.ewmh.display.get_atom("_NET_CLIENT_LIST"),
+            self.ewmh.display.get_atom("_NET_CLIENT_LIST_STACKING"),
+        }
+        self._window_ids: dict[int, tuple[str, ...]] = {}  # window id -> app ids of the window
+        self.windows: dict[str, xobject.drawable.Window] = {}  # app id -> topmost window
+        self.ewmh.root.change_attributes(event_mask=X.PropertyChangeMask)
+        self._update()
+        self._process_events()
+        GLib.io_add_watch(
+            self.ewmh.display.fileno(), GLib.PRIORITY_DEFAULT, GLib.IO_IN | GLib.IO_HUP | GLib.IO_ERR, self._on_events
+        )
+
+    def _on_events(self, _fd: int, condition: "GLib.IOCondition") -> bool:
+        from ulauncher.gi import GLib
+
+        if condition & (GLib.IO_HUP | GLib.IO_ERR):
+            WindowTracker._instance = None
+            return False
+        self._process_events()
+        return True
+
+    def _process_events(self) -> None:
+        # the round trips in _update() can queue more events, which won't wake up the io watch again
+        while self.ewmh.display.pending_events():
+            changed = False
+            while self.ewmh.display.pending_events():
+                event = self.ewmh.display.next_event()
+                if event.type == X.PropertyNotify and event.atom in self._client_list_atoms:
+                    changed = True
+            if changed:
+                self._update()
+
+    def _get_app_ids(self, win: xobject.drawable.Window) -> tuple[str, ...]:
+        try:
+            wm_class = win.get_wm_class()
+            if not wm_class:
+                return ()
+            class_id, class_name = wm_class
+            win_app_id = (class_id or "").lower()
+            if win_app_id == "thunar" and (win.get_wm_name() or "").startswith("Bulk Rename"):
+                # "Bulk Rename" identify as "Thunar": https://gitlab.xfce.org/xfce/thunar/-/issues/731
+                # Also, note that get_wm_name is unreliable, but it works for Thunar https://github.com/parkouss/pyewmh/issues/15
+                win_app_id = "thunar --bulk-rename"
+        except error.BadWindow:  # closed since the client list was read
+            return ()
+        return (win_app_id, (class_name or "").lower())
+
+    def _update(self) -> None:
+        window_ids = {}
+        windows = {}
+        # bottom to top, so the topmost window of each app is the one that's kept
+        for win_id in self.ewmh._getProperty("_NET_CLIENT_LIST_STACKING") or []:
+            win = self.ewmh._createWindow(win_id)
+            if win is None:
+                continue
+            app_ids = self._window_ids.get(win_id)
+            if app_ids is None:
+                app_ids = self._get_app_ids(win)
+            window_ids[win_id] = app_ids
+            for app_id in app_ids:
+                windows[app_id] = win
+        self._window_ids = window_ids
+        self.windows = windows
+
+    def raise_window(self, app_id: str) -> bool:
+        """Activate the topmost window of the app with the WM_CLASS id or name, and return whether there was one"""
+        self._process_events()  # in case the main loop hasn't dispatched them yet
+        win = self.windows.get(app_id)
+        if not win:
+            return False
+        self.ewmh.setActiveWindow(win)
+        self.ewmh.display.flush()
+        return True
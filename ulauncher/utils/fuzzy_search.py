@@ -1,12 +1,16 @@
 from __future__ import annotations
 
+import heapq
 import logging
 import unicodedata
 from difflib import Match, SequenceMatcher
+from operator import itemgetter
+from typing import Callable, Iterable, Sequence, TypeVar
 
 from ulauncher.utils.lru_cache import lru_cache
 
 logger = logging.getLogger(__name__)
+T = TypeVar("T")
 
 
 def _get_matching_blocks_native(query_str: str, text: str) -> list[Match]:
@@ -28,6 +32,15 @@ except ImportError:
     )
     _get_matching_blocks = _get_matching_blocks_native  # type: ignore[assignment]
 
+# NumPy is optional. It's only used to run the bit-parallel LCS for many texts at once in score_many()
+try:
+    import numpy as np  # type: ignore[import-not-found, unused-ignore]
+except ImportError:
+    np = None  # type: ignore[assignment]
+
+NUMPY_MIN_BATCH = 64  # below this, the overhead of packing the texts into an array isn't worth it
+NUMPY_MAX_QUERY_LEN = 64  # the query bits have to fit in an uint64
+
 
 # convert strings to easily typable ones without accents, so ex "motorhead" matches "motörhead"
 @lru_cache(maxsize=2000)
@@ -35,35 +48,84 @@ def _normalize(string: str) -> str:
     return unicodedata.normalize("NFD", string.casefold()).encode("ascii", "ignore").decode("utf-8")
 
 
-@lru_cache(maxsize=1000)
-def get_matching_blocks(query_str: str, text: str) -> tuple[list[tuple[int, str]], int]:
+class NormalizedText:
     """
-    Uses our _get_matching_blocks wrapper method to find the blocks using "Longest Common Substrings",
-    :returns: list of tuples, containing the index and matching block, number of characters that matched
+    A text together with its normalized form, and the index in the text of each normalized character
+    (normalizing can drop characters, or expand them like "ß" -> "ss").
+    Searchable fields are normalized like this once, so only the query has to be normalized when scoring.
     """
-    blocks = _get_matching_blocks(_normalize(query_str), _normalize(text))[:-1]
+
+    __slots__ = ("normalized", "offsets", "text")
+
+    def __init__(self, text: str) -> None:
+        self.text = text
+        self.offsets: Sequence[int]
+        if text.isascii():
+            self.normalized = text.casefold()
+            self.offsets = range(len(text))
+            return
+        chars = []
+        offsets = []
+        for index, char in enumerate(text):
+            normalized_char = _normalize(char)
+            chars.append(normalized_char)
+            offsets.extend([index] * len(normalized_char))
+        self.normalized = "".join(chars)
+        self.offsets = offsets
+
+
+def _get_blocks(query_str: str, text: NormalizedText) -> tuple[list[tuple[int, str]], int]:
+    blocks = _get_matching_blocks(_normalize(query_str), text.normalized)[:-1]
     output = []
     total_len = 0
-    for _, text_index, length in blocks:
-        output.append((text_index, text[text_index : text_index + length]))
+    for _, normalized_index, length in blocks:
+        if not length:
+            continue
+        start = text.offsets[normalized_index]
+        end = text.offsets[normalized_index + length - 1] + 1
+        output.append((start, text.text[start:end]))
         total_len += length
     return output, total_len
 
 
-def get_score(query_str: str, text: str) -> float:
+@lru_cache(maxsize=1000)
+def get_matching_blocks(query_str: str, text: str) -> tuple[list[tuple[int, str]], int]:
+    """
+    Uses our _get_matching_blocks wrapper method to find the blocks using "Longest Common Substrings",
+    :returns: list of tuples, containing the index and matching block, number of characters that matched
+    """
+    return _get_blocks(query_str, NormalizedText(text))
+
+
+def get_score(query_str: str, text: str | NormalizedText) -> float:
     """
     Uses get_matching_blocks() to figure out how much of the query that matches the text,
     and tries to weight this to slightly favor shorter results and largely favor word matches
     :returns: number between 0 and 100
     """
 
+    if isinstance(text, NormalizedText):
+        return get_scored_blocks(query_str, text)[0]
     if not query_str or not text:
         return 0.0
+    return _get_blocks_score(query_str, text, *get_matching_blocks(query_str, text))
+
+
+def get_scored_blocks(query_str: str, text: NormalizedText) -> tuple[float, list[tuple[int, str]]]:
+    """
+    Same as get_score(), but also returns the matching blocks it found, for highlighting the text later
+    :returns: the score, and the list of tuples containing the index and matching block
+    """
+    if not query_str or not text.text:
+        return 0.0, []
+    blocks, matching_chars = _get_blocks(query_str, text)
+    return _get_blocks_score(query_str, text.text, blocks, matching_chars), blocks
+
 
+def _get_blocks_score(query_str: str, text: str, blocks: list[tuple[int, str]], matching_chars: int) -> float:
     query_len = len(query_str)
     text_len = len(text)
     max_len = max(query_len, text_len)
-    blocks, matching_chars = get_matching_blocks(query_str, text)
 
     # Ratio of the query that matches the text
     base_similarity = matching_chars / query_len
@@ -76,3 +138,74 @@ def get_score(query_str: str, text: str) -> float:
 
     # Rank matches lower for each extra character, to slightly favor shorter ones.
     return 100 * base_similarity * query_len / (query_len + (max_len - query_len) * 0.001)
+
+
+def _get_lcs_lengths_native(query_str: str, texts: Sequence[str]) -> list[int]:
+    """Length of the longest common subsequence of the query and each text, using bit-parallel LCS (Hyyrö)."""
+    query_masks: dict[str, int] = {}
+    for i, char in enumerate(query_str):
+        query_masks[char] = query_masks.get(char, 0) | 1 << i
+    all_bits = (1 << len(query_str)) - 1
+    lengths = []
+    for text in texts:
+        v = all_bits
+        for char in text:
+            u = v & query_masks.get(char, 0)
+            v = ((v + u) | (v - u)) & all_bits
+        lengths.append(len(query_str) - bin(v).count("1"))
+    return lengths
+
+
+def _get_lcs_lengths_numpy(query_str: str, texts: Sequence[str]) -> list[int]:
+    """Same as _get_lcs_lengths_native, but runs for all the texts at once over an array of ASCII codes."""
+    query_masks = np.zeros(128, dtype=np.uint64)
+    for i, char in enumerate(query_str):
+        if char != "\0":  # reserved for padding
+            query_masks[ord(char)] |= np.uint64(1 << i)
+    all_bits = np.uint64((1 << len(query_str)) - 1)
+    max_len = max(map(len, texts))
+    # pad with NUL, which never matches, so shorter texts keep their state until the end
+    packed = b"".join(text.encode("ascii", "ignore").ljust(max_len, b"\0") for text in texts)
+    codes = np.frombuffer(packed, dtype=np.uint8).reshape(len(texts), max_len)
+    v = np.full(len(texts), all_bits, dtype=np.uint64)
+    with np.errstate(over="ignore"):
+        for column in codes.T:
+            u = v & query_masks[column]
+            v = ((v + u) | (v - u)) & all_bits
+    set_bits = np.unpackbits(v.view(np.uint8).reshape(-1, 8), axis=1).sum(axis=1)
+    return [len(query_str) - int(bits) for bits in set_bits]
+
+
+def _get_lcs_lengths(query_str: str, texts: Sequence[str]) -> list[int]:
+    if np is not None and len(texts) >= NUMPY_MIN_BATCH and len(query_str) <= NUMPY_MAX_QUERY_LEN:
+        return _get_lcs_lengths_numpy(query_str, texts)
+    return _get_lcs_lengths_native(query_str, texts)
+
+
+def score_many(query_str: str, texts: Sequence[str], min_score: float = 0.0) -> list[float]:
+    """
+    Scores the texts like get_score() would, but in one batch. The matching characters can't exceed the
+    longest common subsequence, which is computed for all texts at once, so get_score() only has to run
+    for the texts that can still score above min_score. The others are given a score of 0.
+    :returns: list of numbers between 0 and 100, in the same order as the texts
+    """
+    if not query_str:
+        return [0.0] * len(texts)
+
+    query_len = len(query_str)
+    lcs_lengths = _get_lcs_lengths(_normalize(query_str), [_normalize(text) for text in texts]) if texts else []
+    scores = []
+    for text, lcs_length in zip(texts, lcs_lengths):
+        max_len = max(query_len, len(text))
+        max_score = 100 * lcs_length / (query_len + (max_len - query_len) * 0.001)
+        scores.append(get_score(query_str, text) if max_score > min_score else 0.0)
+    return scores
+
+
+def get_top_scored(items: Iterable[T], score: Callable[[T], float], limit: int, min_score: float) -> list[T]:
+    """
+    Scores each item once and returns the (at most) {limit} items scoring above min_score, best first.
+    Items with equal scores keep their original order.
+    """
+    scored = ((item_score, item) for item in items if (item_score := score(item)) > min_score)
+    return [item for _, item in heapq.nlargest(limit, scored, key=itemgetter(0))]
@@ -23,6 +23,7 @@ class Settings(JsonConf):
     max_recent_apps: int = 0
     raise_if_started: bool = False
     render_on_screen: str = "mouse-pointer-monitor"
+    search_time_budget: int = 8  # ms to search before rendering the best results found so far
     show_tray_icon: bool = True
     terminal_command: str = ""
     theme_name: str = "light"
@@ -53,7 +54,7 @@ class Settings(JsonConf):
         """
         from ulauncher.utils.systemd_controller import SystemdController
 
-        status = SystemdController("ulauncher").status()
+        status = SystemdController("ulauncher").cached_status()
         if status.can_start:
             return status.is_enabled
         return self.keep_alive
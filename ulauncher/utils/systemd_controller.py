@@ -3,9 +3,19 @@ from __future__ import annotations
 import logging
 import subprocess
 from shutil import which
+from typing import Any
+
+from ulauncher.gi import Gio, GLib
 
 logger = logging.getLogger(__name__)
 
+SYSTEMD_BUS_NAME = "org.freedesktop.systemd1"
+SYSTEMD_PATH = "/org/freedesktop/systemd1"
+MANAGER_INTERFACE = "org.freedesktop.systemd1.Manager"
+UNIT_INTERFACE = "org.freedesktop.systemd1.Unit"
+PROPERTIES_INTERFACE = "org.freedesktop.DBus.Properties"
+STATUS_PROPERTIES = ("ActiveState", "CanStart", "NeedDaemonReload", "UnitFileState")
+
 
 def systemctl_run(*args: str) -> str:
     try:
@@ -20,6 +30,11 @@ class SystemdUnitStatus:
     def __init__(self, lines: list[str]) -> None:
         self._lines = lines
 
+    @classmethod
+    def from_properties(cls, properties: dict[str, Any]) -> SystemdUnitStatus:
+        """Status from unit properties read over D-Bus, formatted like `systemctl show` formats them"""
+        return cls([f"{k}={('yes' if v else 'no') if isinstance(v, bool) else v}" for k, v in properties.items()])
+
     @property
     def can_start(self) -> bool:
         """Returns True if unit exists and can start"""
@@ -36,11 +51,144 @@ class SystemdUnitStatus:
         return "UnitFileState=enabled" in self._lines
 
 
+class _UnitWatcher:
+    """
+    Reads the unit status over D-Bus asynchronously, and keeps it current from the PropertiesChanged signals
+    of the unit (and the UnitFilesChanged/Reloading signals of the manager, for enabling/disabling).
+    """
+
+    status: SystemdUnitStatus | None = None  # None until the first reply
+    failed = False
+    _bus: Gio.DBusConnection | None = None
+    _unit_path = ""
+    _daemon_reload_requested = False
+
+    def __init__(self, unit: str) -> None:
+        self._unit_name = unit if "." in unit else f"{unit}.service"
+        self._properties: dict[str, Any] = {}
+        Gio.bus_get(Gio.BusType.SESSION, None, self._on_bus_ready)
+
+    def _call(self, object_path: str, interface_name: str, method_name: str, parameters: GLib.Variant | None) -> None:
+        if not self._bus:
+            return
+        self._bus.call(
+            SYSTEMD_BUS_NAME,
+            object_path,
+            interface_name,
+            method_name,
+            parameters,
+            None,
+            Gio.DBusCallFlags.NONE,
+            -1,
+            None,
+            self._on_reply,
+            method_name,
+        )
+
+    def _on_bus_ready(self, _source: Any, result: Gio.AsyncResult) -> None:
+        try:
+            self._bus = Gio.bus_get_finish(result)
+        except GLib.Error as e:
+            logger.warning("Could not connect to the session bus: %s", e)
+            self._fail()
+            return
+        self._bus.signal_subscribe(
+            SYSTEMD_BUS_NAME,
+            MANAGER_INTERFACE,
+            None,
+            SYSTEMD_PATH,
+            None,
+            Gio.DBusSignalFlags.NONE,
+            self._on_manager_signal,
+        )
+        # systemd only emits signals while some client is subscribed
+        self._call(SYSTEMD_PATH, MANAGER_INTERFACE, "Subscribe", None)
+        self._call(SYSTEMD_PATH, MANAGER_INTERFACE, "LoadUnit", GLib.Variant("(s)", (self._unit_name,)))
+
+    def _on_reply(self, bus: Gio.DBusConnection, result: Gio.AsyncResult, method_name: str) -> None:
+        try:
+            reply = bus.call_finish(result)
+        except GLib.Error as e:
+            logger.warning("systemd D-Bus call %s failed: %s", method_name, e)
+            if method_name in ("LoadUnit", "GetAll"):
+                self._fail()
+            return
+        if method_name == "LoadUnit":
+            (self._unit_path,) = reply.unpack()
+            bus.signal_subscribe(
+                SYSTEMD_BUS_NAME,
+                PROPERTIES_INTERFACE,
+                "PropertiesChanged",
+                self._unit_path,
+                UNIT_INTERFACE,
+                Gio.DBusSignalFlags.NONE,
+                self._on_properties_changed,
+            )
+            self.refresh()
+        elif method_name == "GetAll":
+            (properties,) = reply.unpack()
+            self.failed = False
+            self._set_properties({k: v for k, v in properties.items() if k in STATUS_PROPERTIES})
+        elif method_name == "Reload":
+            self.refresh()
+
+    def _fail(self) -> None:
+        # cached_status() goes back to reading the status synchronously
+        self.failed = True
+        self.status = None
+
+    def _on_manager_signal(self, *args: Any) -> None:
+        signal_name, parameters = args[4], args[5]
+        # the unit file state isn't part of the unit's PropertiesChanged signals
+        if signal_name == "UnitFilesChanged" or (signal_name == "Reloading" and not parameters.unpack()[0]):
+            self.refresh()
+
+    def _on_properties_changed(self, *args: Any) -> None:
+        _interface, changed, invalidated = args[5].unpack()
+        if any(name in STATUS_PROPERTIES for name in invalidated):
+            self.refresh()
+        else:
+            self._set_properties({**self._properties, **{k: v for k, v in changed.items() if k in STATUS_PROPERTIES}})
+
+    def _set_properties(self, properties: dict[str, Any]) -> None:
+        self._properties = properties
+        self.status = SystemdUnitStatus.from_properties(properties)
+        if not properties.get("NeedDaemonReload"):
+            self._daemon_reload_requested = False
+        elif not self._daemon_reload_requested:
+            logger.info("Reloading systemd daemon")
+            self._daemon_reload_requested = True
+            self._call(SYSTEMD_PATH, MANAGER_INTERFACE, "Reload", None)
+
+    def refresh(self) -> None:
+        if self._bus and self._unit_path:
+            self._call(self._unit_path, PROPERTIES_INTERFACE, "GetAll", GLib.Variant("(s)", (UNIT_INTERFACE,)))
+
+
+_watchers: dict[str, _UnitWatcher] = {}
+
+
 class SystemdController:
     def __init__(self, unit: str) -> None:
         self._unit = unit
         self.supported = bool(which("systemctl"))
 
+    def watch(self) -> None:
+        """Start keeping the unit status current over D-Bus, for cached_status() to read from"""
+        if self.supported and self._unit not in _watchers:
+            _watchers[self._unit] = _UnitWatcher(self._unit)
+
+    def cached_status(self) -> SystemdUnitStatus:
+        """The status kept current by watch(), or a `systemctl show` snapshot if it isn't available (yet)"""
+        watcher = _watchers.get(self._unit)
+        if watcher and watcher.status:
+            return watcher.status
+        status = self.status()
+        if watcher and not watcher.failed:
+            # until the D-Bus reply replaces it
+            watcher.status = status
+        return status
+
     def status(self) -> SystemdUnitStatus:
         """Snapshot of unit state from a single `systemctl show` call (or empty if not supported)"""
         if not self.supported:
@@ -52,6 +200,18 @@ class SystemdController:
             status = systemctl_run("show", self._unit)
         return SystemdUnitStatus(status.splitlines())
 
+    def current_status(self) -> SystemdUnitStatus:
+        """
+        The cached status, or a new snapshot if systemd needs to reload the unit file. systemd doesn't signal changes
+        to the unit files on disk, so NeedDaemonReload must be read again before acting on the cached status.
+        """
+        if systemctl_run("show", "--property=NeedDaemonReload", self._unit) != "NeedDaemonReload=yes":
+            return self.cached_status()
+        status = self.status()  # reloads the daemon first
+        if watcher := _watchers.get(self._unit):
+            watcher.refresh()
+        return status
+
     def restart(self) -> None:
         if self.supported:
             systemctl_run("restart", self._unit)
@@ -62,8 +222,12 @@ class SystemdController:
 
     def toggle(self, status: bool) -> None:
         """Enable or disable unit"""
-        if status and not self.status().can_start:
+        if status and not self.current_status().can_start:
             msg = "Autostart is not allowed"
             raise OSError(msg)
 
         systemctl_run("reenable" if status else "disable", self._unit)
+        if watcher := _watchers.get(self._unit):
+            # read the new state synchronously on next access rather than waiting for the signal
+            watcher.status = None
+            watcher.refresh()